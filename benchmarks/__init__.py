@@ -0,0 +1,6 @@
+# benchmarks/__init__.py
+"""
+Suite de benchmarks: programas objetivo locais e harness de medicao.
+
+Uso: python -m benchmarks.run_benchmarks --help
+"""
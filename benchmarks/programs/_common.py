@@ -0,0 +1,75 @@
+# benchmarks/programs/_common.py
+"""
+Codigo comum dos programas objetivo de benchmark.
+
+Cada programa segue o mesmo protocolo esperado por run_external_program:
+recebe os parametros pela linha de comando e escreve o valor em stdout.
+Como os otimizadores maximizam, o valor impresso e -f(x).
+
+Variaveis de ambiente:
+  BENCH_DIMS     numero de parametros aceitos (padrao: 5)
+  BENCH_LATENCY  atraso artificial por avaliacao, em segundos (padrao: 0)
+  BENCH_NOISE    desvio padrao do ruido gaussiano somado ao valor (padrao: 0)
+
+Com --server o programa fala o protocolo do modo servidor
+(ver objective/program_server.py).
+"""
+import os
+import random
+import sys
+import time
+
+
+def _settings():
+    return (int(os.environ.get("BENCH_DIMS", "5")),
+            float(os.environ.get("BENCH_LATENCY", "0")),
+            float(os.environ.get("BENCH_NOISE", "0")))
+
+
+def _usage(name, dims, param_type):
+    names = " ".join(f"x{i + 1}" for i in range(dims))
+    tipo = "inteiros" if param_type is int else "float"
+    return f"uso: {name} {names} ({tipo})"
+
+
+def _evaluate(func, args, dims, latency, noise, param_type):
+    if len(args) != dims:
+        raise ValueError(f"esperado {dims} parametros, recebido {len(args)}")
+    x = [param_type(a) for a in args]
+    if latency > 0:
+        time.sleep(latency)
+    value = -func(x)
+    if noise > 0:
+        value += random.gauss(0.0, noise)
+    return value
+
+
+def main(name, func, param_type=float):
+    dims, latency, noise = _settings()
+    args = sys.argv[1:]
+
+    if args and args[0] in ("--help", "-h", "--usage", "-help"):
+        print(_usage(name, dims, param_type))
+        return 0
+
+    if args and args[0] == "--server":
+        print("READY", flush=True)
+        for line in sys.stdin:
+            line = line.strip()
+            if line == "QUIT":
+                break
+            try:
+                value = _evaluate(func, line.split(), dims, latency, noise, param_type)
+                print(f"{value:.10f}", flush=True)
+            except ValueError as e:
+                print(f"ERROR {e}", flush=True)
+        return 0
+
+    try:
+        value = _evaluate(func, args, dims, latency, noise, param_type)
+    except ValueError:
+        print(_usage(name, dims, param_type), file=sys.stderr)
+        return 1
+
+    print(f"{value:.10f}")
+    return 0
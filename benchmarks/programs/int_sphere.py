@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+# benchmarks/programs/int_sphere.py
+"""Esfera em rede inteira: f(x) = sum((x_i - 3)^2) com x_i inteiros, minimo 0 em x = 3.
+
+Parametros nao inteiros sao rejeitados, como nos programas reais com
+assinatura int.
+"""
+import sys
+from _common import main
+
+
+def int_sphere(x):
+    return sum((v - 3) ** 2 for v in x)
+
+
+if __name__ == "__main__":
+    sys.exit(main("int_sphere", int_sphere, param_type=int))
@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+# benchmarks/programs/rastrigin.py
+"""Rastrigin: f(x) = 10n + sum(x_i^2 - 10 cos(2 pi x_i)), minimo 0 em x = 0."""
+import math
+import sys
+from _common import main
+
+
+def rastrigin(x):
+    return 10 * len(x) + sum(v * v - 10 * math.cos(2 * math.pi * v) for v in x)
+
+
+if __name__ == "__main__":
+    sys.exit(main("rastrigin", rastrigin))
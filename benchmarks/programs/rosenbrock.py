@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+# benchmarks/programs/rosenbrock.py
+"""Rosenbrock: f(x) = sum(100 (x_{i+1} - x_i^2)^2 + (1 - x_i)^2), minimo 0 em x = 1."""
+import sys
+from _common import main
+
+
+def rosenbrock(x):
+    return sum(100 * (x[i + 1] - x[i] ** 2) ** 2 + (1 - x[i]) ** 2 for i in range(len(x) - 1))
+
+
+if __name__ == "__main__":
+    sys.exit(main("rosenbrock", rosenbrock))
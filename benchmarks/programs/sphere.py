@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+# benchmarks/programs/sphere.py
+"""Esfera: f(x) = sum(x_i^2), minimo 0 em x = 0."""
+import sys
+from _common import main
+
+
+def sphere(x):
+    return sum(v * v for v in x)
+
+
+if __name__ == "__main__":
+    sys.exit(main("sphere", sphere))
@@ -0,0 +1,232 @@
+# benchmarks/run_benchmarks.py
+"""
+Harness de benchmark: executa PatternSearch, ParticleSwarm e
+HybridPSOPatternSearch contra os programas de benchmarks/programs e grava
+as metricas em JSON.
+
+Uso:
+    python -m benchmarks.run_benchmarks --repeats 3 --output benchmark_results.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(current_dir)
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+import objective.external_program as ext_prog
+from optimizer import PatternSearch, ParticleSwarm, HybridPSOPatternSearch
+from utils.logger import flush as flush_logs
+
+PROGRAMS_DIR = os.path.join(current_dir, "programs")
+
+# nome -> (arquivo, tipo dos parametros, limites por dimensao)
+FUNCTIONS = {
+    'sphere': ('sphere.py', 'float', (-5.12, 5.12)),
+    'rastrigin': ('rastrigin.py', 'float', (-5.12, 5.12)),
+    'rosenbrock': ('rosenbrock.py', 'float', (-2.048, 2.048)),
+    'int_sphere': ('int_sphere.py', 'int', (-10, 10)),
+}
+
+ALGORITHMS = ('pattern_search', 'particle_swarm', 'hybrid')
+
+
+class InstrumentedObjective:
+    """Envolve run_external_program medindo avaliacoes e tempo ate o alvo.
+
+    busy_time e o tempo de parede em que ao menos uma avaliacao estava em
+    andamento; o restante do tempo de execucao e custo do otimizador.
+    """
+
+    def __init__(self, target):
+        self.target = target
+        self.n_evals = 0
+        self.busy_time = 0.0
+        self.best = -np.inf
+        self.time_to_target = None
+        self.evals_to_target = None
+        self._active = 0
+        self._busy_since = None
+        self._lock = threading.Lock()
+        self.start_time = time.perf_counter()
+
+    def __call__(self, x):
+        with self._lock:
+            if self._active == 0:
+                self._busy_since = time.perf_counter()
+            self._active += 1
+
+        try:
+            value = ext_prog.run_external_program(x)
+        finally:
+            with self._lock:
+                self._active -= 1
+                now = time.perf_counter()
+                if self._active == 0:
+                    self.busy_time += now - self._busy_since
+
+        with self._lock:
+            self.n_evals += 1
+            if value > self.best:
+                self.best = value
+                if self.time_to_target is None and value >= self.target:
+                    self.time_to_target = now - self.start_time
+                    self.evals_to_target = self.n_evals
+        return value
+
+
+def build_optimizer(algorithm, objective, dims, bounds, n_threads):
+    x0 = [0.5 * (bounds[0] + bounds[1]) + 0.25 * (bounds[1] - bounds[0])] * dims
+    all_bounds = [bounds] * dims
+
+    if algorithm == 'pattern_search':
+        return PatternSearch(objective, x0, delta=1.0, delta_min=1e-6, max_iter=200,
+                             poll="complete" if n_threads and n_threads > 1 else "opportunistic",
+                             n_threads=n_threads)
+    if algorithm == 'particle_swarm':
+        return ParticleSwarm(objective, x0, n_particles=20, max_iter=30,
+                             bounds=all_bounds, n_threads=n_threads)
+    if algorithm == 'hybrid':
+        return HybridPSOPatternSearch(objective, x0, n_particles=20, pso_max_iter=20,
+                                      ps_max_iter=50, bounds=all_bounds, n_threads=n_threads)
+    raise ValueError(f"Algoritmo desconhecido: {algorithm}")
+
+
+def run_single(function, algorithm, seed, args):
+    filename, param_type, bounds = FUNCTIONS[function]
+    path = os.path.join(PROGRAMS_DIR, filename)
+
+    # Cada execucao comeca com cache vazio
+    ext_prog.disable_cache()
+    ext_prog.configure_program(path, [param_type] * args.dims, args.dims,
+                               cache_size=args.cache_size)
+    if args.server_mode:
+        ext_prog.enable_server_mode()
+
+    objective = InstrumentedObjective(args.target)
+
+    np.random.seed(seed)
+    output = open(os.devnull, "w") if args.quiet else sys.stdout
+    try:
+        with contextlib.redirect_stdout(output):
+            optimizer = build_optimizer(algorithm, objective, args.dims, bounds, args.n_threads)
+            start = time.perf_counter()
+            objective.start_time = start
+            _, best_f, _ = optimizer.optimize()
+            wall = time.perf_counter() - start
+            flush_logs()
+    finally:
+        ext_prog.disable_server_mode()
+        if args.quiet:
+            output.close()
+
+    n = objective.n_evals
+    return {
+        'function': function,
+        'algorithm': algorithm,
+        'seed': seed,
+        'final_fitness': float(best_f),
+        'n_evals': n,
+        'wall_time': wall,
+        'evals_per_second': n / wall if wall > 0 else None,
+        'optimizer_overhead_per_eval': (wall - objective.busy_time) / n if n else None,
+        'time_to_target': objective.time_to_target,
+        'evals_to_target': objective.evals_to_target,
+        'cache': ext_prog.get_cache_stats()
+    }
+
+
+def summarize(runs):
+    """Agrega as repeticoes por (funcao, algoritmo)."""
+    groups = {}
+    for run in runs:
+        groups.setdefault((run['function'], run['algorithm']), []).append(run)
+
+    summary = []
+    for (function, algorithm), group in sorted(groups.items()):
+        fitness = np.array([r['final_fitness'] for r in group])
+        ttt = [r['time_to_target'] for r in group if r['time_to_target'] is not None]
+        summary.append({
+            'function': function,
+            'algorithm': algorithm,
+            'repeats': len(group),
+            'final_fitness_mean': float(fitness.mean()),
+            'final_fitness_std': float(fitness.std()),
+            'final_fitness_best': float(fitness.max()),
+            'evals_per_second_mean': float(np.mean([r['evals_per_second'] for r in group])),
+            'optimizer_overhead_per_eval_mean': float(np.mean(
+                [r['optimizer_overhead_per_eval'] for r in group])),
+            'n_evals_mean': float(np.mean([r['n_evals'] for r in group])),
+            'target_hit_rate': len(ttt) / len(group),
+            'time_to_target_median': float(np.median(ttt)) if ttt else None
+        })
+    return summary
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dos otimizadores")
+    parser.add_argument('--functions', nargs='+', default=list(FUNCTIONS), choices=list(FUNCTIONS))
+    parser.add_argument('--algorithms', nargs='+', default=list(ALGORITHMS), choices=list(ALGORITHMS))
+    parser.add_argument('--repeats', type=int, default=3, help="repeticoes (sementes 0..N-1)")
+    parser.add_argument('--dims', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=0.0, help="atraso por avaliacao (s)")
+    parser.add_argument('--noise', type=float, default=0.0, help="desvio do ruido gaussiano")
+    parser.add_argument('--target', type=float, default=-1e-2,
+                        help="fitness alvo para time-to-target (otimo = 0)")
+    parser.add_argument('--n-threads', type=int, default=None)
+    parser.add_argument('--cache-size', type=int, default=None)
+    parser.add_argument('--server-mode', action='store_true')
+    parser.add_argument('--output', default="benchmark_results.json")
+    parser.add_argument('--quiet', action='store_true', help="oculta os logs dos otimizadores")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Configuracao lida pelos programas de benchmark
+    os.environ['BENCH_DIMS'] = str(args.dims)
+    os.environ['BENCH_LATENCY'] = str(args.latency)
+    os.environ['BENCH_NOISE'] = str(args.noise)
+
+    runs = []
+    for function in args.functions:
+        for algorithm in args.algorithms:
+            for seed in range(args.repeats):
+                run = run_single(function, algorithm, seed, args)
+                runs.append(run)
+                print(f"{function:12s} {algorithm:16s} seed={seed} "
+                      f"f={run['final_fitness']:.6f} evals={run['n_evals']} "
+                      f"evals/s={run['evals_per_second']:.1f} "
+                      f"overhead/eval={run['optimizer_overhead_per_eval'] * 1e3:.3f}ms")
+
+    report = {
+        'meta': {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'args': vars(args)
+        },
+        'runs': runs,
+        'summary': summarize(runs)
+    }
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResultados gravados em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
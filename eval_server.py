@@ -0,0 +1,65 @@
+# eval_server.py
+"""
+Servidor de avaliacao para um no de trabalho.
+
+Uso:
+    python eval_server.py config.json --port 9000 --workers 4
+    PO_EVAL_TOKEN=segredo python eval_server.py config.json --host 0.0.0.0
+
+O servidor executa o programa configurado para qualquer cliente: por padrao
+so escuta em 127.0.0.1. Para atender outras maquinas, informe --host e
+um token compartilhado (--token ou a variavel PO_EVAL_TOKEN), que os
+clientes enviam no hello (RemoteEvaluator(token=...), chave remote_token).
+
+config.json tem o mesmo formato da configuracao dos workers (program_path,
+signature, num_params e opcionais como cache_size, server_mode,
+python_inprocess, eval_timeout). Os otimizadores usam os nos por meio de
+optimizer.remote_evaluator.RemoteEvaluator (backend 'remote').
+"""
+import sys
+import os
+import json
+import argparse
+
+# Garante que o diretório atual está no path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+import objective.external_program as ext_prog
+from objective.eval_server import EvaluationServer
+from utils import log
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor de avaliacao remota")
+    parser.add_argument('config', help="arquivo JSON com a configuracao do programa")
+    parser.add_argument('--host', default="127.0.0.1",
+                        help="interface de escuta (padrao: so a maquina local)")
+    parser.add_argument('--port', type=int, default=9000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="avaliacoes simultaneas neste no")
+    parser.add_argument('--token', default=os.environ.get('PO_EVAL_TOKEN'),
+                        help="segredo exigido no hello (padrao: $PO_EVAL_TOKEN)")
+    args = parser.parse_args(argv)
+
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+    ext_prog.configure_from_config(config)
+
+    server = EvaluationServer((args.host, args.port), n_workers=args.workers, token=args.token)
+    if args.token is None and args.host not in ("127.0.0.1", "localhost", "::1"):
+        log.warning(f"Servidor exposto em {args.host} sem token: qualquer cliente "
+                    f"pode executar o programa")
+    log(f"Servidor de avaliacao em {args.host}:{args.port} ({args.workers} workers, "
+        f"programa: {config['program_path']})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
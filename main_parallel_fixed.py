@@ -1,14 +1,14 @@
 # main_parallel_fixed.py
 """
 Script principal - executa os 3 algoritmos em PARALELO (VERSÃO OTIMIZADA)
-Com cronômetro, data/hora e divisão inteligente de threads
+Com cronômetro, data/hora e divisão inteligente de threads.
+Os algoritmos rodam em processos (multiprocessing) sem janelas nem
+arquivos temporarios; ver orchestrator.py
 """
 
-import subprocess
 import sys
 import os
-import json
-import time
+import argparse
 import multiprocessing
 
 # Garante que o diretório atual está no path
@@ -17,19 +17,26 @@ if current_dir not in sys.path:
     sys.path.insert(0, current_dir)
 
 from objective import select_program, detect_program_signature_smart
-from utils import log
+from orchestrator import run_algorithms
+from utils import log, configure_logging
 
-def get_optimal_threads():
-    """Detecta número de threads e divide APENAS entre os algoritmos que paralelizam"""
+def get_optimal_threads(num_params=None):
+    """Detecta número de threads e divide entre os três algoritmos"""
     total_threads = multiprocessing.cpu_count()
     
-    # Pattern Search NÃO paraleliza
-    # Divide threads APENAS entre PSO e Hybrid (50% cada)
-    threads_pso = total_threads // 2
-    threads_hybrid = total_threads // 2
+    # Pattern Search avalia os 2n pontos do poll em paralelo: recebe no
+    # maximo 2n threads (e no maximo 1/3 do total)
+    threads_ps = total_threads // 3
+    if num_params:
+        threads_ps = min(threads_ps, 2 * num_params)
+    
+    # O restante e dividido entre PSO e Hybrid (50% cada)
+    remaining = total_threads - threads_ps
+    threads_pso = remaining // 2
+    threads_hybrid = remaining // 2
     
     # Se for ímpar, dá a thread extra para o PSO (geralmente mais pesado)
-    if total_threads % 2 != 0:
+    if remaining % 2 != 0:
         threads_pso += 1
     
     print("\n" + "="*70)
@@ -38,100 +45,114 @@ def get_optimal_threads():
     print(f"Threads disponiveis no sistema: {total_threads}")
     print(f"")
     print(f"Divisao por algoritmo:")
-    print(f"  - Pattern Search:  0 threads (algoritmo sequencial)")
+    print(f"  - Pattern Search:  {threads_ps} threads (poll paralelo)")
     print(f"  - Particle Swarm:  {threads_pso} threads")
     print(f"  - Hybrid (PSO+PS): {threads_hybrid} threads")
     print(f"")
-    print(f"Total alocado: {threads_pso + threads_hybrid} de {total_threads} threads")
-    print(f"Aproveitamento: {((threads_pso + threads_hybrid) / total_threads * 100):.1f}%")
+    print(f"Total alocado: {threads_ps + threads_pso + threads_hybrid} de {total_threads} threads")
+    print(f"Aproveitamento: {((threads_ps + threads_pso + threads_hybrid) / total_threads * 100):.1f}%")
     print("="*70)
     
     return {
-        'pattern_search': 0,
+        'pattern_search': threads_ps,
         'particle_swarm': threads_pso,
         'hybrid': threads_hybrid
     }
 
-def create_config_file(name, program_path, signature, num_params, x0, bounds, n_threads, **kwargs):
-    """Cria arquivo de configuracao para um algoritmo"""
-    config = {
+def create_config(program_path, signature, num_params, x0, bounds, n_threads,
+                  cache_size=10000, server_mode=False, **kwargs):
+    """Cria a configuracao de um algoritmo"""
+    return {
         'program_path': program_path,
         'signature': signature,
         'num_params': num_params,
         'x0': x0,
         'bounds': bounds,
-        'result_file': f'result_{name}.json',
         'n_threads': n_threads,
+        'cache_size': cache_size,
+        'server_mode': server_mode,
         **kwargs
     }
-    
-    config_file = f'config_{name}.json'
-    with open(config_file, 'w') as f:
-        json.dump(config, f, indent=2)
-    
-    return os.path.abspath(config_file)
 
-def wait_for_results(result_files, timeout=300):
-    """Aguarda todos os arquivos de resultado serem criados"""
-    print("\nAguardando conclusao dos algoritmos...")
-    print("(Isso pode levar alguns minutos...)")
-    start_time = time.time()
+def print_progress(name, info):
+    """Mostra o progresso recebido dos processos (a cada 10 iteracoes)"""
+    if info['iteration'] % 10 == 0:
+        phase = f" [{info['phase']}]" if 'phase' in info else ""
+        print(f"  {name.upper()}{phase} iter {info['iteration']}: f = {info['best_f']:.6f} "
+              f"(tempo: {info['elapsed_time']:.2f}s)")
+
+def print_comparison(comparison):
+    """Exibe a comparacao final retornada por run_algorithms"""
+    total_execution_time = comparison['elapsed_time']
     
-    completed = set()
+    print("\n" + "="*70)
+    print("EXECUCAO CONCLUIDA")
+    print("="*70)
+    print(f"Tempo total de execucao paralela: {total_execution_time:.2f}s ({total_execution_time/60:.2f} min)")
+    print()
     
-    while time.time() - start_time < timeout:
-        for rf in result_files:
-            if rf not in completed and os.path.exists(rf):
-                completed.add(rf)
-                algo_name = rf.replace('result_', '').replace('.json', '').upper()
-                elapsed = time.time() - start_time
-                print(f"  ✓ {algo_name} concluido! (tempo decorrido: {elapsed:.2f}s)")
-        
-        if len(completed) == len(result_files):
-            time.sleep(1)
-            return True
-        
-        time.sleep(2)
+    print("="*70)
+    print("COMPARACAO FINAL")
+    print("="*70)
     
-    return False
-
-def load_results(result_files):
-    """Carrega resultados dos arquivos JSON"""
-    results = {}
-    for result_file in result_files:
-        if os.path.exists(result_file):
-            try:
-                with open(result_file, 'r') as f:
-                    result = json.load(f)
-                    results[result['algorithm']] = result
-            except Exception as e:
-                print(f"Erro ao ler {result_file}: {e}")
-        else:
-            print(f"Arquivo nao encontrado: {result_file}")
-    return results
-
-def cleanup_temp_files():
-    """Remove arquivos temporarios"""
-    temp_files = [
-        'config_ps.json', 'config_pso.json', 'config_hybrid.json',
-        'result_ps.json', 'result_pso.json', 'result_hybrid.json'
-    ]
-    for f in temp_files:
-        if os.path.exists(f):
-            try:
-                os.remove(f)
-            except:
-                pass
+    for name, status in sorted(comparison['status'].items()):
+        print(f"\n{name.upper()} ({status}):")
+        res = comparison['results'].get(name)
+        if res is not None:
+            print(f"  Fitness: {res['f']:.6f}")
+            print(f"  Solucao: {res['x']}")
+            print(f"  Iteracoes: {res['iterations']}")
+            print(f"  Tempo: {res['execution_time']:.2f}s")
+        elif name in comparison['progress']:
+            partial = comparison['progress'][name]
+            print(f"  Fitness parcial: {partial['best_f']:.6f}")
+            print(f"  Solucao parcial: {partial['best_x']}")
+        if name in comparison['errors']:
+            print(f"  Erro: {comparison['errors'][name]}")
+    
+    best = comparison['best']
+    print("\n" + "="*70)
+    if best is not None:
+        print(f"MELHOR RESULTADO: {best['algorithm'].upper()}")
+        print(f"Fitness: {best['f']:.6f}")
+    else:
+        print("Nenhum resultado foi obtido.")
+    print("="*70)
 
 def main():
+    parser = argparse.ArgumentParser(description="Executa os 3 algoritmos em paralelo")
+    parser.add_argument('--deadline', type=float, default=600,
+                        help="tempo maximo da execucao em segundos (padrao: 600)")
+    parser.add_argument('--target', type=float, default=None,
+                        help="fitness alvo: ao ser atingido, os demais algoritmos sao cancelados")
+    parser.add_argument('--quiet', action='store_true',
+                        help="nao mostra os logs dos algoritmos")
+    parser.add_argument('--max-evals', type=int, default=None,
+                        help="orcamento de avaliacoes por algoritmo (no hibrido, somando as fases)")
+    parser.add_argument('--eval-timeout', type=float, default=None,
+                        help="timeout inicial de cada avaliacao em segundos (depois adaptativo)")
+    parser.add_argument('--log-level', default=None, choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                        help="nivel minimo dos logs dos algoritmos")
+    parser.add_argument('--log-format', default=None, choices=['text', 'json'],
+                        help="formato dos logs dos algoritmos (json: uma linha por mensagem)")
+    parser.add_argument('--checkpoint-dir', default=None,
+                        help="diretorio para checkpoints periodicos de cada algoritmo")
+    parser.add_argument('--resume', action='store_true',
+                        help="retoma os algoritmos a partir dos checkpoints de --checkpoint-dir")
+    parser.add_argument('--portfolio', action='store_true',
+                        help="executa os 3 algoritmos com um pool e um orcamento compartilhados, "
+                             "movendo os workers para o que mais melhora (--max-evals vale para o total)")
+    args = parser.parse_args()
+    
+    # O processo principal so interage com o usuario: escrita sincrona
+    # mantem a ordem com os print()
+    configure_logging(background=False)
+    
     print("="*70)
     print("  SISTEMA DE OTIMIZACAO MULTI-ALGORITMO (PARALELO OTIMIZADO)")
     print("="*70)
     print()
     
-    # Limpa arquivos antigos
-    cleanup_temp_files()
-    
     # Seleciona programa
     log("Selecione o executavel...")
     program_path = select_program()
@@ -145,131 +166,57 @@ def main():
     log(f"Configuracao: {num_params} parametros, tipos: {signature}")
     log(f"Ponto inicial: {x0}")
     
-    # Detecta e divide threads
-    thread_config = get_optimal_threads()
-    
-    # Cria arquivos de configuracao com threads
     print("\nPreparando configuracoes...")
-    config_ps = create_config_file('ps', program_path, signature, num_params, x0, bounds,
-                                   n_threads=thread_config['pattern_search'], max_iter=50)
-    
-    config_pso = create_config_file('pso', program_path, signature, num_params, x0, bounds,
-                                    n_threads=thread_config['particle_swarm'], 
-                                    n_particles=20, max_iter=30)
-    
-    config_hybrid = create_config_file('hybrid', program_path, signature, num_params, x0, bounds,
-                                       n_threads=thread_config['hybrid'], n_particles=20, 
-                                       pso_max_iter=20, ps_max_iter=20)
-    
-    # Determina caminhos ABSOLUTOS
-    python_exe = sys.executable
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    
-    script_ps = os.path.join(current_dir, 'run_pattern_search.py')
-    script_pso = os.path.join(current_dir, 'run_particle_swarm.py')
-    script_hybrid = os.path.join(current_dir, 'run_hybrid.py')
-    
-    # Verifica se os scripts existem
-    missing_scripts = []
-    if not os.path.exists(script_ps):
-        missing_scripts.append('run_pattern_search.py')
-    if not os.path.exists(script_pso):
-        missing_scripts.append('run_particle_swarm.py')
-    if not os.path.exists(script_hybrid):
-        missing_scripts.append('run_hybrid.py')
-    
-    if missing_scripts:
-        print("\n" + "="*70)
-        print("ERRO: Scripts nao encontrados!")
-        print("="*70)
-        print("\nOs seguintes arquivos estao faltando no diretorio atual:")
-        for script in missing_scripts:
-            print(f"  - {script}")
-        print(f"\nDiretorio atual: {current_dir}")
-        print("\nPor favor, certifique-se de que todos os arquivos estao presentes.")
-        input("\nPressione Enter para sair...")
-        return
+    if args.portfolio:
+        # Um unico processo: o portfolio divide todas as threads dinamicamente
+        configs = {
+            'portfolio': create_config(program_path, signature, num_params, x0, bounds,
+                                       n_threads=multiprocessing.cpu_count(), max_iter=50,
+                                       algorithm_params={
+                                           'pso': {'n_particles': 20, 'max_iter': 30},
+                                           'hybrid': {'n_particles': 20, 'pso_max_iter': 20,
+                                                      'ps_max_iter': 20}
+                                       })
+        }
+    else:
+        # Detecta e divide threads
+        thread_config = get_optimal_threads(num_params)
+        configs = {
+            'ps': create_config(program_path, signature, num_params, x0, bounds,
+                                n_threads=thread_config['pattern_search'], max_iter=50,
+                                poll='complete'),
+            'pso': create_config(program_path, signature, num_params, x0, bounds,
+                                 n_threads=thread_config['particle_swarm'],
+                                 n_particles=20, max_iter=30),
+            'hybrid': create_config(program_path, signature, num_params, x0, bounds,
+                                    n_threads=thread_config['hybrid'], n_particles=20,
+                                    pso_max_iter=20, ps_max_iter=20,
+                                    # Uma busca local por ate 4 threads do hibrido
+                                    n_starts=max(1, min(4, thread_config['hybrid'])))
+        }
+    
+    for config in configs.values():
+        config['max_evals'] = args.max_evals
+        config['eval_timeout'] = args.eval_timeout
+        config['log_level'] = args.log_level
+        config['log_format'] = args.log_format
+    
+    # Checkpoints: um arquivo por algoritmo
+    if args.checkpoint_dir:
+        os.makedirs(args.checkpoint_dir, exist_ok=True)
+        for name, config in configs.items():
+            config['checkpoint_path'] = os.path.join(args.checkpoint_dir, f"{name}.ckpt")
+            config['resume'] = args.resume
     
     print("\n" + "="*70)
     print("INICIANDO ALGORITMOS EM PARALELO...")
     print("="*70)
     print()
     
-    execution_start = time.time()
-    
-    # Prepara comandos
-    cmd_ps = ['cmd', '/c', 'start', 'Pattern Search', 'cmd', '/k', python_exe, script_ps, config_ps]
-    print(f"[1/3] Iniciando Pattern Search...")
-    subprocess.Popen(cmd_ps, cwd=current_dir)
-    time.sleep(0.5)
-    
-    cmd_pso = ['cmd', '/c', 'start', 'Particle Swarm', 'cmd', '/k', python_exe, script_pso, config_pso]
-    print(f"[2/3] Iniciando Particle Swarm...")
-    subprocess.Popen(cmd_pso, cwd=current_dir)
-    time.sleep(0.5)
-    
-    cmd_hybrid = ['cmd', '/c', 'start', 'Hybrid Optimizer', 'cmd', '/k', python_exe, script_hybrid, config_hybrid]
-    print(f"[3/3] Iniciando Hybrid...")
-    subprocess.Popen(cmd_hybrid, cwd=current_dir)
-    
-    print()
-    print("="*70)
-    print("Tres janelas de comando foram abertas!")
-    print("Cada janela mostra o progresso com data/hora e cronometro.")
-    print("="*70)
-    print()
-    
-    # Aguarda resultados
-    result_files = ['result_ps.json', 'result_pso.json', 'result_hybrid.json']
-    
-    if wait_for_results(result_files, timeout=600):
-        total_execution_time = time.time() - execution_start
-        
-        print("\n" + "="*70)
-        print("TODOS OS ALGORITMOS CONCLUIRAM!")
-        print("="*70)
-        print(f"Tempo total de execucao paralela: {total_execution_time:.2f}s ({total_execution_time/60:.2f} min)")
-        print()
-        
-        # Carrega e exibe resultados
-        results = load_results(result_files)
-        
-        if results:
-            print("="*70)
-            print("COMPARACAO FINAL")
-            print("="*70)
-            
-            for name, res in sorted(results.items()):
-                print(f"\n{name}:")
-                print(f"  Fitness: {res['f']:.6f}")
-                print(f"  Solucao: {res['x']}")
-                print(f"  Iteracoes: {res['iterations']}")
-                if 'execution_time' in res:
-                    print(f"  Tempo: {res['execution_time']:.2f}s")
-            
-            # Melhor resultado
-            if len(results) > 0:
-                best_name = max(results.items(), key=lambda x: x[1]['f'])[0]
-                best_f = results[best_name]['f']
-                
-                print("\n" + "="*70)
-                print(f"MELHOR RESULTADO: {best_name}")
-                print(f"Fitness: {best_f:.6f}")
-                print("="*70)
-        else:
-            print("Nenhum resultado foi carregado com sucesso.")
-    else:
-        print("\nTimeout: Alguns algoritmos ainda estao executando.")
-        print("Verifique as janelas abertas para o progresso.")
-    
-    # Pergunta se deve limpar arquivos temporarios
-    print()
-    cleanup = input("\nDeseja remover arquivos temporarios? (s/n): ")
-    if cleanup.lower() == 's':
-        cleanup_temp_files()
-        print("Arquivos temporarios removidos.")
+    comparison = run_algorithms(configs, deadline=args.deadline, target_fitness=args.target,
+                                quiet=args.quiet, on_progress=print_progress)
     
-    input("\nPressione Enter para sair...")
+    print_comparison(comparison)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
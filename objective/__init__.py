@@ -3,12 +3,43 @@ from objective.external_program import (
     select_program,
     detect_program_signature_smart,
     run_external_program,
-    get_program_info
+    get_program_info,
+    configure_program,
+    enable_cache,
+    disable_cache,
+    get_cache_stats,
+    configure_from_config,
+    enable_server_mode,
+    disable_server_mode,
+    enable_python_inprocess,
+    disable_python_inprocess,
+    configure_timeouts
+)
+from objective.timeouts import AdaptiveTimeout, EvaluationTimeout
+from objective.eval_server import EvaluationServer
+from objective.async_program import (
+    run_external_program_async,
+    evaluate_batch_async
 )
 
 __all__ = [
     "select_program",
     "detect_program_signature_smart",
     "run_external_program",
-    "get_program_info"
+    "get_program_info",
+    "configure_program",
+    "enable_cache",
+    "disable_cache",
+    "get_cache_stats",
+    "configure_from_config",
+    "enable_server_mode",
+    "disable_server_mode",
+    "enable_python_inprocess",
+    "disable_python_inprocess",
+    "configure_timeouts",
+    "AdaptiveTimeout",
+    "EvaluationTimeout",
+    "EvaluationServer",
+    "run_external_program_async",
+    "evaluate_batch_async"
 ]
\ No newline at end of file
@@ -0,0 +1,80 @@
+# objective/async_program.py
+"""
+Versao asyncio de run_external_program.
+
+Cada avaliacao e um subprocesso asyncio; o numero de avaliacoes simultaneas
+e limitado por um semaforo, e timeouts ou cancelamentos matam o processo
+filho.
+"""
+import asyncio
+import time
+
+import objective.external_program as ext_prog
+from utils.profiler import profiler
+
+
+async def run_external_program_async(params, timeout=None):
+    """Executa o programa com parametros sem bloquear o event loop.
+
+    O programa e a assinatura precisam estar configurados (configure_program
+    ou deteccao previa), pois a selecao interativa nao roda dentro do loop.
+    timeout None usa o timeout adaptativo de external_program; uma
+    avaliacao que o excede recebe a penalidade configurada.
+    """
+    if ext_prog.program_path is None or not ext_prog.program_signature:
+        raise ValueError("Programa nao configurado.")
+
+    if len(params) != ext_prog.num_params:
+        raise ValueError(f"Numero incorreto de parametros! Esperado: {ext_prog.num_params}, "
+                         f"Recebido: {len(params)}")
+
+    converted = ext_prog.convert_params(params)
+    adaptive = timeout is None
+    if adaptive:
+        timeout = ext_prog.eval_timeout.current()
+
+    t0 = time.perf_counter()
+    process = await asyncio.create_subprocess_exec(
+        ext_prog.program_path, *converted,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        profiler.incr('eval_timeouts')
+        if adaptive:
+            ext_prog.eval_timeout.observe_timeout(timeout)
+        return ext_prog.penalize_timeout()
+    except asyncio.CancelledError:
+        process.kill()
+        await process.wait()
+        raise
+
+    output = stdout.decode().strip()
+
+    if process.returncode != 0:
+        error_msg = stderr.decode().strip() or output
+        raise RuntimeError(f"Programa retornou erro: {error_msg}")
+
+    try:
+        value = float(output)
+    except ValueError:
+        raise ValueError(f"Saida inesperada: '{output}'")
+
+    if adaptive:
+        ext_prog.eval_timeout.observe(time.perf_counter() - t0)
+    return value
+
+
+async def evaluate_batch_async(points, max_concurrency=64, timeout=None):
+    """Avalia varios pontos com no maximo max_concurrency processos vivos."""
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def evaluate(point):
+        async with semaphore:
+            return await run_external_program_async(point, timeout)
+
+    return await asyncio.gather(*(evaluate(p) for p in points))
@@ -0,0 +1,85 @@
+# objective/cache.py
+"""
+Cache LRU de avaliacoes do programa externo.
+
+A chave e a tupla de argumentos ja convertidos (strings passadas ao
+programa), de modo que pontos que arredondam para o mesmo inteiro
+compartilham a mesma avaliacao.
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+class EvaluationCache:
+    """Cache LRU limitado, seguro entre threads, com deduplicacao em voo.
+
+    Se duas threads pedem a mesma chave ao mesmo tempo, apenas a primeira
+    executa compute(); as demais esperam pelo mesmo resultado.
+    """
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+
+            future = self._in_flight.get(key)
+            if future is not None:
+                # Outra thread ja esta avaliando este ponto
+                self.hits += 1
+                owner = False
+            else:
+                future = Future()
+                self._in_flight[key] = future
+                self.misses += 1
+                owner = True
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = compute()
+        except BaseException as e:
+            # Erros nao sao armazenados: a proxima chamada tenta de novo
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._data[key] = value
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            del self._in_flight[key]
+        future.set_result(value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hit_rate': self.hits / total if total else 0.0
+            }
+
+    def __len__(self):
+        return len(self._data)
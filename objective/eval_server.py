@@ -0,0 +1,103 @@
+# objective/eval_server.py
+"""
+Servidor de avaliacao para execucao em varios nos.
+
+Cada no roda um EvaluationServer que avalia pontos com run_external_program
+(o programa e configurado localmente, ver eval_server.py na raiz). Os
+clientes (optimizer.remote_evaluator.RemoteEvaluator) mantem conexoes TCP
+persistentes e enviam varios pedidos por conexao.
+
+Protocolo: uma mensagem JSON por linha, nos dois sentidos.
+  {"op": "hello", "token": "..."}        -> {"op": "hello", "workers": N}
+  {"op": "ping"}                         -> {"op": "pong"}
+  {"op": "eval", "id": 7, "params": [...]}
+      -> {"id": 7, "value": 1.5}  ou  {"id": 7, "error": "mensagem"}
+As respostas de eval podem chegar fora de ordem; o id as identifica.
+
+O servidor executa o programa configurado para quem se conectar. Com
+token, a conexao so e atendida depois de um hello com o mesmo token; caso
+contrario o servidor responde {"op": "error", ...} e fecha a conexao.
+"""
+import hmac
+import json
+import socketserver
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import objective.external_program as ext_prog
+
+
+def encode_message(message):
+    return (json.dumps(message) + "\n").encode("utf-8")
+
+
+def decode_message(line):
+    return json.loads(line.decode("utf-8"))
+
+
+class _ConnectionHandler(socketserver.StreamRequestHandler):
+    """Atende uma conexao: le pedidos e responde quando cada avaliacao termina."""
+
+    def handle(self):
+        server = self.server
+        write_lock = threading.Lock()
+
+        def send(message):
+            with write_lock:
+                try:
+                    self.wfile.write(encode_message(message))
+                    self.wfile.flush()
+                except OSError:
+                    pass
+
+        def evaluate(request_id, params):
+            try:
+                value = server.evaluate(params)
+                send({'id': request_id, 'value': float(value)})
+            except Exception as e:
+                send({'id': request_id, 'error': str(e)})
+
+        authenticated = server.token is None
+        for line in self.rfile:
+            try:
+                message = decode_message(line)
+            except ValueError:
+                continue
+
+            op = message.get('op')
+            if not authenticated:
+                if op != 'hello' or not server.check_token(message.get('token')):
+                    send({'op': 'error', 'error': "token invalido"})
+                    return
+                authenticated = True
+
+            if op == 'eval':
+                server.executor.submit(evaluate, message['id'], message['params'])
+            elif op == 'ping':
+                send({'op': 'pong'})
+            elif op == 'hello':
+                send({'op': 'hello', 'workers': server.n_workers})
+
+
+class EvaluationServer(socketserver.ThreadingTCPServer):
+    """Servidor TCP que avalia pontos com ate n_workers avaliacoes simultaneas."""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address, n_workers=1, evaluate=None, token=None):
+        super().__init__(address, _ConnectionHandler)
+        self.n_workers = n_workers
+        self.evaluate = evaluate or ext_prog.run_external_program
+        # Segredo compartilhado com os clientes (None: sem autenticacao)
+        self.token = token
+        self.executor = ThreadPoolExecutor(max_workers=n_workers, thread_name_prefix="remote-eval")
+
+    def check_token(self, token):
+        if self.token is None:
+            return True
+        return isinstance(token, str) and hmac.compare_digest(token.encode(), self.token.encode())
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -2,10 +2,34 @@ import subprocess
 import tkinter as tk
 from tkinter import filedialog
 import re
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from objective.cache import EvaluationCache
+from objective.program_server import ProgramServerPool
+from objective.python_objective import PythonObjective
+from objective.signature_cache import load_cached_signature, save_cached_signature
+from objective.timeouts import AdaptiveTimeout, EvaluationTimeout
+from utils.logger import get_logger
+from utils.profiler import profiler
+
+log = get_logger("PROGRAM")
 
 program_path = None
 program_signature = []
 num_params = 0
+# Numero de sondagens simultaneas durante a deteccao de assinatura
+detection_workers = 10
+evaluation_cache = None
+server_pool = None
+python_objective = None
+# Avaliacoes em processo ainda conferidas contra o subprocesso
+python_verify_remaining = 0
+_verify_lock = threading.Lock()
+# Timeout de cada avaliacao (adaptado as latencias observadas)
+eval_timeout = AdaptiveTimeout()
+# Valor atribuido a uma avaliacao que excedeu o timeout (None: levanta excecao)
+timeout_penalty = float("-inf")
 
 
 def select_program():
@@ -26,6 +50,64 @@ def select_program():
     return program_path
 
 
+def configure_program(path, signature, n_params, cache_size=None):
+    """Configura o programa sem deteccao (usado pelos workers e pelos pools de processos)."""
+    global program_path, program_signature, num_params
+
+    program_path = path
+    program_signature = list(signature)
+    num_params = n_params
+
+    # Reconfigurar sem cache_size desativa o cache anterior
+    if cache_size:
+        enable_cache(cache_size)
+    else:
+        disable_cache()
+
+
+def configure_from_config(config):
+    """Configura o programa a partir do dicionario de configuracao dos workers."""
+    configure_program(config['program_path'], config['signature'], config['num_params'],
+                      cache_size=config.get('cache_size'))
+
+    if config.get('server_mode'):
+        enable_server_mode(server_args=config.get('server_args', ['--server']),
+                           handshake=config.get('server_handshake', 'READY'))
+
+    if config.get('python_inprocess'):
+        enable_python_inprocess(callable_name=config.get('python_callable'),
+                                verify_samples=config.get('python_verify_samples', 3))
+
+    configure_timeouts(initial=config.get('eval_timeout'),
+                       adaptive=config.get('timeout_adaptive'),
+                       multiplier=config.get('timeout_multiplier'),
+                       percentile=config.get('timeout_percentile'),
+                       min_timeout=config.get('timeout_min'),
+                       max_timeout=config.get('timeout_max'),
+                       penalty=config.get('timeout_penalty', float("-inf")))
+
+
+def configure_timeouts(initial=None, adaptive=None, multiplier=None, percentile=None,
+                       min_timeout=None, max_timeout=None, penalty=float("-inf")):
+    """Configura o timeout adaptativo e a penalidade de avaliacoes lentas.
+
+    Parametros None mantem o padrao de AdaptiveTimeout. penalty None faz
+    um timeout levantar EvaluationTimeout, como antes.
+    """
+    global eval_timeout, timeout_penalty
+
+    options = {
+        'initial': initial,
+        'adaptive': adaptive,
+        'multiplier': multiplier,
+        'percentile': percentile,
+        'min_timeout': min_timeout,
+        'max_timeout': max_timeout
+    }
+    eval_timeout = AdaptiveTimeout(**{k: v for k, v in options.items() if v is not None})
+    timeout_penalty = penalty
+
+
 def test_program_with_params(params):
     """Testa o programa com parametros."""
     global program_path
@@ -37,7 +119,10 @@ def test_program_with_params(params):
         str_params = [str(p) for p in params]
         cmd = [program_path] + str_params
         
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+        t0 = time.perf_counter()
+        result = subprocess.run(cmd, capture_output=True, text=True,
+                                timeout=eval_timeout.current())
+        elapsed = time.perf_counter() - t0
         
         output = result.stdout.strip()
         error = result.stderr.strip()
@@ -47,6 +132,7 @@ def test_program_with_params(params):
         
         try:
             float(output)
+            eval_timeout.observe(elapsed)
             return True, output, error
         except ValueError:
             return False, output, error
@@ -106,25 +192,33 @@ def parse_help_output_advanced(output):
     return {'found': False, 'num_params': 0, 'types': [], 'bounds': None}
 
 
+def _run_help_probe(args):
+    """Executa uma sondagem de ajuda e retorna a saida (ou None)."""
+    try:
+        cmd = [program_path] + args
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=2)
+        return result.stdout + result.stderr
+    except Exception:
+        return None
+
+
 def try_get_help_info():
     """Tenta extrair informacoes usando --help."""
     global program_path
     
     help_attempts = [["--help"], ["-h"], ["--usage"], ["-help"], []]
     
-    for args in help_attempts:
-        try:
-            cmd = [program_path] + args
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=2)
-            output = (result.stdout + result.stderr)
-            
-            if output:
-                print(f"Tentativa com {args or '[sem args]'}: {len(output)} caracteres")
-                parsed = parse_help_output_advanced(output)
-                if parsed['found']:
-                    return parsed
-        except:
-            continue
+    # Todas as sondagens rodam ao mesmo tempo; a prioridade e mantida
+    # analisando as saidas na ordem original
+    with ThreadPoolExecutor(max_workers=detection_workers) as executor:
+        outputs = list(executor.map(_run_help_probe, help_attempts))
+    
+    for args, output in zip(help_attempts, outputs):
+        if output:
+            print(f"Tentativa com {args or '[sem args]'}: {len(output)} caracteres")
+            parsed = parse_help_output_advanced(output)
+            if parsed['found']:
+                return parsed
     
     return {'found': False, 'num_params': 0, 'types': [], 'bounds': None}
 
@@ -135,10 +229,12 @@ def detect_num_params_by_testing():
     
     print("Detectando numero de parametros por teste...")
     
-    for n in range(1, 11):
-        test_params = [50] * n
-        success, output, error = test_program_with_params(test_params)
-        
+    # Testa 1..10 parametros simultaneamente e fica com o menor que funciona
+    candidates = list(range(1, 11))
+    with ThreadPoolExecutor(max_workers=detection_workers) as executor:
+        outcomes = list(executor.map(lambda n: test_program_with_params([50] * n), candidates))
+    
+    for n, (success, output, error) in zip(candidates, outcomes):
         if success:
             print(f"Programa aceita {n} parametros")
             return n, True
@@ -155,20 +251,27 @@ def detect_param_types(num_params):
     
     print(f"Detectando tipos dos {num_params} parametros...")
     
-    types = []
-    
+    # Para cada parametro: um teste com inteiro e outro com float
+    tests = []
     for i in range(num_params):
         base_params = [50] * num_params
         
-        # Teste com inteiro
         test_params_int = base_params.copy()
         test_params_int[i] = 10
-        success_int, output_int, _ = test_program_with_params(test_params_int)
         
-        # Teste com float
         test_params_float = base_params.copy()
         test_params_float[i] = 10.5
-        success_float, output_float, _ = test_program_with_params(test_params_float)
+        
+        tests.extend([test_params_int, test_params_float])
+    
+    with ThreadPoolExecutor(max_workers=detection_workers) as executor:
+        outcomes = list(executor.map(test_program_with_params, tests))
+    
+    types = []
+    
+    for i in range(num_params):
+        success_int = outcomes[2 * i][0]
+        success_float = outcomes[2 * i + 1][0]
         
         if success_int and not success_float:
             param_type = "int"
@@ -185,13 +288,24 @@ def detect_param_types(num_params):
     return types
 
 
-def detect_program_signature_smart():
-    """Deteccao automatica da assinatura do programa."""
+def detect_program_signature_smart(use_cache=True):
+    """Deteccao automatica da assinatura do programa.
+
+    Com use_cache, uma assinatura ja detectada para o mesmo executavel
+    (mesmo caminho, tamanho, mtime e hash) e reutilizada sem sondagens.
+    """
     global program_path, program_signature, num_params
     
     if program_path is None:
         select_program()
     
+    if use_cache:
+        cached = load_cached_signature(program_path)
+        if cached is not None:
+            program_signature, num_params, bounds = cached
+            print(f"Assinatura carregada do cache: {num_params} parametros, tipos: {program_signature}")
+            return program_signature, num_params, bounds
+    
     print("="*60)
     print("DETECCAO AUTOMATICA DE ASSINATURA")
     print("="*60)
@@ -227,23 +341,126 @@ def detect_program_signature_smart():
     print(f"  Tipos: {program_signature}")
     print("="*60 + "\n")
     
+    if use_cache:
+        save_cached_signature(program_path, program_signature, num_params, bounds)
+    
     return program_signature, num_params, bounds
 
 
-def run_external_program(params):
-    """Executa o programa com parametros."""
-    global program_path, program_signature, num_params
+def enable_cache(maxsize=10000):
+    """Ativa o cache LRU de avaliacoes na frente de run_external_program."""
+    global evaluation_cache
+
+    evaluation_cache = EvaluationCache(maxsize)
+    return evaluation_cache
+
+
+def disable_cache():
+    """Desativa o cache de avaliacoes."""
+    global evaluation_cache
+
+    evaluation_cache = None
+
+
+def get_cache_stats():
+    """Retorna hits/misses do cache deste processo, ou None se desativado.
+
+    Com o backend 'process' (ou 'remote'), cada worker tem o seu proprio
+    cache: estes numeros cobrem so as avaliacoes feitas neste processo.
+    """
+    if evaluation_cache is None:
+        return None
+    return evaluation_cache.stats()
+
+
+def enable_server_mode(server_args=("--server",), handshake="READY", startup_timeout=10):
+    """Ativa o modo servidor: o programa fica vivo e avalia uma linha por vez.
+
+    Ver objective/program_server.py para o protocolo.
+    """
+    global server_pool
 
     if program_path is None:
-        select_program()
+        raise ValueError("Programa nao selecionado.")
 
-    if not program_signature or num_params == 0:
-        detect_program_signature_smart()
+    disable_server_mode()
+    server_pool = ProgramServerPool(program_path, server_args, handshake, startup_timeout)
+    return server_pool
 
-    if len(params) != num_params:
-        raise ValueError(f"Numero incorreto de parametros! Esperado: {num_params}, Recebido: {len(params)}")
 
-    # Converte parametros
+def disable_server_mode():
+    """Encerra os processos do modo servidor e volta a um processo por avaliacao."""
+    global server_pool
+
+    if server_pool is not None:
+        server_pool.close()
+        server_pool = None
+
+
+def enable_python_inprocess(callable_name=None, verify_samples=3):
+    """Carrega o objetivo Python uma vez e avalia no proprio processo.
+
+    As primeiras verify_samples avaliacoes tambem rodam pelo subprocesso;
+    se os valores divergirem, o modo e desativado e volta-se ao subprocesso.
+    """
+    global python_objective, python_verify_remaining
+
+    if program_path is None:
+        raise ValueError("Programa nao selecionado.")
+    if not program_path.endswith(".py"):
+        raise ValueError("O modo em processo exige um script Python (.py).")
+
+    disable_python_inprocess()
+    python_objective = PythonObjective(program_path, program_signature, callable_name)
+    python_verify_remaining = verify_samples
+    print(f"Objetivo Python carregado em processo (modo: {python_objective.mode})")
+    return python_objective
+
+
+def disable_python_inprocess():
+    """Volta a executar o script Python em um subprocesso por avaliacao."""
+    global python_objective
+
+    if python_objective is not None:
+        python_objective.close()
+        python_objective = None
+
+
+def _execute_python(objective, converted):
+    """Avalia em processo, conferindo as primeiras avaliacoes com o subprocesso."""
+    global python_objective, python_verify_remaining
+
+    limit = eval_timeout.current()
+    t0 = time.perf_counter()
+    try:
+        value = objective(converted, timeout=limit)
+    except EvaluationTimeout:
+        eval_timeout.observe_timeout(limit)
+        raise
+    elapsed = time.perf_counter() - t0
+    eval_timeout.observe(elapsed)
+    profiler.record('eval_inprocess', elapsed)
+
+    with _verify_lock:
+        verify = python_verify_remaining > 0
+        if verify:
+            python_verify_remaining -= 1
+
+    if verify:
+        expected = _execute_subprocess(converted)
+        if abs(expected - value) > 1e-6 * max(1.0, abs(expected)):
+            print(f"AVISO: objetivo em processo divergiu do subprocesso "
+                  f"({value} != {expected}); modo em processo desativado")
+            # Sem close(): outros threads podem estar avaliando; os processos
+            # do modo main terminam com o programa (atexit)
+            python_objective = None
+            return expected
+
+    return value
+
+
+def convert_params(params):
+    """Converte os parametros para os argumentos de linha de comando."""
     converted = []
     for p, t in zip(params, program_signature):
         if t == "int":
@@ -252,30 +469,134 @@ def run_external_program(params):
             converted.append(f"{float(p):.10f}")
         else:
             converted.append(str(p))
+    return converted
+
+
+def execute_program(converted):
+    """Executa o programa com argumentos ja convertidos e retorna o valor.
+
+    Fases registradas no profiler: eval_spawn (criacao do processo),
+    eval_run (execucao do objetivo ate o fim da saida) e eval_parse.
+    """
+    objective = python_objective
+    if objective is not None:
+        try:
+            return _execute_python(objective, converted)
+        except EvaluationTimeout:
+            # Mesmo tratamento do subprocesso: penalidade em run_external_program
+            profiler.incr('eval_timeouts')
+            raise
+        except Exception as e:
+            profiler.incr('eval_failures')
+            raise RuntimeError(f"Erro ao executar: {e}")
+
+    pool = server_pool
+    if pool is not None:
+        limit = eval_timeout.current()
+        t0 = time.perf_counter()
+        try:
+            value = pool.evaluate(converted, timeout=limit)
+            eval_timeout.observe(time.perf_counter() - t0)
+            return value
+        except EvaluationTimeout:
+            profiler.incr('eval_timeouts')
+            eval_timeout.observe_timeout(limit)
+            raise
+        except Exception:
+            profiler.incr('eval_failures')
+            raise
+        finally:
+            profiler.record('eval_server_request', time.perf_counter() - t0)
+
+    return _execute_subprocess(converted)
 
-    cmd = [program_path] + converted
+
+def _execute_subprocess(converted):
+    """Executa o programa em um novo processo."""
+    cmd = [program_path] + list(converted)
+    limit = eval_timeout.current()
     
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+        t0 = time.perf_counter()
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        t1 = time.perf_counter()
         
-        if result.returncode != 0:
-            error_msg = result.stderr.strip() or result.stdout.strip()
+        try:
+            stdout, stderr = process.communicate(timeout=limit)
+        except subprocess.TimeoutExpired:
+            # Avaliacao atrasada: o processo e encerrado
+            process.kill()
+            process.communicate()
+            raise
+        t2 = time.perf_counter()
+        
+        if process.returncode != 0:
+            error_msg = stderr.strip() or stdout.strip()
             raise RuntimeError(f"Programa retornou erro: {error_msg}")
         
-        output = result.stdout.strip()
+        output = stdout.strip()
         
         try:
             value = float(output)
-            return value
         except ValueError:
             raise ValueError(f"Saida inesperada: '{output}'")
+        
+        t3 = time.perf_counter()
+        eval_timeout.observe(t2 - t0)
+        profiler.record('eval_spawn', t1 - t0)
+        profiler.record('eval_run', t2 - t1)
+        profiler.record('eval_parse', t3 - t2)
+        return value
             
     except subprocess.TimeoutExpired:
-        raise RuntimeError("Timeout")
+        profiler.incr('eval_timeouts')
+        eval_timeout.observe_timeout(limit)
+        raise EvaluationTimeout()
     except Exception as e:
+        profiler.incr('eval_failures')
         raise RuntimeError(f"Erro ao executar: {e}")
 
 
+def run_external_program(params):
+    """Executa o programa com parametros."""
+    global program_path, program_signature, num_params
+
+    if program_path is None:
+        select_program()
+
+    if not program_signature or num_params == 0:
+        detect_program_signature_smart()
+
+    if len(params) != num_params:
+        raise ValueError(f"Numero incorreto de parametros! Esperado: {num_params}, Recebido: {len(params)}")
+
+    converted = tuple(convert_params(params))
+
+    t0 = time.perf_counter()
+    try:
+        cache = evaluation_cache
+        if cache is not None:
+            return cache.get_or_compute(converted, lambda: execute_program(converted))
+
+        return execute_program(converted)
+    except EvaluationTimeout:
+        # Penalidade nao entra no cache: o ponto pode ser reavaliado depois
+        return penalize_timeout()
+    finally:
+        profiler.record('eval_total', time.perf_counter() - t0)
+
+
+def penalize_timeout():
+    """Valor de uma avaliacao que excedeu o timeout (ou a excecao, sem penalidade)."""
+    if timeout_penalty is None:
+        raise EvaluationTimeout()
+    profiler.incr('eval_penalized')
+    log.warning(f"Avaliacao excedeu o timeout e recebeu {timeout_penalty} "
+                f"({eval_timeout.n_timeouts} ate agora; timeout agora "
+                f"{eval_timeout.current():.2f}s)")
+    return timeout_penalty
+
+
 def get_program_info():
     """Retorna informacoes sobre o programa."""
     global program_path, program_signature, num_params
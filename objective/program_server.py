@@ -0,0 +1,173 @@
+# objective/program_server.py
+"""
+Modo servidor: o programa externo e iniciado uma vez e mantido vivo.
+
+Protocolo (texto, uma linha por mensagem):
+  1. O programa e iniciado com os argumentos de servidor (padrao: --server)
+     e escreve a linha de handshake (padrao: READY) quando estiver pronto.
+  2. Para cada avaliacao recebe em stdin os parametros separados por espaco
+     e responde em stdout com uma linha contendo o valor numerico.
+     Uma resposta iniciada por ERROR indica falha naquela avaliacao.
+  3. A linha QUIT (ou o fim de stdin) encerra o programa.
+"""
+import atexit
+import queue
+import subprocess
+import threading
+
+from objective.timeouts import EvaluationTimeout
+
+
+class PersistentProgram:
+    """Uma instancia viva do programa externo falando o protocolo acima."""
+
+    def __init__(self, path, server_args=("--server",), handshake="READY",
+                 startup_timeout=10):
+        self.path = path
+        self.server_args = list(server_args)
+        self.handshake = handshake
+        self.startup_timeout = startup_timeout
+        self.process = None
+        self.restarts = 0
+        self._lines = None
+
+    def _read_stdout(self, process, lines):
+        for line in process.stdout:
+            lines.put(line)
+        lines.put(None)  # EOF: processo terminou
+
+    def start(self):
+        cmd = [self.path] + self.server_args
+        self.process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        stderr=subprocess.DEVNULL, text=True, bufsize=1)
+        self._lines = queue.Queue()
+        threading.Thread(target=self._read_stdout, args=(self.process, self._lines),
+                         daemon=True).start()
+
+        try:
+            line = self._lines.get(timeout=self.startup_timeout)
+        except queue.Empty:
+            self.kill()
+            raise RuntimeError("Timeout no handshake do modo servidor")
+
+        if line is None or line.strip() != self.handshake:
+            self.kill()
+            raise RuntimeError(f"Handshake inesperado do modo servidor: {line!r}")
+
+    def is_alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def restart(self):
+        self.kill()
+        self.restarts += 1
+        self.start()
+
+    def evaluate(self, converted, timeout=10, retries=1):
+        """Envia uma linha de parametros e retorna o valor lido."""
+        if not self.is_alive():
+            if self.process is None:
+                self.start()
+            else:
+                self.restart()
+
+        try:
+            self.process.stdin.write(" ".join(converted) + "\n")
+            self.process.stdin.flush()
+            line = self._lines.get(timeout=timeout)
+        except (BrokenPipeError, OSError):
+            line = None
+        except queue.Empty:
+            # Processo travado: descarta e reinicia na proxima avaliacao
+            self.kill()
+            raise EvaluationTimeout()
+
+        if line is None:
+            # Processo morreu durante a avaliacao
+            self.kill()
+            if retries > 0:
+                self.restart()
+                return self.evaluate(converted, timeout, retries - 1)
+            raise RuntimeError("Programa em modo servidor terminou inesperadamente")
+
+        output = line.strip()
+        if output.startswith("ERROR"):
+            raise RuntimeError(f"Programa retornou erro: {output[5:].strip()}")
+
+        try:
+            return float(output)
+        except ValueError:
+            raise ValueError(f"Saida inesperada: '{output}'")
+
+    def kill(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+
+    def close(self):
+        if self.process is None:
+            return
+        if self.process.poll() is None:
+            try:
+                self.process.stdin.write("QUIT\n")
+                self.process.stdin.close()
+                self.process.wait(timeout=2)
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+        self.kill()
+
+
+class ProgramServerPool:
+    """Conjunto de instancias persistentes; cresce conforme a concorrencia.
+
+    Cada avaliacao usa uma instancia ociosa, ou inicia uma nova se todas
+    estiverem ocupadas, entao o numero de processos acompanha o numero de
+    threads que avaliam ao mesmo tempo.
+    """
+
+    def __init__(self, path, server_args=("--server",), handshake="READY",
+                 startup_timeout=10):
+        self.path = path
+        self.server_args = server_args
+        self.handshake = handshake
+        self.startup_timeout = startup_timeout
+        self._idle = []
+        self._all = []
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def _acquire(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        instance = PersistentProgram(self.path, self.server_args, self.handshake,
+                                     self.startup_timeout)
+        instance.start()
+        with self._lock:
+            self._all.append(instance)
+        return instance
+
+    def _release(self, instance):
+        with self._lock:
+            self._idle.append(instance)
+
+    def evaluate(self, converted, timeout=10):
+        instance = self._acquire()
+        try:
+            return instance.evaluate(converted, timeout)
+        finally:
+            self._release(instance)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'processes': len(self._all),
+                'restarts': sum(p.restarts for p in self._all)
+            }
+
+    def close(self):
+        with self._lock:
+            instances = list(self._all)
+            self._all.clear()
+            self._idle.clear()
+        for instance in instances:
+            instance.close()
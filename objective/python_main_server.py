@@ -0,0 +1,73 @@
+# objective/python_main_server.py
+"""
+Processo pre-aquecido que executa o bloco __main__ de um script Python.
+
+Uso: python python_main_server.py <script.py>
+
+Fala o protocolo do modo servidor (ver objective/program_server.py): escreve
+READY, recebe uma linha de parametros por avaliacao e responde com o valor
+(a ultima linha impressa pelo script) ou ERROR. QUIT encerra.
+
+Cada processo executa uma avaliacao por vez, entao substituir sys.argv e
+sys.stdout aqui nao afeta o otimizador nem outras avaliacoes. O canal do
+protocolo e uma copia do stdout original: o que o script escrever fora de
+sys.stdout nao se mistura as respostas.
+"""
+import io
+import os
+import runpy
+import sys
+
+
+def _run(path, args):
+    """Executa o bloco __main__ com argv/stdout substituidos e retorna a resposta."""
+    output = io.StringIO()
+    saved_argv, saved_stdout = sys.argv, sys.stdout
+    sys.argv = [path] + args
+    sys.stdout = output
+    try:
+        runpy.run_path(path, run_name="__main__")
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            return f"ERROR codigo {e.code}"
+    except Exception as e:
+        return f"ERROR {type(e).__name__}: {e}"
+    finally:
+        sys.argv, sys.stdout = saved_argv, saved_stdout
+
+    lines = output.getvalue().strip().splitlines()
+    if not lines:
+        return "ERROR sem saida"
+    try:
+        float(lines[-1])
+    except ValueError:
+        return f"ERROR saida inesperada: {lines[-1]!r}"
+    return lines[-1].strip()
+
+
+def main():
+    path = os.path.abspath(sys.argv[1])
+
+    # O stdout original vira o canal do protocolo; o fd 1 passa a ir para
+    # o stderr, para que escritas diretas do script nao o corrompam
+    protocol = os.fdopen(os.dup(1), "w", buffering=1)
+    os.dup2(2, 1)
+    sys.stdout = io.TextIOWrapper(os.fdopen(1, "wb", closefd=False), line_buffering=True)
+
+    # O diretorio do script precisa estar no path para seus imports locais
+    script_dir = os.path.dirname(path)
+    if script_dir not in sys.path:
+        sys.path.insert(0, script_dir)
+
+    protocol.write("READY\n")
+    for line in sys.stdin:
+        line = line.strip()
+        if line == "QUIT":
+            break
+        response = _run(path, line.split())
+        protocol.write(response.replace("\n", " ") + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
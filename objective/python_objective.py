@@ -0,0 +1,97 @@
+# objective/python_objective.py
+"""
+Caminho rapido para objetivos escritos em Python.
+
+O script selecionado e carregado uma unica vez e avaliado no proprio
+processo, sem iniciar um interpretador por avaliacao. Dois formatos:
+
+  - o script expoe uma funcao (objective, evaluate ou f) que recebe os
+    parametros ja convertidos para int/float e retorna o valor;
+  - o script so tem um bloco __main__ que le sys.argv e imprime o valor:
+    o bloco e reexecutado em processos pre-aquecidos (um por avaliacao
+    simultanea, ver objective/python_main_server.py), cada um com o seu
+    sys.argv e stdout. Assim a saida dos otimizadores e dos logs nunca se
+    mistura ao valor, as avaliacoes rodam em paralelo e o timeout vale.
+
+Para objetivos que usam CPU, combine com backend='process': cada processo
+do pool carrega o script uma vez (pool de interpretadores pre-aquecidos).
+No modo funcao, a avaliacao roda no proprio thread e nao pode ser
+interrompida pelo timeout.
+"""
+import importlib.util
+import os
+import sys
+
+from objective.program_server import ProgramServerPool
+
+CALLABLE_NAMES = ("objective", "evaluate", "f")
+
+# Script do processo que executa o bloco __main__
+MAIN_SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "python_main_server.py")
+
+
+def _typed_args(converted, signature):
+    """Converte os argumentos de linha de comando para os tipos da assinatura."""
+    values = []
+    for arg, t in zip(converted, signature):
+        if t == "int":
+            values.append(int(arg))
+        elif t == "float":
+            values.append(float(arg))
+        else:
+            values.append(arg)
+    return values
+
+
+class PythonObjective:
+    """Objetivo Python carregado em processo."""
+
+    def __init__(self, path, signature, callable_name=None):
+        self.path = os.path.abspath(path)
+        self.signature = list(signature)
+        self.function = None
+        self._servers = None
+
+        module_name = "_po_objective_" + os.path.splitext(os.path.basename(path))[0]
+        spec = importlib.util.spec_from_file_location(module_name, self.path)
+        if spec is None or spec.loader is None:
+            raise ValueError(f"Nao foi possivel carregar {path}")
+        module = importlib.util.module_from_spec(spec)
+
+        # O diretorio do script precisa estar no path para seus imports locais
+        script_dir = os.path.dirname(self.path)
+        if script_dir not in sys.path:
+            sys.path.insert(0, script_dir)
+        try:
+            spec.loader.exec_module(module)
+        except (SystemExit, Exception):
+            # Script sem protecao __main__: so pode ser usado no modo main
+            module = None
+
+        names = [callable_name] if callable_name else CALLABLE_NAMES
+        for name in names:
+            candidate = getattr(module, name, None)
+            if callable(candidate):
+                self.function = candidate
+                break
+
+        if callable_name and self.function is None:
+            raise ValueError(f"Funcao '{callable_name}' nao encontrada em {path}")
+
+        if self.function is None:
+            self._servers = ProgramServerPool(sys.executable, [MAIN_SERVER, self.path])
+
+    @property
+    def mode(self):
+        return "callable" if self.function is not None else "main"
+
+    def __call__(self, converted, timeout=None):
+        """Valor do objetivo; timeout (s) so se aplica ao modo main."""
+        if self.function is not None:
+            return float(self.function(*_typed_args(converted, self.signature)))
+        return self._servers.evaluate(converted, timeout=timeout)
+
+    def close(self):
+        """Encerra os processos do modo main."""
+        if self._servers is not None:
+            self._servers.close()
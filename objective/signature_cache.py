@@ -0,0 +1,81 @@
+# objective/signature_cache.py
+"""
+Cache em disco da assinatura detectada de cada programa.
+
+A entrada e indexada pelo caminho absoluto do executavel e so e valida se
+tamanho, mtime e hash SHA-256 do conteudo ainda coincidirem, de modo que
+recompilar o programa invalida o cache automaticamente.
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+# Pode ser alterado pela variavel de ambiente PO_SIGNATURE_CACHE
+DEFAULT_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".po_signature_cache.json")
+
+
+def get_cache_file():
+    return os.environ.get("PO_SIGNATURE_CACHE", DEFAULT_CACHE_FILE)
+
+
+def program_fingerprint(path):
+    """Identifica o conteudo atual do executavel."""
+    stat = os.stat(path)
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha.update(block)
+    return {
+        'size': stat.st_size,
+        'mtime': stat.st_mtime_ns,
+        'sha256': sha.hexdigest()
+    }
+
+
+def _read_cache():
+    try:
+        with open(get_cache_file(), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def load_cached_signature(path):
+    """Retorna (signature, num_params, bounds) do cache, ou None."""
+    entry = _read_cache().get(os.path.abspath(path))
+    if entry is None:
+        return None
+
+    try:
+        if entry['fingerprint'] != program_fingerprint(path):
+            return None
+    except OSError:
+        return None
+
+    bounds = entry['bounds']
+    if bounds is not None:
+        bounds = [tuple(b) for b in bounds]
+    return entry['signature'], entry['num_params'], bounds
+
+
+def save_cached_signature(path, signature, num_params, bounds):
+    """Grava a assinatura detectada (escrita atomica)."""
+    cache_file = get_cache_file()
+    cache = _read_cache()
+    cache[os.path.abspath(path)] = {
+        'fingerprint': program_fingerprint(path),
+        'signature': list(signature),
+        'num_params': num_params,
+        'bounds': None if bounds is None else [list(b) for b in bounds]
+    }
+
+    directory = os.path.dirname(os.path.abspath(cache_file))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".po_signature_")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(cache, f, indent=2)
+        os.replace(tmp_path, cache_file)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
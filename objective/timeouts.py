@@ -0,0 +1,83 @@
+# objective/timeouts.py
+"""
+Timeout adaptativo das avaliacoes.
+
+Em vez de um valor fixo, o timeout acompanha a distribuicao das latencias
+observadas: multiplier vezes o percentil escolhido das ultimas `window`
+avaliacoes, limitado a [min_timeout, max_timeout]. Ate haver `warmup`
+amostras, vale o timeout inicial. Sem min_timeout, o piso e initial / 10.
+
+Uma avaliacao encerrada por timeout entra na janela com o proprio limite
+(a latencia real e maior) e o timeout e multiplicado por backoff: se o
+objetivo fica mais lento, o limite acompanha em vez de penalizar todas as
+avaliacoes seguintes.
+"""
+import threading
+from collections import deque
+
+import numpy as np
+
+
+class EvaluationTimeout(RuntimeError):
+    """Avaliacao excedeu o timeout (o processo ja foi encerrado)."""
+
+    def __init__(self, message="Timeout"):
+        super().__init__(message)
+
+
+class AdaptiveTimeout:
+    """Timeout derivado de um percentil movel das latencias."""
+
+    def __init__(self, initial=10.0, multiplier=3.0, percentile=99.0,
+                 min_timeout=None, max_timeout=300.0, window=200, warmup=10,
+                 adaptive=True, backoff=2.0):
+        self.initial = initial
+        self.multiplier = multiplier
+        self.percentile = percentile
+        self.min_timeout = initial / 10 if min_timeout is None else min_timeout
+        self.max_timeout = max_timeout
+        self.warmup = warmup
+        self.adaptive = adaptive
+        self.backoff = backoff
+        self.n_timeouts = 0
+        self._samples = deque(maxlen=window)
+        self._current = initial
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        """Registra a latencia de uma avaliacao bem-sucedida."""
+        if not self.adaptive:
+            return
+        with self._lock:
+            self._samples.append(seconds)
+            self._update()
+
+    def observe_timeout(self, limit):
+        """Registra uma avaliacao encerrada apos limit segundos sem terminar."""
+        with self._lock:
+            self.n_timeouts += 1
+            if not self.adaptive:
+                return
+            self._samples.append(limit)
+            self._update()
+            self._current = max(self._current, min(limit * self.backoff, self.max_timeout))
+
+    def _update(self):
+        if len(self._samples) >= self.warmup:
+            value = self.multiplier * float(np.percentile(self._samples, self.percentile))
+            self._current = min(max(value, self.min_timeout), self.max_timeout)
+
+    def current(self):
+        """Timeout a usar na proxima avaliacao (segundos)."""
+        return self._current
+
+    def stats(self):
+        with self._lock:
+            samples = list(self._samples)
+        return {
+            'timeout': self._current,
+            'timeouts': self.n_timeouts,
+            'samples': len(samples),
+            'p50': float(np.percentile(samples, 50)) if samples else None,
+            'p99': float(np.percentile(samples, 99)) if samples else None
+        }
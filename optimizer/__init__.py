@@ -3,10 +3,25 @@ from optimizer.base_optimizer import BaseOptimizer
 from optimizer.pattern_search import PatternSearch
 from optimizer.particle_swarm import ParticleSwarm
 from optimizer.hybrid_optimizer import HybridPSOPatternSearch
+from optimizer.cma_es import CMAES
+from optimizer.island_swarm import IslandParticleSwarm
+from optimizer.batch import batch_objective, is_batch_objective
+from optimizer.history import HistoryBuffer
+from optimizer.remote_evaluator import RemoteEvaluator
+from optimizer.surrogate import Surrogate
+from optimizer.portfolio import Portfolio
 
 __all__ = [
     "BaseOptimizer",
     "PatternSearch", 
     "ParticleSwarm",
-    "HybridPSOPatternSearch"
+    "HybridPSOPatternSearch",
+    "CMAES",
+    "IslandParticleSwarm",
+    "batch_objective",
+    "is_batch_objective",
+    "HistoryBuffer",
+    "RemoteEvaluator",
+    "Surrogate",
+    "Portfolio"
 ]
\ No newline at end of file
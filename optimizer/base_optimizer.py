@@ -1,14 +1,418 @@
-from abc import ABC, abstractmethod
+from abc import ABC
+from concurrent.futures import CancelledError, as_completed
+from contextlib import contextmanager
+import asyncio
+import time
+import numpy as np
+from optimizer.evaluator import create_evaluator, AsyncioEvaluator
+from optimizer.batch import to_scalar, as_points
+from optimizer.checkpoint import save_checkpoint, load_checkpoint
+from optimizer.lattice import integer_mask, snap
+from optimizer.memo import PointMemo
+from utils.profiler import profiler
 
 class BaseOptimizer(ABC):
     """Classe base para qualquer otimizador."""
 
-    def __init__(self, objective_function, x0, max_iter=100, tol=1e-5):
+    # Prefixo das fases registradas no profiler
+    profile_tag = "optimizer"
+
+    def __init__(self, objective_function, x0, max_iter=100, tol=1e-5,
+                 n_threads=None, backend="thread", evaluator=None, callback=None,
+                 checkpoint_path=None, checkpoint_every=1, history_path=None,
+                 budget=None, surrogate=None, signature=None, initializer=None,
+                 initargs=()):
         self.objective_function = objective_function
         self.x0 = x0
         self.max_iter = max_iter
         self.tol = tol
+        
+        # Avaliador dos pontos: se nao for fornecido, um pool com n_threads
+        # workers do backend escolhido e criado a cada optimize(). Com
+        # backend 'process', initializer(*initargs) roda em cada processo do
+        # pool (ex.: objective.configure_from_config; no contexto spawn os
+        # processos nao herdam o programa configurado)
+        self.n_threads = n_threads
+        self.backend = backend
+        self.evaluator = evaluator
+        self.initializer = initializer
+        self.initargs = initargs
+        
+        # callback(info) recebe o progresso ao fim de cada iteracao
+        self.callback = callback
+        
+        # Orcamento de avaliacoes/tempo (optimizer.budget.Budget), que pode
+        # ser compartilhado com outros otimizadores
+        self.budget = budget
+        
+        # Modelo substituto para pre-selecionar candidatos
+        # (optimizer.surrogate.Surrogate), opcional
+        self.surrogate = surrogate
+        
+        # Tipos dos parametros ('int'/'float', como program_signature): as
+        # dimensoes inteiras sao tratadas como uma rede (optimizer.lattice)
+        if signature is not None and len(signature) != len(x0):
+            raise ValueError(f"Assinatura com {len(signature)} tipos para {len(x0)} parametros")
+        self.signature = signature
+        self.integer_mask = integer_mask(signature)
+        # Valores ja conhecidos por ponto (optimizer.memo): ativa com dimensoes
+        # inteiras; o hibrido compartilha uma entre as fases
+        self._memo = PointMemo() if self.integer_mask is not None else None
+        
+        # Tempo gasto avaliando na iteracao atual (para o profiler)
+        self._eval_time = 0.0
+        
+        # Arquivo .npy para gravar o historico durante a execucao (opcional)
+        self.history_path = history_path
+        
+        # Checkpoint do estado a cada checkpoint_every iteracoes
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = max(1, int(checkpoint_every))
+        # Destino dos checkpoints (o hibrido redireciona os das suas fases)
+        self._checkpoint_sink = None
+        if checkpoint_path is not None:
+            self._checkpoint_sink = lambda state: save_checkpoint(
+                self.checkpoint_path, type(self).__name__, state)
+        # Estado a restaurar no proximo optimize() (ver resume)
+        self._resume_state = None
+        
+        # Execucao ask/tell em andamento: o laco (_steps), o lote pendente
+        # (points, accept_above) e o resultado ao terminar
+        self._steps_run = None
+        self._pending = None
+        self._n_workers = n_threads or 1
+        self.result = None
+        # Pedido de parada de optimize_async cancelado: _run_steps encerra
+        # o laco antes do proximo lote
+        self._stop_requested = False
+
+    # --- Interface ask/tell ---------------------------------------------
+    #
+    # O laco de cada otimizador e um gerador (_steps) que entrega lotes de
+    # pontos e recebe os valores. ask() devolve o proximo lote e tell() os
+    # valores na mesma ordem; optimize() e apenas um laco ask/tell que avalia
+    # os lotes com o avaliador. Um escalonador externo pode assim agrupar,
+    # guardar em cache, distribuir ou reordenar as avaliacoes.
+
+    def ask(self):
+        """Proximo lote de candidatos, um array (N, D); None quando terminou.
+
+        Chamadas repetidas sem tell() devolvem o mesmo lote.
+        """
+        if self._steps_run is None and self.result is None:
+            self._start()
+        if self._pending is None:
+            return None
+        return self._pending[0].copy()
+
+    def tell(self, values):
+        """Informa o fitness dos pontos do ultimo ask(), na mesma ordem.
+
+        NaN marca um ponto que nao foi avaliado (devolvido ao orcamento).
+        """
+        if self._pending is None:
+            raise RuntimeError("tell() sem um lote pendente de ask()")
+        values = np.asarray(values, dtype=float).reshape(-1)
+        if len(values) != len(self._pending[0]):
+            raise ValueError(f"{len(values)} valores para {len(self._pending[0])} pontos")
+        self._advance(values)
+
+    @property
+    def done(self):
+        """True quando a execucao iniciada por ask() terminou (ver result)."""
+        return self.result is not None
+
+    def _steps(self):
+        """Laco do otimizador como gerador (ver _request).
+
+        Entrega (points, accept_above) e recebe os valores; o retorno e
+        (best_x, best_f, history).
+        """
+        raise NotImplementedError(f"{type(self).__name__} nao suporta ask/tell")
+        yield
+
+    def _start(self, n_workers=None):
+        """Inicia uma nova execucao ate o primeiro pedido de avaliacao."""
+        if self.budget is not None:
+            self.budget.start()
+        # Avaliacoes simultaneas esperadas (escolhas como o modo de poll)
+        self._n_workers = n_workers or self.n_threads or 1
+        self.result = None
+        self._steps_run = self._steps()
+        self._advance(None)
+
+    def _advance(self, values):
+        """Entrega os valores ao laco e guarda o proximo pedido (ou o resultado)."""
+        try:
+            self._pending = self._steps_run.send(values)
+        except StopIteration as stop:
+            self._steps_run = None
+            self._pending = None
+            self.result = stop.value
+        except BaseException:
+            self._steps_run = None
+            self._pending = None
+            raise
+
+    def _run_steps(self, evaluator):
+        """Executa o laco ask/tell avaliando cada lote com o avaliador."""
+        self._start(evaluator.n_workers)
+        try:
+            while self._pending is not None:
+                if self._stop_requested:
+                    raise CancelledError()
+                points, accept_above = self._pending
+                if accept_above is None or len(points) == 1:
+                    values = evaluator.map_batch(self.objective_function, points)
+                else:
+                    values = self._first_improvement(evaluator, points, accept_above)
+                self._advance(values)
+        except BaseException:
+            # Avaliacao falhou ou foi cancelada: o laco e descartado
+            if self._steps_run is not None:
+                self._steps_run.close()
+                self._steps_run = None
+                self._pending = None
+            raise
+        return self.result
+
+    def _first_improvement(self, evaluator, points, accept_above):
+        """Avalia os pontos em paralelo ate o primeiro valor > accept_above.
+
+        Os pontos cancelados antes de comecar recebem NaN; os que ainda
+        estavam em andamento sao descartados com -inf; os ja concluidos
+        mantem o valor.
+        """
+        fn = self.point_function
+        futures = {evaluator.submit(fn, point): k for k, point in enumerate(points)}
+        values = np.full(len(points), np.nan)
+        try:
+            for future in as_completed(futures):
+                k = futures[future]
+                values[k] = future.result()
+                if values[k] > accept_above:
+                    break
+        finally:
+            for future, k in futures.items():
+                if not np.isnan(values[k]) or future.cancel():
+                    continue
+                if future.done() and future.exception() is None:
+                    values[k] = future.result()
+                else:
+                    # Ainda em andamento: o resultado e descartado
+                    values[k] = -np.inf
+        return values
+
+    def _request(self, points, accept_above=None):
+        """Pede a avaliacao de um lote (gerador: use com yield from).
+
+        Pontos alem do orcamento nao sao pedidos. Com accept_above, quem
+        avalia pode parar no primeiro valor maior e devolver NaN nos demais.
+        Retorna os valores (NaN nos nao avaliados).
+        """
+        points = as_points(points)
+        values = np.full(len(points), np.nan)
+        granted = len(points) if self.budget is None else self.budget.reserve(len(points))
+        if granted:
+            # O tempo ate a resposta e o tempo de avaliacao desta iteracao
+            t0 = time.perf_counter()
+            told = yield points[:granted], accept_above
+            self._eval_time += time.perf_counter() - t0
+            values[:granted] = told
+            skipped = int(np.isnan(told).sum())
+            if skipped and self.budget is not None:
+                self.budget.release(skipped)
+        if self.surrogate is not None:
+            self.surrogate.observe(points, values)
+        return values
+
+    def _screened(self, points, screen=True, accept_above=None):
+        """Pede a avaliacao de um lote enviando ao objetivo so o necessario
+        (gerador: use com yield from).
+
+        - com dimensoes inteiras, os pontos sao arredondados
+        - com memoria (_memo), os pontos repetidos no lote ou ja avaliados
+          nao sao reavaliados
+        - com surrogate (e screen=True), so os pontos escolhidos por ele sao
+          avaliados; os descartados recebem -inf
+        - pontos alem do orcamento tambem recebem -inf
+
+        Retorna (values, evaluated): evaluated sao os indices dos pontos
+        avaliados pelo objetivo.
+        """
+        points = self._snap(as_points(points))
+        values = np.full(len(points), -np.inf)
+        pending = np.arange(len(points))
+        
+        keys = None
+        if self._memo is not None:
+            keys = [p.tobytes() for p in points]
+            first = {}
+            for k, key in enumerate(keys):
+                if key not in self._memo:
+                    first.setdefault(key, k)
+            pending = np.fromiter(first.values(), dtype=int, count=len(first))
+        
+        if screen and self.surrogate is not None and len(pending):
+            pending = pending[self.surrogate.select(points[pending])]
+        if len(pending):
+            values[pending] = yield from self._request(points[pending], accept_above)
+            # Pontos nao avaliados (NaN: orcamento ou accept_above) ficam como descartados
+            skipped = np.isnan(values[pending])
+            values[pending[skipped]] = -np.inf
+            pending = pending[~skipped]
+        
+        if keys is not None:
+            # Penalidades (-inf) nao entram na memoria: o ponto pode ser reavaliado
+            for k in pending:
+                if np.isfinite(values[k]):
+                    self._memo[keys[k]] = values[k]
+            for k, key in enumerate(keys):
+                values[k] = self._memo.get(key, values[k])
+        return values, pending
+
+    def _snap(self, points):
+        """Arredonda as dimensoes inteiras (sem assinatura inteira, retorna points)."""
+        if self.integer_mask is None:
+            return points
+        return snap(points, self.integer_mask)
+
+    def _known_value(self, x):
+        """Valor ja conhecido do ponto (None se nao houver)."""
+        if self._memo is None:
+            return None
+        return self._memo.get(self._memo_key(x))
+
+    def _memo_key(self, x):
+        return np.asarray(self._snap(x), dtype=float).tobytes()
+
+    def _budget_exhausted(self):
+        """True se o orcamento compartilhado acabou (o laco deve parar)."""
+        return self.budget is not None and self.budget.exhausted()
+
+    @property
+    def point_function(self):
+        """Objetivo no contrato escalar, para envios por ponto (submit)."""
+        return to_scalar(self.objective_function)
+
+    def _begin_iteration(self):
+        """Inicia a contabilizacao de uma iteracao e retorna o instante inicial."""
+        self._eval_time = 0.0
+        return time.perf_counter()
+
+    def _end_iteration(self, iter_start):
+        """Registra no profiler o tempo de avaliacao e o custo do proprio otimizador."""
+        wall = time.perf_counter() - iter_start
+        profiler.record(f"{self.profile_tag}_evaluation", self._eval_time)
+        profiler.record(f"{self.profile_tag}_bookkeeping", wall - self._eval_time)
+
+    def _report_progress(self, iteration, best_x, best_f, elapsed, **extra):
+        """Envia o progresso da iteracao ao callback, se houver."""
+        if self.callback is not None:
+            self.callback({
+                'iteration': iteration,
+                'best_x': [float(v) for v in best_x],
+                'best_f': float(best_f),
+                'elapsed_time': elapsed,
+                **extra
+            })
+
+    def _save_checkpoint(self, iteration, state, done=False):
+        """Grava o estado da iteracao (com o RNG global), se estiver na hora.
+
+        done=True indica que o laco terminou nesta iteracao; o checkpoint e
+        sempre gravado para que resume() nao continue uma execucao encerrada.
+        """
+        if self._checkpoint_sink is None:
+            return
+        if not done and iteration % self.checkpoint_every != 0:
+            return
+        
+        with profiler.phase(f"{self.profile_tag}_checkpoint"):
+            self._checkpoint_sink({
+                **state,
+                'iteration': iteration,
+                'done': done,
+                'rng_state': np.random.get_state(),
+                'surrogate': self.surrogate,
+                'memo': self._memo
+            })
+
+    def _take_resume_state(self):
+        """Retorna (e consome) o estado a restaurar, restaurando o RNG global."""
+        state, self._resume_state = self._resume_state, None
+        if state is not None:
+            np.random.set_state(state['rng_state'])
+            if state.get('surrogate') is not None:
+                self.surrogate = state['surrogate']
+            if state.get('memo') is not None:
+                self._memo = state['memo']
+        return state
+
+    def resume(self, path=None):
+        """Continua a execucao a partir do checkpoint (padrao: checkpoint_path).
+
+        O otimizador deve ser criado com os mesmos parametros e objetivo da
+        execucao original; o restante do laco e identico ao que teria sido
+        executado sem a interrupcao.
+        """
+        path = path or self.checkpoint_path
+        if path is None:
+            raise ValueError("Nenhum checkpoint informado")
+        self._resume_state = load_checkpoint(path, type(self).__name__)
+        return self.optimize()
+
+    @contextmanager
+    def _evaluation_pool(self):
+        """Fornece o avaliador, criando e encerrando um pool proprio se preciso."""
+        if self.budget is not None:
+            self.budget.start()
+        
+        if self.evaluator is not None:
+            yield self.evaluator
+            return
+
+        evaluator = create_evaluator(self.n_threads, self.backend,
+                                     initializer=self.initializer, initargs=self.initargs)
+        try:
+            yield evaluator
+        finally:
+            evaluator.shutdown()
 
-    @abstractmethod
     def optimize(self):
-        pass
\ No newline at end of file
+        """Executa a otimizacao e retorna (best_x, best_f, history)."""
+        with self._evaluation_pool() as evaluator:
+            return self._run_steps(evaluator)
+
+    async def optimize_async(self, async_objective=None, max_concurrency=64):
+        """Executa optimize() sem bloquear o event loop.
+
+        O laco do otimizador roda em uma thread do executor do loop e as
+        avaliacoes sao corrotinas (async_objective, ex.:
+        run_external_program_async) limitadas por max_concurrency.
+        Cancelar esta corrotina cancela as avaliacoes em andamento e espera
+        o laco parar (antes do proximo lote) antes de retornar.
+        """
+        loop = asyncio.get_running_loop()
+        evaluator = AsyncioEvaluator(loop, async_objective, max_concurrency)
+        
+        previous = self.evaluator
+        self.evaluator = evaluator
+        self._stop_requested = False
+        worker = loop.run_in_executor(None, self.optimize)
+        try:
+            return await asyncio.shield(worker)
+        except asyncio.CancelledError:
+            self._stop_requested = True
+            evaluator.shutdown(wait=False)
+            # O laco termina com CancelledError (ou com o resultado, se ja
+            # estava no fim); o avaliador so e trocado depois disso
+            try:
+                await worker
+            except BaseException:
+                pass
+            raise
+        finally:
+            evaluator.shutdown()
+            self.evaluator = previous
+            self._stop_requested = False
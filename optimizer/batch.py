@@ -0,0 +1,68 @@
+# optimizer/batch.py
+"""
+Contrato de avaliacao em lote.
+
+Um objetivo em lote recebe um array (N, D) com N pontos e retorna N valores
+de fitness. Os otimizadores sempre pedem lotes (_evaluate); objetivos
+escalares (um ponto -> um valor) sao adaptados automaticamente pelo
+avaliador, que distribui os pontos entre seus workers.
+
+    @batch_objective
+    def sphere(X):
+        return -np.sum(X ** 2, axis=1)
+
+    ParticleSwarm(sphere, x0, ...)   # uma chamada por geracao
+"""
+import numpy as np
+
+
+def batch_objective(fn):
+    """Marca fn como objetivo em lote ((N, D) -> N valores)."""
+    fn.batch = True
+    return fn
+
+
+def is_batch_objective(fn):
+    return getattr(fn, "batch", False) is True
+
+
+def as_points(points):
+    """Converte uma sequencia de pontos para um array (N, D) de floats."""
+    return np.atleast_2d(np.asarray(points, dtype=float))
+
+
+class BatchFromScalar:
+    """Adapta um objetivo escalar ao contrato em lote (avaliacao sequencial)."""
+
+    batch = True
+
+    def __init__(self, fn):
+        self.fn = fn
+
+    def __call__(self, points):
+        return np.array([self.fn(p) for p in as_points(points)], dtype=float)
+
+
+class ScalarFromBatch:
+    """Adapta um objetivo em lote para avaliar um unico ponto.
+
+    Usado quando o otimizador precisa de futures por ponto (poll
+    oportunista paralelo) ou de uma avaliacao isolada. Serializavel, para
+    funcionar tambem com backend='process'.
+    """
+
+    def __init__(self, fn):
+        self.fn = fn
+
+    def __call__(self, point):
+        return float(np.asarray(self.fn(as_points(point)), dtype=float)[0])
+
+
+def to_batch(fn):
+    """Retorna fn no contrato em lote, adaptando objetivos escalares."""
+    return fn if is_batch_objective(fn) else BatchFromScalar(fn)
+
+
+def to_scalar(fn):
+    """Retorna fn no contrato escalar, adaptando objetivos em lote."""
+    return ScalarFromBatch(fn) if is_batch_objective(fn) else fn
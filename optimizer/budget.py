@@ -0,0 +1,133 @@
+# optimizer/budget.py
+"""
+Orcamento de avaliacoes e de tempo compartilhado.
+
+Uma unica instancia pode ser passada a varios otimizadores (ex.: as duas
+fases do hibrido): todas as avaliacoes contam para o mesmo limite, e o
+relogio comeca na primeira chamada de start().
+"""
+import threading
+import time
+
+
+class Budget:
+    """Limite de avaliacoes (max_evals) e/ou de tempo de parede (max_time, s)."""
+
+    def __init__(self, max_evals=None, max_time=None):
+        self.max_evals = max_evals
+        self.max_time = max_time
+        self.used_evals = 0
+        self.start_time = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Copia serializavel (ex.: para outro processo); o lock e recriado
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Inicia o relogio (chamadas seguintes nao o reiniciam)."""
+        with self._lock:
+            if self.start_time is None:
+                self.start_time = time.time()
+
+    def elapsed(self):
+        return 0.0 if self.start_time is None else time.time() - self.start_time
+
+    def time_exhausted(self):
+        return self.max_time is not None and self.elapsed() >= self.max_time
+
+    def exhausted(self):
+        if self.time_exhausted():
+            return True
+        return self.max_evals is not None and self.used_evals >= self.max_evals
+
+    def reserve(self, n):
+        """Reserva ate n avaliacoes e retorna quantas podem ser feitas."""
+        if self.time_exhausted():
+            return 0
+        with self._lock:
+            if self.max_evals is None:
+                granted = n
+            else:
+                granted = max(0, min(n, self.max_evals - self.used_evals))
+            self.used_evals += granted
+            return granted
+
+    def release(self, n):
+        """Devolve avaliacoes reservadas que nao chegaram a ser feitas."""
+        with self._lock:
+            self.used_evals -= n
+
+    def charge(self, n):
+        """Conta n avaliacoes ja feitas fora deste orcamento (ex.: nas ilhas)."""
+        with self._lock:
+            self.used_evals += n
+
+    def stats(self):
+        return {
+            'used_evals': self.used_evals,
+            'max_evals': self.max_evals,
+            'elapsed_time': self.elapsed(),
+            'max_time': self.max_time
+        }
+
+
+class BudgetShare:
+    """Parte de um Budget compartilhado que pode ser encerrada isoladamente.
+
+    Cada algoritmo do portfolio recebe uma: as avaliacoes contam no
+    orcamento comum (parent) e tambem em used_evals, e stop() faz o
+    algoritmo parar na proxima verificacao sem afetar os demais.
+    """
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.used_evals = 0
+        self.stopped = False
+
+    @property
+    def max_evals(self):
+        return self.parent.max_evals
+
+    @property
+    def max_time(self):
+        return self.parent.max_time
+
+    def start(self):
+        self.parent.start()
+
+    def elapsed(self):
+        return self.parent.elapsed()
+
+    def time_exhausted(self):
+        return self.parent.time_exhausted()
+
+    def exhausted(self):
+        return self.stopped or self.parent.exhausted()
+
+    def reserve(self, n):
+        if self.stopped:
+            return 0
+        granted = self.parent.reserve(n)
+        self.used_evals += granted
+        return granted
+
+    def release(self, n):
+        self.parent.release(n)
+        self.used_evals -= n
+
+    def charge(self, n):
+        self.parent.charge(n)
+        self.used_evals += n
+
+    def stop(self):
+        self.stopped = True
+
+    def stats(self):
+        return {**self.parent.stats(), 'share_evals': self.used_evals, 'stopped': self.stopped}
@@ -0,0 +1,48 @@
+# optimizer/checkpoint.py
+"""
+Checkpoints do estado dos otimizadores.
+
+O estado completo (posicoes, velocidades, melhores, delta, historico e o
+estado do gerador global do NumPy) e gravado em pickle com escrita
+atomica: um arquivo temporario no mesmo diretorio substitui o anterior
+com os.replace, de modo que uma queda no meio da gravacao preserva o
+ultimo checkpoint valido.
+"""
+import os
+import pickle
+import tempfile
+
+CHECKPOINT_VERSION = 2
+
+
+def save_checkpoint(path, algorithm, state):
+    """Grava o estado de um otimizador em path (escrita atomica)."""
+    payload = {'version': CHECKPOINT_VERSION, 'algorithm': algorithm, 'state': state}
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".po_checkpoint_")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_checkpoint(path, algorithm=None):
+    """Le um checkpoint e retorna o estado salvo.
+
+    Se algorithm for informado, confere se o checkpoint e desse otimizador.
+    """
+    with open(path, "rb") as f:
+        payload = pickle.load(f)
+
+    if payload.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f"Versao de checkpoint nao suportada: {payload.get('version')}")
+    if algorithm is not None and payload['algorithm'] != algorithm:
+        raise ValueError(f"Checkpoint de {payload['algorithm']}, esperado {algorithm}")
+    return payload['state']
@@ -0,0 +1,227 @@
+# optimizer/cma_es.py
+import numpy as np
+from optimizer.base_optimizer import BaseOptimizer
+from optimizer.history import HistoryBuffer, cma_es_fields
+from utils.logger import get_logger
+import time
+import os
+
+log = get_logger("CMA")
+
+class CMAES(BaseOptimizer):
+    """CMA-ES (Covariance Matrix Adaptation Evolution Strategy)
+
+    A cada geracao, popsize pontos sao amostrados de N(mean, sigma^2 C) e
+    avaliados como um lote concorrente; a media, o passo sigma e a
+    covariancia C sao adaptados a partir dos mu melhores. C aprende a escala
+    e as correlacoes entre os parametros, o que faz o CMA-ES precisar de
+    muito menos avaliacoes que o PSO em objetivos mal condicionados e nao
+    separaveis.
+
+    Os pontos fora de bounds sao trazidos para a borda antes da avaliacao e
+    a atualizacao usa o ponto corrigido. sigma0 e relativo a largura media
+    de bounds; C comeca com a escala de cada dimensao.
+    """
+
+    profile_tag = "cma"
+
+    def __init__(self, objective_function, x0, popsize=None, sigma0=0.25,
+                 bounds=None, n_threads=None, backend="thread", evaluator=None, **kwargs):
+        super().__init__(objective_function, x0, n_threads=n_threads,
+                         backend=backend, evaluator=evaluator, **kwargs)
+
+        n_dims = len(x0)
+        self.popsize = popsize or 4 + int(3 * np.log(n_dims))
+        self.sigma0 = sigma0
+        self.bounds = bounds or [(-10, 10)] * n_dims
+        self.history = HistoryBuffer(cma_es_fields(n_dims), path=self.history_path)
+
+        # Configura threads
+        if n_threads is not None:
+            try:
+                os.environ['OMP_NUM_THREADS'] = str(n_threads)
+                os.environ['MKL_NUM_THREADS'] = str(n_threads)
+                os.environ['OPENBLAS_NUM_THREADS'] = str(n_threads)
+                log(f"Threads configuradas: {n_threads}")
+            except:
+                pass
+
+    def _strategy(self, n_dims):
+        """Pesos e taxas de aprendizado padrao (Hansen, The CMA Evolution Strategy)."""
+        lam = self.popsize
+        mu = lam // 2
+        weights = np.log(mu + 0.5) - np.log(np.arange(1, mu + 1))
+        weights /= weights.sum()
+        mueff = 1.0 / np.sum(weights ** 2)
+
+        cc = (4 + mueff / n_dims) / (n_dims + 4 + 2 * mueff / n_dims)
+        cs = (mueff + 2) / (n_dims + mueff + 5)
+        c1 = 2 / ((n_dims + 1.3) ** 2 + mueff)
+        cmu = min(1 - c1, 2 * (mueff - 2 + 1 / mueff) / ((n_dims + 2) ** 2 + mueff))
+        damps = 1 + 2 * max(0.0, np.sqrt((mueff - 1) / (n_dims + 1)) - 1) + cs
+        chi_n = np.sqrt(n_dims) * (1 - 1 / (4 * n_dims) + 1 / (21 * n_dims ** 2))
+        return {'mu': mu, 'weights': weights, 'mueff': mueff, 'cc': cc, 'cs': cs,
+                'c1': c1, 'cmu': cmu, 'damps': damps, 'chi_n': chi_n}
+
+    def _steps(self):
+        start_time = time.time()
+        log(f"=== INICIANDO CMA-ES ===")
+
+        n_dims = len(self.x0)
+        log(f"Populacao: {self.popsize}, Dimensoes: {n_dims}, Workers: {self._n_workers}")
+
+        low = np.array([b[0] for b in self.bounds], dtype=float)
+        high = np.array([b[1] for b in self.bounds], dtype=float)
+        width = high - low
+        es = self._strategy(n_dims)
+        mu, weights = es['mu'], es['weights']
+        # Autodecomposicao de C a cada eigen_every geracoes (custo O(n^3))
+        eigen_every = max(1, int(1 / ((es['c1'] + es['cmu']) * n_dims * 10)))
+
+        state = self._take_resume_state()
+        if state is None:
+            mean = np.clip(np.array(self.x0, dtype=float), low, high)
+            sigma = self.sigma0 * width.mean()
+            # Escala inicial de cada dimensao relativa a largura media
+            scale = width / width.mean()
+            C = np.diag(scale ** 2)
+            B = np.eye(n_dims)
+            D = scale.copy()
+            pc = np.zeros(n_dims)
+            ps = np.zeros(n_dims)
+
+            best_x = self._snap(mean)
+            # Sem orcamento o ponto nao e avaliado (e nao conta)
+            values, evaluated = yield from self._screened(best_x[None], screen=False)
+            best_f = float(values[0])
+            n_eval = len(evaluated)
+            elapsed = time.time() - start_time
+            log(f"Fitness inicial: f(x0) = {best_f:.6f}")
+            self.history.append(iteration=0, x=best_x, f=best_f, sigma=sigma, elapsed_time=elapsed)
+            self._report_progress(0, best_x, best_f, elapsed, n_eval=n_eval, sigma=sigma)
+            population = best_x[None]
+            population_fitness = np.array([best_f])
+            first_iteration = 1
+        else:
+            mean = state['mean']
+            sigma = state['sigma']
+            C = state['C']
+            B = state['B']
+            D = state['D']
+            pc = state['pc']
+            ps = state['ps']
+            best_x = state['best_x']
+            best_f = state['best_f']
+            population = state['population']
+            population_fitness = state['population_fitness']
+            n_eval = state['n_eval']
+            self.history = state['history']
+            start_time -= state['elapsed_time']
+            first_iteration = self.max_iter + 1 if state['done'] else state['iteration'] + 1
+            log(f"Retomando do checkpoint: iteracao {state['iteration']}, f = {best_f:.6f}")
+
+        for iteration in range(first_iteration, self.max_iter + 1):
+            if self._budget_exhausted():
+                log(f"Orcamento esgotado na iteracao {iteration}")
+                break
+
+            iter_start = self._begin_iteration()
+
+            # Amostra a geracao: x = mean + sigma * B D z, corrigido para bounds
+            z = np.random.standard_normal((self.popsize, n_dims))
+            x = np.clip(mean + sigma * (z * D) @ B.T, low, high)
+
+            # Avalia a geracao inteira como um lote concorrente
+            fitness, evaluated = yield from self._screened(x)
+            n_eval += len(evaluated)
+            x = self._snap(x)
+            population, population_fitness = x, fitness
+
+            gen_best = int(np.argmax(fitness))
+            if fitness[gen_best] > best_f:
+                best_x = x[gen_best].copy()
+                best_f = fitness[gen_best]
+                elapsed = time.time() - start_time
+                log.best(f"Iter {iteration}: Nova melhor -> f = {best_f:.6f} (tempo: {elapsed:.2f}s)",
+                         iteration=iteration, f=float(best_f))
+
+            # Recombinacao dos melhores (avaliacoes perdidas, -inf, ficam fora)
+            order = np.argsort(-fitness, kind="stable")
+            n_sel = min(mu, int(np.isfinite(fitness).sum()))
+            if n_sel > 0:
+                w = weights[:n_sel] / weights[:n_sel].sum()
+                mueff = 1.0 / np.sum(w ** 2)
+                selected = x[order[:n_sel]]
+                old_mean = mean
+                mean = w @ selected
+                step = (mean - old_mean) / sigma
+
+                # Caminhos de evolucao (passo e covariancia)
+                inv_sqrt_C = (B / D) @ B.T
+                ps = (1 - es['cs']) * ps + np.sqrt(es['cs'] * (2 - es['cs']) * mueff) * inv_sqrt_C @ step
+                ps_norm = np.linalg.norm(ps)
+                hsig = (ps_norm / np.sqrt(1 - (1 - es['cs']) ** (2 * iteration)) / es['chi_n']
+                        < 1.4 + 2 / (n_dims + 1))
+                pc = (1 - es['cc']) * pc + hsig * np.sqrt(es['cc'] * (2 - es['cc']) * mueff) * step
+
+                # Atualizacao de posto 1 (pc) e de posto mu (melhores da geracao)
+                y = (selected - old_mean) / sigma
+                C = ((1 - es['c1'] - es['cmu']) * C
+                     + es['c1'] * (np.outer(pc, pc) + (1 - hsig) * es['cc'] * (2 - es['cc']) * C)
+                     + es['cmu'] * (y.T * w) @ y)
+                sigma *= np.exp((es['cs'] / es['damps']) * (ps_norm / es['chi_n'] - 1))
+
+                if iteration % eigen_every == 0:
+                    C = np.triu(C) + np.triu(C, 1).T
+                    eigenvalues, B = np.linalg.eigh(C)
+                    D = np.sqrt(np.maximum(eigenvalues, 1e-20))
+
+            elapsed = time.time() - start_time
+            if iteration % 10 == 0:
+                log(f"Iter {iteration}: melhor = {best_f:.6f}, sigma = {sigma:.3e} (tempo: {elapsed:.2f}s)")
+
+            self.history.append(iteration=iteration, x=best_x, f=best_f, sigma=sigma,
+                                elapsed_time=elapsed)
+            self._report_progress(iteration, best_x, best_f, elapsed, n_eval=n_eval, sigma=sigma)
+            self._end_iteration(iter_start)
+
+            # Converge quando a geracao e o passo ficam abaixo de tol, ou C degenera
+            finite = fitness[np.isfinite(fitness)]
+            converged = ((finite.size > 0 and np.ptp(finite) < self.tol and sigma * D.max() < self.tol)
+                         or D.max() > 1e7 * D.min())
+            self._save_checkpoint(iteration, {
+                'mean': mean,
+                'sigma': sigma,
+                'C': C,
+                'B': B,
+                'D': D,
+                'pc': pc,
+                'ps': ps,
+                'best_x': best_x,
+                'best_f': best_f,
+                'population': population,
+                'population_fitness': population_fitness,
+                'n_eval': n_eval,
+                'history': self.history,
+                'elapsed_time': elapsed
+            }, done=converged or iteration == self.max_iter)
+
+            if converged:
+                log(f"Convergencia: sigma = {sigma:.2e}")
+                break
+
+        total_time = time.time() - start_time
+        log(f"=== CONCLUIDO ===")
+        log(f"Melhor fitness: {best_f:.6f}")
+        log(f"Avaliacoes: {n_eval}")
+        if self.surrogate is not None:
+            log(f"Surrogate: {self.surrogate.n_screened} candidatos descartados sem avaliacao")
+        log(f"TEMPO TOTAL: {total_time:.2f} segundos ({total_time/60:.2f} minutos)")
+
+        # Melhor ponto e ultima geracao (pontos de partida da busca local no
+        # hibrido, no mesmo formato dos melhores pessoais do PSO)
+        self.p_best = np.vstack([best_x[None], population])
+        self.p_best_fitness = np.concatenate([[best_f], population_fitness])
+
+        self.history.flush()
+        return best_x, best_f, self.history
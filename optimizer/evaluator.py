@@ -0,0 +1,188 @@
+# optimizer/evaluator.py
+"""
+Pools de avaliacao da funcao objetivo.
+
+Os otimizadores entregam lotes de pontos ao avaliador, que decide como
+executa-los (sequencial, threads ou processos).
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future
+
+import numpy as np
+
+from optimizer.batch import is_batch_objective, as_points
+
+
+class BaseEvaluator:
+    """Interface comum: submit() para um ponto, map() para um lote."""
+
+    n_workers = 1
+
+    def submit(self, fn, point):
+        raise NotImplementedError
+
+    def map(self, fn, points):
+        """Avalia todos os pontos e retorna os valores na mesma ordem."""
+        futures = [self.submit(fn, p) for p in points]
+        return [f.result() for f in futures]
+
+    def map_batch(self, fn, points):
+        """Avalia um lote (N, D) e retorna um array com N valores.
+
+        Objetivos escalares sao avaliados ponto a ponto pelos workers;
+        objetivos em lote recebem um bloco contiguo de pontos por worker.
+        """
+        points = as_points(points)
+        if not is_batch_objective(fn):
+            return np.asarray(self.map(fn, points), dtype=float)
+
+        n_chunks = min(self.n_workers, len(points))
+        if n_chunks <= 1:
+            return np.asarray(self.submit(fn, points).result(), dtype=float)
+
+        futures = [self.submit(fn, chunk) for chunk in np.array_split(points, n_chunks)]
+        return np.concatenate([np.asarray(f.result(), dtype=float) for f in futures])
+
+    def shutdown(self, wait=True):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+        return False
+
+
+class SequentialEvaluator(BaseEvaluator):
+    """Avalia no proprio thread do otimizador (comportamento original)."""
+
+    def submit(self, fn, point):
+        future = Future()
+        try:
+            future.set_result(fn(point))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+    def map(self, fn, points):
+        return [fn(p) for p in points]
+
+    def map_batch(self, fn, points):
+        points = as_points(points)
+        if is_batch_objective(fn):
+            return np.asarray(fn(points), dtype=float)
+        return np.array([fn(p) for p in points], dtype=float)
+
+
+class ThreadPoolEvaluator(BaseEvaluator):
+    """Pool de threads. Indicado para objetivos que esperam um subprocesso."""
+
+    def __init__(self, n_workers):
+        self.n_workers = n_workers
+        self._executor = ThreadPoolExecutor(max_workers=n_workers,
+                                            thread_name_prefix="eval")
+
+    def submit(self, fn, point):
+        return self._executor.submit(fn, point)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+class ProcessPoolEvaluator(BaseEvaluator):
+    """Pool de processos. A funcao objetivo precisa ser serializavel (pickle).
+
+    O initializer roda uma vez em cada processo filho; use-o para configurar
+    o estado global do objetivo (ex.: objective.configure_program).
+    """
+
+    def __init__(self, n_workers, initializer=None, initargs=()):
+        self.n_workers = n_workers
+        self._executor = ProcessPoolExecutor(max_workers=n_workers,
+                                             initializer=initializer,
+                                             initargs=initargs)
+
+    def submit(self, fn, point):
+        return self._executor.submit(fn, point)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+class AsyncioEvaluator(BaseEvaluator):
+    """Agenda as avaliacoes como corrotinas em um event loop asyncio.
+
+    O otimizador roda em outra thread e recebe concurrent.futures.Future
+    normais; todas as esperas ficam no loop, sem uma thread por avaliacao.
+    async_fn e a versao corrotina do objetivo; sem ela, o objetivo sincrono
+    roda no executor padrao do loop.
+    """
+
+    def __init__(self, loop, async_fn=None, max_concurrency=64):
+        self.n_workers = max_concurrency
+        self.loop = loop
+        self.async_fn = async_fn
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    async def _run(self, fn, point):
+        async with self._semaphore:
+            if self.async_fn is not None:
+                return await self.async_fn(point)
+            return await self.loop.run_in_executor(None, fn, point)
+
+    def submit(self, fn, point):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Avaliador encerrado")
+            future = asyncio.run_coroutine_threadsafe(self._run(fn, point), self.loop)
+            self._pending.add(future)
+        future.add_done_callback(self._discard)
+        return future
+
+    def map_batch(self, fn, points):
+        # A corrotina avalia um ponto por vez; lotes so sem async_fn
+        if self.async_fn is not None:
+            return np.asarray(self.map(fn, as_points(points)), dtype=float)
+        return super().map_batch(fn, points)
+
+    def _discard(self, future):
+        with self._lock:
+            self._pending.discard(future)
+
+    def shutdown(self, wait=True):
+        """Impede novos envios; com wait=False cancela as avaliacoes em voo."""
+        with self._lock:
+            self._closed = True
+            pending = list(self._pending)
+        if not wait:
+            for future in pending:
+                future.cancel()
+
+
+def create_evaluator(n_workers=None, backend="thread", initializer=None, initargs=(),
+                     nodes=None, token=None):
+    """Cria o avaliador adequado para n_workers/backend.
+
+    n_workers None ou <= 1 resulta em avaliacao sequencial.
+    backend: 'thread', 'process' ou 'remote' (nodes: lista "host:porta"
+    de servidores de avaliacao e token, o segredo dos nos; n_workers e
+    ignorado).
+    """
+    if backend == "remote":
+        from optimizer.remote_evaluator import RemoteEvaluator
+        return RemoteEvaluator(nodes or [], token=token)
+
+    if not n_workers or n_workers <= 1:
+        return SequentialEvaluator()
+
+    if backend == "thread":
+        return ThreadPoolEvaluator(n_workers)
+    if backend == "process":
+        return ProcessPoolEvaluator(n_workers, initializer=initializer, initargs=initargs)
+
+    raise ValueError(f"Backend de avaliacao desconhecido: {backend}")
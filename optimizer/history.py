@@ -0,0 +1,172 @@
+# optimizer/history.py
+"""
+Historico compacto dos otimizadores.
+
+Cada registro e uma linha de um array estruturado do NumPy (campos de
+tamanho fixo, sem um dict e um array copiado por iteracao). O buffer em
+memoria comeca com chunk_size registros e dobra de capacidade quando enche.
+
+Com path, os registros sao gravados em um arquivo .npy apenas por acrescimo:
+a cada bloco completo os registros vao para o disco e a memoria e liberada.
+O cabecalho e reescrito com o total de registros a cada flush, de modo que
+o arquivo pode ser lido a qualquer momento com np.load(path, mmap_mode='r').
+
+Para o codigo que le o formato antigo, history[i] e a iteracao retornam
+dicts com os mesmos campos.
+"""
+import os
+
+import numpy as np
+
+# Tamanho reservado para o cabecalho .npy (reescrito no lugar a cada flush)
+_HEADER_SIZE = 1024
+_MAGIC = b"\x93NUMPY\x01\x00"
+
+
+def pso_fields(n_dims):
+    return [('iteration', 'i8'), ('g_best', 'f8', (n_dims,)),
+            ('g_best_fitness', 'f8'), ('elapsed_time', 'f8')]
+
+
+def pattern_search_fields(n_dims):
+    return [('iteration', 'i8'), ('x', 'f8', (n_dims,)), ('f', 'f8'),
+            ('delta', 'f8'), ('improved', '?'), ('elapsed_time', 'f8')]
+
+
+def cma_es_fields(n_dims):
+    return [('iteration', 'i8'), ('x', 'f8', (n_dims,)), ('f', 'f8'),
+            ('sigma', 'f8'), ('elapsed_time', 'f8')]
+
+
+def _npy_header(dtype, n_records):
+    header = repr({
+        'descr': np.lib.format.dtype_to_descr(dtype),
+        'fortran_order': False,
+        'shape': (n_records,)
+    }).encode("latin1")
+    # magic (8) + tamanho do cabecalho (2) + dict preenchido com espacos + '\n'
+    padding = _HEADER_SIZE - len(_MAGIC) - 2 - len(header) - 1
+    if padding < 0:
+        raise ValueError("Registro de historico grande demais para o cabecalho")
+    return (_MAGIC + (_HEADER_SIZE - len(_MAGIC) - 2).to_bytes(2, "little")
+            + header + b" " * padding + b"\n")
+
+
+class HistoryBuffer:
+    """Historico em array estruturado, opcionalmente gravado em disco."""
+
+    def __init__(self, fields, chunk_size=256, path=None):
+        self.dtype = np.dtype(fields)
+        self.chunk_size = chunk_size
+        self.path = path
+
+        self._buffer = np.zeros(chunk_size, dtype=self.dtype)
+        self._n_buffered = 0
+        # Registros ja gravados em disco (apenas com path); o arquivo so e
+        # criado no primeiro flush
+        self._n_flushed = 0
+        self._file_created = False
+
+    def append(self, **values):
+        """Acrescenta um registro; campos omitidos ficam zerados."""
+        if self._n_buffered == len(self._buffer):
+            if self.path is not None:
+                self.flush()
+            else:
+                # Crescimento geometrico: custo amortizado constante por registro
+                grown = np.zeros(2 * len(self._buffer), dtype=self.dtype)
+                grown[:self._n_buffered] = self._buffer
+                self._buffer = grown
+
+        self._buffer[self._n_buffered] = np.zeros((), dtype=self.dtype)
+        record = self._buffer[self._n_buffered]
+        for name, value in values.items():
+            record[name] = value
+        self._n_buffered += 1
+
+    def flush(self):
+        """Grava os registros pendentes e atualiza o cabecalho do arquivo."""
+        if self.path is None:
+            return
+        with open(self.path, "r+b" if self._file_created else "w+b") as f:
+            self._file_created = True
+            f.seek(_HEADER_SIZE + self._n_flushed * self.dtype.itemsize)
+            f.write(self._buffer[:self._n_buffered].tobytes())
+            f.truncate()
+            self._n_flushed += self._n_buffered
+            self._n_buffered = 0
+            f.seek(0)
+            f.write(_npy_header(self.dtype, self._n_flushed))
+
+    @property
+    def records(self):
+        """Array estruturado com todos os registros (memmap se em disco)."""
+        if self.path is None:
+            return self._buffer[:self._n_buffered]
+        self.flush()
+        if self._n_flushed == 0:
+            return np.zeros(0, dtype=self.dtype)
+        return np.load(self.path, mmap_mode="r")
+
+    def __len__(self):
+        return self._n_flushed + self._n_buffered
+
+    def __getitem__(self, index):
+        """Registro no formato antigo (dict)."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("indice fora do historico")
+        if index >= self._n_flushed:
+            record = self._buffer[index - self._n_flushed]
+        else:
+            record = self.records[index]
+        return _as_dict(record)
+
+    def __iter__(self):
+        for record in self.records:
+            yield _as_dict(record)
+
+    def to_dicts(self):
+        return list(self)
+
+    def __getstate__(self):
+        # Em disco, o checkpoint guarda so a contagem: os registros ja estao no arquivo
+        self.flush()
+        state = self.__dict__.copy()
+        if self.path is not None:
+            state['_buffer'] = None
+        else:
+            state['_buffer'] = self._buffer[:self._n_buffered].copy()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.path is None:
+            buffer = np.zeros(max(self.chunk_size, len(self._buffer)), dtype=self.dtype)
+            buffer[:self._n_buffered] = self._buffer
+            self._buffer = buffer
+        else:
+            # Descarta registros gravados depois do checkpoint
+            self._buffer = np.zeros(self.chunk_size, dtype=self.dtype)
+            with open(self.path, "r+b" if self._file_created else "w+b") as f:
+                self._file_created = True
+                f.truncate(_HEADER_SIZE + self._n_flushed * self.dtype.itemsize)
+                f.seek(0)
+                f.write(_npy_header(self.dtype, self._n_flushed))
+
+
+def _as_dict(record):
+    return {name: (record[name].copy() if record[name].ndim else record[name].item())
+            for name in record.dtype.names}
+
+
+def phase_history_path(path, phase):
+    """Caminho do historico de uma fase: run.npy -> run_pso.npy."""
+    if path is None:
+        return None
+    root, ext = os.path.splitext(path)
+    return f"{root}_{phase}{ext or '.npy'}"
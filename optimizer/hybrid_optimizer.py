@@ -2,41 +2,82 @@
 import numpy as np
 from optimizer.base_optimizer import BaseOptimizer
 from optimizer.particle_swarm import ParticleSwarm
+from optimizer.cma_es import CMAES
 from optimizer.pattern_search import PatternSearch
-from datetime import datetime
+from optimizer.history import phase_history_path
+from optimizer.memo import MEMO_SIZE, PointMemo
+from utils.profiler import profiler
+from utils.logger import get_logger
+import copy
+import pickle
 import time
 import os
 
-def log(msg):
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    print(f"[{timestamp}] [HYBRID] {msg}")
+log = get_logger("HYBRID")
+
+# Fase global: nome -> (nome exibido, chave do historico)
+GLOBAL_PHASES = {
+    'pso': ('PSO', 'pso'),
+    'cma': ('CMA-ES', 'cma_es')
+}
 
 class HybridPSOPatternSearch(BaseOptimizer):
-    """Hibrido: PSO + Pattern Search"""
+    """Hibrido: PSO + Pattern Search
+
+    A fase de refinamento executa n_starts buscas locais concorrentes, a
+    partir dos melhores pessoais distintos do PSO (afastados entre si por
+    mais de start_distance, padrao delta, na norma do maximo). O fitness
+    dos pontos de partida ja e conhecido e todas as buscas compartilham com
+    o PSO a memoria de pontos avaliados. As buscas andam juntas: cada lote
+    enviado ao avaliador reune os pontos de todas as buscas ativas.
+
+    Com global_phase='cma', a fase global e um CMA-ES (populacao popsize,
+    pso_max_iter geracoes) em vez do PSO; os pontos de partida saem do melhor
+    ponto e da ultima geracao.
+    """
+    
+    profile_tag = "hybrid"
     
     def __init__(self, objective_function, x0,
                  n_particles=30, w=0.7, c1=1.5, c2=1.5, pso_max_iter=100,
                  delta=0.1, delta_min=1e-6, reduction_factor=0.5, ps_max_iter=100,
-                 bounds=None, n_threads=None, **kwargs):
-        super().__init__(objective_function, x0, **kwargs)
+                 poll=None, n_starts=1, start_distance=None, init="uniform",
+                 global_phase="pso", popsize=None, memo_size=MEMO_SIZE, bounds=None,
+                 n_threads=None, backend="thread", evaluator=None, **kwargs):
+        super().__init__(objective_function, x0, n_threads=n_threads,
+                         backend=backend, evaluator=evaluator, **kwargs)
+        if global_phase not in GLOBAL_PHASES:
+            raise ValueError(f"Fase global desconhecida: {global_phase}")
         
+        self.global_phase = global_phase
+        self.popsize = popsize
         self.n_particles = n_particles
         self.w = w
         self.c1 = c1
         self.c2 = c2
         self.pso_max_iter = pso_max_iter
+        # Amostragem do enxame inicial (ver ParticleSwarm)
+        self.init = init
         
         self.delta = delta
         self.delta_min = delta_min
         self.reduction_factor = reduction_factor
         self.ps_max_iter = ps_max_iter
+        self.poll = poll
+        self.n_starts = max(1, int(n_starts))
+        self.start_distance = delta if start_distance is None else start_distance
+        
+        # Memoria de avaliacoes compartilhada entre o PSO e as buscas locais.
+        # Sem dimensoes inteiras, guarda so os memo_size pontos mais recentes
+        # (ela vai inteira em cada checkpoint); 0 ou None desativa
+        if self._memo is None and memo_size:
+            self._memo = PointMemo(maxsize=memo_size)
         
         self.bounds = bounds or [(-10, 10)] * len(x0)
-        self.history = {'pso': [], 'pattern_search': [], 'phases': []}
+        self.history = {GLOBAL_PHASES[global_phase][1]: [], 'pattern_search': [], 'phases': []}
         
         # Configura threads
         if n_threads is not None:
-            self.n_threads = n_threads
             try:
                 os.environ['OMP_NUM_THREADS'] = str(n_threads)
                 os.environ['MKL_NUM_THREADS'] = str(n_threads)
@@ -45,54 +86,125 @@ class HybridPSOPatternSearch(BaseOptimizer):
             except:
                 pass
     
-    def optimize(self):
+    def _phase_callback(self, phase, start_time, **extra):
+        """Repassa o progresso de uma fase ao callback do hibrido."""
+        if self.callback is None:
+            return None
+        
+        def report(info):
+            self.callback({**info, 'phase': phase, **extra,
+                           'elapsed_time': time.time() - start_time})
+        return report
+    
+    def _phase_checkpoint(self, phase, **extra):
+        """Destino dos checkpoints de uma fase: grava no checkpoint do hibrido."""
+        if self._checkpoint_sink is None:
+            return None
+        
+        def sink(state):
+            self._checkpoint_sink({'phase': phase, 'state': state, **extra})
+        return sink
+    
+    def _select_starts(self, pso):
+        """Ate n_starts melhores pessoais do PSO, distantes entre si, com seu fitness."""
+        starts = []
+        for i in np.argsort(-pso.p_best_fitness, kind="stable"):
+            f = pso.p_best_fitness[i]
+            if not np.isfinite(f):
+                break
+            x = pso.p_best[i]
+            if all(np.max(np.abs(x - s)) > self.start_distance for s, _ in starts):
+                starts.append((x.copy(), float(f)))
+                if len(starts) == self.n_starts:
+                    break
+        return starts
+    
+    def _steps(self):
         start_time = time.time()
         log(f"=== INICIANDO OTIMIZACAO HIBRIDA ===")
         
-        # FASE 1: PSO
-        log("FASE 1: PSO - Exploracao global")
-        pso = ParticleSwarm(
-            objective_function=self.objective_function,
-            x0=self.x0,
-            n_particles=self.n_particles,
-            w=self.w,
-            c1=self.c1,
-            c2=self.c2,
-            bounds=self.bounds,
-            max_iter=self.pso_max_iter,
-            tol=self.tol,
-            n_threads=getattr(self, 'n_threads', None)
-        )
-        
-        pso_best_x, pso_best_f, pso_history = pso.optimize()
-        self.history['pso'] = pso_history
-        
-        phase1_time = time.time() - start_time
-        log(f"PSO concluido: f = {pso_best_f:.6f} (tempo fase: {phase1_time:.2f}s)")
-        
-        # FASE 2: Pattern Search
-        log("FASE 2: Pattern Search - Refinamento local")
+        # Checkpoint a retomar: {'phase': 'pso'|'ps', 'state': estado da fase, ...}
+        resume, self._resume_state = self._resume_state, None
+        
+        phase_name, history_key = GLOBAL_PHASES[self.global_phase]
+        if resume is None or resume['phase'] != 'ps':
+            # FASE 1: exploracao global (PSO ou CMA-ES)
+            log(f"FASE 1: {phase_name} - Exploracao global")
+            common = dict(
+                objective_function=self.objective_function,
+                x0=self.x0,
+                bounds=self.bounds,
+                max_iter=self.pso_max_iter,
+                tol=self.tol,
+                n_threads=self.n_threads,
+                callback=self._phase_callback(phase_name, start_time),
+                checkpoint_every=self.checkpoint_every,
+                history_path=phase_history_path(self.history_path, self.global_phase),
+                budget=self.budget,
+                surrogate=self.surrogate,
+                signature=self.signature
+            )
+            if self.global_phase == 'cma':
+                pso = CMAES(popsize=self.popsize, **common)
+            else:
+                pso = ParticleSwarm(n_particles=self.n_particles, w=self.w, c1=self.c1,
+                                    c2=self.c2, init=self.init, **common)
+            pso._memo = self._memo
+            pso._n_workers = self._n_workers
+            pso._checkpoint_sink = self._phase_checkpoint(self.global_phase)
+            if resume is not None:
+                pso._resume_state = resume['state']
+                start_time -= resume['state']['elapsed_time']
+            
+            pso_best_x, pso_best_f, pso_history = yield from pso._steps()
+            self.history[history_key] = pso_history
+            
+            phase1_time = time.time() - start_time
+            profiler.record(f'hybrid_phase_{self.global_phase}', phase1_time)
+            log(f"{phase_name} concluido: f = {pso_best_f:.6f} (tempo fase: {phase1_time:.2f}s)")
+            
+            # A busca local continua com os pontos ja avaliados na fase global
+            starts = self._select_starts(pso) or [(pso_best_x, float(pso_best_f))]
+            surrogate = pso.surrogate
+            memo = pso._memo
+            
+            # Marca a troca de fase: uma retomada a partir daqui pula o PSO
+            pso_result = (pso_best_x, pso_best_f, pso_history, phase1_time, starts)
+            sink = self._phase_checkpoint('ps', pso_result=pso_result)
+            if sink is not None:
+                sink({'rng_state': np.random.get_state(), 'surrogate': surrogate,
+                      'memo': memo, 'runs': {}})
+            runs = {}
+        else:
+            pso_result = resume['pso_result']
+            pso_best_x, pso_best_f, pso_history, phase1_time, starts = pso_result
+            self.history[history_key] = pso_history
+            state = resume['state']
+            np.random.set_state(state['rng_state'])
+            surrogate = state['surrogate']
+            memo = state['memo']
+            runs = state['runs']
+            start_time -= phase1_time
+            log(f"Retomando do checkpoint: fase Pattern Search ({phase_name}: f = {pso_best_f:.6f})")
+        
+        # FASE 2: Pattern Search a partir de cada ponto de partida
+        log(f"FASE 2: Pattern Search - Refinamento local ({len(starts)} pontos de partida)")
         phase2_start = time.time()
         
-        ps = PatternSearch(
-            objective_function=self.objective_function,
-            x0=pso_best_x,
-            delta=self.delta,
-            delta_min=self.delta_min,
-            reduction_factor=self.reduction_factor,
-            max_iter=self.ps_max_iter,
-            tol=self.tol
-        )
-        
-        ps_best_x, ps_best_f, ps_history = ps.optimize()
+        results = yield from self._refine(starts, surrogate, memo, runs, pso_result, start_time)
+        best = max(range(len(results)), key=lambda i: results[i][1])
+        ps_best_x, ps_best_f, ps_history = results[best]
         self.history['pattern_search'] = ps_history
+        if len(results) > 1:
+            self.history['pattern_search_runs'] = [r[2] for r in results]
         
         phase2_time = time.time() - phase2_start
+        profiler.record('hybrid_phase_pattern_search', phase2_time)
         log(f"Pattern Search concluido: f = {ps_best_f:.6f} (tempo fase: {phase2_time:.2f}s)")
         
         # Resultados
         self.history['phases'].append({
-            'phase': 'PSO',
+            'phase': phase_name,
             'best_x': pso_best_x.copy(),
             'best_f': pso_best_f,
             'iterations': len(pso_history),
@@ -104,7 +216,8 @@ class HybridPSOPatternSearch(BaseOptimizer):
             'best_x': ps_best_x.copy(),
             'best_f': ps_best_f,
             'iterations': len(ps_history),
-            'time': phase2_time
+            'time': phase2_time,
+            'start': best
         })
         
         total_time = time.time() - start_time
@@ -112,4 +225,86 @@ class HybridPSOPatternSearch(BaseOptimizer):
         log(f"Melhor fitness final: {ps_best_f:.6f}")
         log(f"TEMPO TOTAL: {total_time:.2f} segundos ({total_time/60:.2f} minutos)")
         
-        return ps_best_x, ps_best_f, self.history
\ No newline at end of file
+        return ps_best_x, ps_best_f, self.history
+    
+    def _refine(self, starts, surrogate, memo, runs, pso_result, start_time):
+        """Executa um Pattern Search por ponto de partida (gerador).
+
+        As buscas andam juntas: cada lote pedido reune os pontos de todas as
+        buscas ainda ativas, de modo que o avaliador as atende em paralelo.
+        runs: estados serializados das buscas ja iniciadas (retomada).
+        """
+        multi = len(starts) > 1
+        poll = self.poll or ("complete" if self._n_workers > 1 else "opportunistic")
+        sink = self._phase_checkpoint('ps', pso_result=pso_result)
+        runs = dict(runs)
+        
+        def run_sink(i):
+            if sink is None:
+                return None
+            
+            def save(state):
+                # A memoria compartilhada e gravada uma unica vez
+                runs[i] = pickle.dumps({k: v for k, v in state.items() if k != 'memo'})
+                sink({'rng_state': state['rng_state'], 'surrogate': surrogate,
+                      'memo': memo, 'runs': dict(runs)})
+            return save
+        
+        searches = []
+        for i, (x0, f0) in enumerate(starts):
+            ps = PatternSearch(
+                objective_function=self.objective_function,
+                x0=x0,
+                delta=self.delta,
+                delta_min=self.delta_min,
+                reduction_factor=self.reduction_factor,
+                poll=poll,
+                max_iter=self.ps_max_iter,
+                tol=self.tol,
+                callback=self._phase_callback('Pattern Search', start_time,
+                                              **({'start': i} if multi else {})),
+                checkpoint_every=self.checkpoint_every,
+                history_path=phase_history_path(self.history_path, f"ps{i}" if multi else "ps"),
+                budget=self.budget,
+                # Cada busca concorrente treina sua propria copia do surrogate
+                surrogate=copy.deepcopy(surrogate) if multi else surrogate,
+                signature=self.signature,
+                f0=f0
+            )
+            ps._memo = memo
+            ps._checkpoint_sink = run_sink(i)
+            if i in runs:
+                ps._resume_state = pickle.loads(runs[i])
+            searches.append(ps._steps())
+        
+        return (yield from self._interleave(searches))
+
+    def _interleave(self, searches):
+        """Avanca varios lacos _steps juntos e retorna seus resultados (gerador).
+
+        Cada pedido reune os lotes de todos os lacos ativos; a parada na
+        primeira melhoria (accept_above) so e repassada com um unico laco.
+        """
+        results = [None] * len(searches)
+        requests = {}
+        
+        def advance(i, values):
+            try:
+                requests[i] = searches[i].send(values)
+            except StopIteration as stop:
+                requests.pop(i, None)
+                results[i] = stop.value
+        
+        for i in range(len(searches)):
+            advance(i, None)
+        
+        while requests:
+            active = list(requests)
+            blocks = [requests[i][0] for i in active]
+            accept_above = requests[active[0]][1] if len(active) == 1 else None
+            values = yield np.vstack(blocks), accept_above
+            offset = 0
+            for i, block in zip(active, blocks):
+                advance(i, values[offset:offset + len(block)])
+                offset += len(block)
+        return results
@@ -0,0 +1,282 @@
+# optimizer/island_swarm.py
+"""
+PSO em ilhas: K enxames independentes, cada um em seu proprio processo.
+
+Cada ilha executa o ParticleSwarm normal. A cada migration_interval
+iteracoes, envia suas n_migrants melhores particulas (arrays X e f) para as
+ilhas vizinhas e recebe, sem esperar, as que ja chegaram; os imigrantes
+substituem as piores particulas quando sao melhores.
+
+Topologias:
+  - ring: a ilha i envia para a ilha i+1
+  - full: cada ilha envia para todas as outras
+
+A funcao objetivo precisa ser serializavel (pickle), e os processos usam o
+contexto spawn; o initializer roda uma vez em cada ilha (ex.:
+objective.configure_from_config), como no ProcessPoolEvaluator.
+
+Inicializacao e reinicios (init, restart_patience, n_elites,
+restart_growth, max_particles) valem em cada ilha. Os n_threads workers
+de avaliacao sao divididos entre as ilhas (no minimo 1 cada), e as
+avaliacoes de cada ilha sao somadas ao orcamento (budget) ao final.
+Checkpoints e o backend 'remote' nao sao suportados: sao rejeitados na
+criacao.
+"""
+import multiprocessing
+import queue
+import time
+import traceback
+
+import numpy as np
+
+from optimizer.base_optimizer import BaseOptimizer
+from optimizer.budget import Budget
+from optimizer.history import HistoryBuffer, pso_fields
+from optimizer.particle_swarm import ParticleSwarm
+from utils.logger import get_logger, configure as configure_logging, flush as flush_logs
+
+log = get_logger("ISLANDS")
+
+TOPOLOGIES = ("ring", "full")
+
+
+class _Migration:
+    """Troca de particulas de uma ilha (gancho migration do ParticleSwarm)."""
+
+    def __init__(self, interval, n_migrants, inbox, outboxes):
+        self.interval = interval
+        self.n_migrants = n_migrants
+        self.inbox = inbox
+        self.outboxes = outboxes
+
+    def __call__(self, iteration, p_best, p_best_fitness):
+        if iteration % self.interval != 0:
+            return None
+
+        best = np.argsort(p_best_fitness)[::-1][:self.n_migrants]
+        payload = (p_best[best].copy(), p_best_fitness[best].copy())
+        for outbox in self.outboxes:
+            outbox.put(payload)
+
+        # Recebe o que ja chegou, sem esperar pelas vizinhas
+        received = []
+        while True:
+            try:
+                received.append(self.inbox.get_nowait())
+            except queue.Empty:
+                break
+        if not received:
+            return None
+
+        X = np.concatenate([r[0] for r in received])
+        f = np.concatenate([r[1] for r in received])
+        best = np.argsort(f)[::-1][:self.n_migrants]
+        return X[best], f[best]
+
+
+def _run_island(island_id, params, seed, migration, events, initializer, initargs, log_level):
+    """Processo de uma ilha: executa o PSO e envia progresso/resultado."""
+    # Mensagens nao consumidas por ilhas ja encerradas nao devem travar a saida
+    for outbox in migration.outboxes:
+        outbox.cancel_join_thread()
+
+    if initializer is not None:
+        initializer(*initargs)
+    configure_logging(level=log_level)
+    np.random.seed(seed)
+
+    def progress(info):
+        events.put(('progress', island_id, info))
+
+    # Orcamento proprio (ilimitado se nao houver): conta as avaliacoes da ilha
+    budget = params.pop('budget') or Budget()
+    try:
+        pso = ParticleSwarm(callback=progress, migration=migration, budget=budget, **params)
+        x, f, history = pso.optimize()
+        events.put(('result', island_id, {'x': x, 'f': f, 'iterations': len(history),
+                                          'n_eval': budget.used_evals}))
+    except Exception:
+        events.put(('error', island_id, traceback.format_exc()))
+    finally:
+        flush_logs()
+
+
+class IslandParticleSwarm(BaseOptimizer):
+    """PSO com K ilhas em processos separados e migracao periodica."""
+
+    profile_tag = "islands"
+
+    def __init__(self, objective_function, x0, n_islands=None, n_particles=30,
+                 w=0.7, c1=1.5, c2=1.5, bounds=None, migration_interval=10,
+                 n_migrants=2, topology="ring", seed=None, island_log_level="WARNING",
+                 init="uniform", restart_patience=None, n_elites=1, restart_growth=1.0,
+                 max_particles=None, **kwargs):
+        super().__init__(objective_function, x0, **kwargs)
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Topologia desconhecida: {topology}")
+        if self.checkpoint_path is not None:
+            raise ValueError("PSO em ilhas nao suporta checkpoint/retomada")
+        if self.backend == "remote":
+            raise ValueError("PSO em ilhas nao suporta o backend 'remote'")
+
+        self.n_islands = n_islands or multiprocessing.cpu_count()
+        self.n_particles = n_particles
+        self.w = w
+        self.c1 = c1
+        self.c2 = c2
+        self.bounds = bounds or [(-10, 10)] * len(x0)
+        self.migration_interval = migration_interval
+        self.n_migrants = n_migrants
+        self.topology = topology
+        self.seed = seed
+        self.island_log_level = island_log_level
+        # Opcoes do ParticleSwarm de cada ilha
+        self.swarm_options = {
+            'init': init,
+            'restart_patience': restart_patience,
+            'n_elites': n_elites,
+            'restart_growth': restart_growth,
+            'max_particles': max_particles
+        }
+        self.history = HistoryBuffer(pso_fields(len(x0)), path=self.history_path)
+        self.island_results = {}
+
+    def _neighbors(self, i):
+        if self.n_islands == 1:
+            return []
+        if self.topology == "ring":
+            return [(i + 1) % self.n_islands]
+        return [j for j in range(self.n_islands) if j != i]
+
+    def _island_params(self):
+        """Parametros do ParticleSwarm de cada ilha."""
+        budget = None
+        if self.budget is not None:
+            # O orcamento e dividido igualmente entre as ilhas
+            max_evals = self.budget.max_evals
+            budget = Budget(
+                max_evals=None if max_evals is None else max_evals // self.n_islands,
+                max_time=None if self.budget.max_time is None
+                else self.budget.max_time - self.budget.elapsed()
+            )
+        return {
+            'objective_function': self.objective_function,
+            'x0': self.x0,
+            'n_particles': self.n_particles,
+            'w': self.w,
+            'c1': self.c1,
+            'c2': self.c2,
+            'bounds': self.bounds,
+            'max_iter': self.max_iter,
+            'tol': self.tol,
+            # Os workers sao divididos entre as ilhas (cada uma tem o seu pool)
+            'n_threads': (None if self.n_threads is None
+                          else max(1, self.n_threads // self.n_islands)),
+            'backend': self.backend,
+            # Pool de processos da ilha (backend 'process')
+            'initializer': self.initializer,
+            'initargs': self.initargs,
+            'budget': budget,
+            # Cada ilha recebe sua propria copia do surrogate
+            'surrogate': self.surrogate,
+            'signature': self.signature,
+            **self.swarm_options
+        }
+
+    def optimize(self):
+        start_time = time.time()
+        if self.budget is not None:
+            self.budget.start()
+        log(f"=== INICIANDO PSO EM ILHAS ===")
+        log(f"Ilhas: {self.n_islands} ({self.topology}), Particulas por ilha: {self.n_particles}, "
+            f"Migracao: {self.n_migrants} a cada {self.migration_interval} iteracoes")
+
+        ctx = multiprocessing.get_context('spawn')
+        seed = self.seed if self.seed is not None else int(np.random.randint(2**31 - self.n_islands))
+        inboxes = [ctx.Queue() for _ in range(self.n_islands)]
+        events = ctx.Queue()
+        params = self._island_params()
+
+        processes = []
+        for i in range(self.n_islands):
+            migration = _Migration(self.migration_interval, self.n_migrants, inboxes[i],
+                                   [inboxes[j] for j in self._neighbors(i)])
+            process = ctx.Process(target=_run_island, name=f"po-island-{i}",
+                                  args=(i, params, seed + i, migration, events,
+                                        self.initializer, self.initargs,
+                                        self.island_log_level))
+            process.start()
+            processes.append(process)
+
+        try:
+            g_best, g_best_fitness = self._collect(processes, events, start_time)
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+
+        total_time = time.time() - start_time
+        n_eval = sum(r.get('n_eval', 0) for r in self.island_results.values())
+        log(f"=== CONCLUIDO ===")
+        log(f"Melhor fitness: {g_best_fitness:.6f}")
+        log(f"Avaliacoes: {n_eval}")
+        log(f"TEMPO TOTAL: {total_time:.2f} segundos ({total_time/60:.2f} minutos)")
+
+        self.history.flush()
+        return g_best, g_best_fitness, self.history
+
+    def _collect(self, processes, events, start_time):
+        """Recebe progresso e resultados das ilhas ate todas terminarem."""
+        n_dims = len(self.x0)
+        g_best = np.array(self.x0, dtype=float)
+        g_best_fitness = -np.inf
+        iterations = [0] * self.n_islands
+        n_evals = [0] * self.n_islands
+        reported = -1
+        pending = set(range(self.n_islands))
+
+        while pending:
+            try:
+                kind, island, payload = events.get(timeout=1.0)
+            except queue.Empty:
+                dead = [i for i in pending if not processes[i].is_alive()]
+                if dead:
+                    raise RuntimeError(f"Ilha {dead[0]} terminou sem resultado "
+                                       f"(exitcode {processes[dead[0]].exitcode})")
+                continue
+
+            if kind == 'error':
+                raise RuntimeError(f"Ilha {island} falhou:\n{payload}")
+
+            if kind == 'progress':
+                iterations[island] = payload['iteration']
+                n_evals[island] = payload.get('n_eval', n_evals[island])
+                best_f, best_x = payload['best_f'], payload['best_x']
+            else:
+                pending.discard(island)
+                n_evals[island] = payload['n_eval']
+                if self.budget is not None:
+                    self.budget.charge(payload['n_eval'])
+                self.island_results[island] = payload
+                best_f, best_x = payload['f'], payload['x']
+
+            if best_f > g_best_fitness:
+                g_best_fitness = best_f
+                g_best = np.asarray(best_x, dtype=float).reshape(n_dims)
+                log.best(f"Ilha {island}, iter {iterations[island]}: Nova melhor -> "
+                         f"f = {g_best_fitness:.6f} (tempo: {time.time() - start_time:.2f}s)",
+                         island=island, iteration=iterations[island], f=float(g_best_fitness))
+
+            # Iteracao global: a mais atrasada entre as ilhas ainda ativas
+            active = [iterations[i] for i in pending] or [max(iterations)]
+            iteration = min(active)
+            if iteration > reported:
+                reported = iteration
+                elapsed = time.time() - start_time
+                self.history.append(iteration=iteration, g_best=g_best,
+                                    g_best_fitness=g_best_fitness, elapsed_time=elapsed)
+                self._report_progress(iteration, g_best, g_best_fitness, elapsed,
+                                      n_eval=sum(n_evals))
+
+        return g_best, g_best_fitness
@@ -0,0 +1,32 @@
+# optimizer/lattice.py
+"""
+Dimensoes inteiras da assinatura do programa.
+
+O programa recebe int(round(x)) nos parametros 'int' (ver
+objective.external_program.convert_params): passos fracionarios nessas
+dimensoes levam ao mesmo argumento. Os otimizadores arredondam os pontos
+antes de avaliar (snap), nao reavaliam pontos ja conhecidos da rede e o
+Pattern Search usa passo minimo 1 nelas.
+"""
+import numpy as np
+
+
+def integer_mask(signature):
+    """Mascara booleana das dimensoes 'int' (None se nao houver nenhuma)."""
+    if not signature:
+        return None
+    mask = np.array([t == "int" for t in signature], dtype=bool)
+    return mask if mask.any() else None
+
+
+def snap(points, mask):
+    """Copia de points com as dimensoes inteiras arredondadas."""
+    points = np.array(points, dtype=float)
+    # + 0.0 normaliza -0.0, para que pontos iguais tenham a mesma chave
+    points[..., mask] = np.round(points[..., mask]) + 0.0
+    return points
+
+
+def integer_step(delta):
+    """Passo nas dimensoes inteiras: parte inteira de delta, no minimo 1."""
+    return max(1.0, float(np.floor(delta)))
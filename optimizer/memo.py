@@ -0,0 +1,53 @@
+# optimizer/memo.py
+"""
+Memoria de avaliacoes por ponto, compartilhavel entre otimizadores.
+
+A chave e o ponto (ja arredondado nas dimensoes inteiras) em bytes. E
+usada para nao reavaliar pontos da rede inteira (optimizer.lattice) e,
+no hibrido, para que o PSO e as buscas locais concorrentes compartilhem
+os valores ja conhecidos.
+
+Com maxsize, so os maxsize pontos gravados mais recentemente sao mantidos
+(os mais antigos saem primeiro): em problemas continuos, as repeticoes
+exatas vem de pontos recentes (ex.: o poll do Pattern Search voltando ao
+centro anterior), e a memoria e os checkpoints nao crescem com a execucao.
+"""
+import threading
+
+# Tamanho padrao da memoria compartilhada em problemas continuos
+MEMO_SIZE = 10000
+
+
+class PointMemo:
+    """Valores conhecidos por ponto, seguro entre threads e serializavel."""
+
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        return self._data.get(key, default)
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            if self.maxsize is not None and len(self._data) > self.maxsize:
+                # dict preserva a ordem de insercao: remove o mais antigo
+                del self._data[next(iter(self._data))]
+
+    def __getstate__(self):
+        # Copia consistente mesmo com outras threads gravando
+        with self._lock:
+            return {'_data': dict(self._data), 'maxsize': self.maxsize}
+
+    def __setstate__(self, state):
+        self._data = state['_data']
+        self.maxsize = state.get('maxsize')
+        self._lock = threading.Lock()
@@ -1,32 +1,67 @@
 # optimizer/particle_swarm.py
 import numpy as np
 from optimizer.base_optimizer import BaseOptimizer
-from datetime import datetime
+from optimizer.history import HistoryBuffer, pso_fields
+from optimizer.sampling import SAMPLERS, sample
+from utils.logger import get_logger
 import time
 import os
 
-def log(msg):
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    print(f"[{timestamp}] [PSO] {msg}")
+log = get_logger("PSO")
 
 class ParticleSwarm(BaseOptimizer):
     """Particle Swarm Optimization"""
     
+    profile_tag = "pso"
+    
     def __init__(self, objective_function, x0, 
                  n_particles=30, w=0.7, c1=1.5, c2=1.5,
-                 bounds=None, n_threads=None, **kwargs):
-        super().__init__(objective_function, x0, **kwargs)
+                 bounds=None, n_threads=None, backend="thread", evaluator=None,
+                 vectorized=True, migration=None, init="uniform",
+                 restart_patience=None, n_elites=1, restart_growth=1.0,
+                 max_particles=None, **kwargs):
+        super().__init__(objective_function, x0, n_threads=n_threads,
+                         backend=backend, evaluator=evaluator, **kwargs)
         
         self.n_particles = n_particles
         self.w = w
         self.c1 = c1
         self.c2 = c2
         self.bounds = bounds or [(-10, 10)] * len(x0)
-        self.history = []
+        self.history = HistoryBuffer(pso_fields(len(x0)), path=self.history_path)
+        
+        # vectorized=True atualiza o enxame inteiro com operacoes de array;
+        # False mantem o laco por particula (mesma dinamica, mais lento)
+        self.vectorized = vectorized
+        
+        # migration(iteration, p_best, p_best_fitness) -> (X, f) ou None:
+        # particulas recebidas de outras ilhas (ver optimizer.island_swarm)
+        self.migration = migration
+        
+        # Amostragem das posicoes iniciais (optimizer.sampling): 'uniform',
+        # 'lhs' ou 'halton'
+        if init not in SAMPLERS:
+            raise ValueError(f"Metodo de inicializacao desconhecido: {init}")
+        self.init = init
+        
+        # Reinicio por estagnacao: apos restart_patience iteracoes sem o
+        # melhor do enxame melhorar mais que tol (ou com o enxame convergido),
+        # o enxame e reamostrado com a populacao multiplicada por
+        # restart_growth, ate max_particles (padrao: 10x n_particles). Os
+        # n_elites melhores pessoais ficam fora do enxame, como memoria das
+        # bacias ja encontradas (pontos de partida do hibrido): nao se movem,
+        # nao sao reavaliados e nao atraem o novo enxame. None desativa
+        if restart_growth < 1:
+            raise ValueError(f"restart_growth deve ser >= 1: {restart_growth}")
+        if max_particles is not None and max_particles < n_particles:
+            raise ValueError(f"max_particles ({max_particles}) menor que n_particles ({n_particles})")
+        self.restart_patience = restart_patience
+        self.n_elites = max(0, int(n_elites))
+        self.restart_growth = restart_growth
+        self.max_particles = max_particles or 10 * n_particles
         
         # Configura threads
         if n_threads is not None:
-            self.n_threads = n_threads
             # Define threads para numpy (se disponível)
             try:
                 os.environ['OMP_NUM_THREADS'] = str(n_threads)
@@ -36,97 +71,194 @@ class ParticleSwarm(BaseOptimizer):
             except:
                 pass
     
-    def optimize(self):
-        start_time = time.time()
-        log(f"=== INICIANDO PSO ===")
+    def _receive_migrants(self, iteration, positions, fitness, p_best, p_best_fitness):
+        """Substitui as piores particulas pelos imigrantes que forem melhores."""
+        incoming = self.migration(iteration, p_best, p_best_fitness)
+        if incoming is None:
+            return
         
-        n_dims = len(self.x0)
-        log(f"Particulas: {self.n_particles}, Dimensoes: {n_dims}")
-        
-        # Inicializa posicoes
-        positions = np.zeros((self.n_particles, n_dims))
-        for i in range(n_dims):
-            low, high = self.bounds[i]
-            positions[:, i] = np.random.uniform(low, high, self.n_particles)
+        X, f = incoming
+        worst = np.argsort(p_best_fitness)[:len(f)]
+        accept = f[:len(worst)] > p_best_fitness[worst]
+        idx = worst[accept]
+        positions[idx] = X[:len(worst)][accept]
+        fitness[idx] = f[:len(worst)][accept]
+        p_best[idx] = positions[idx]
+        p_best_fitness[idx] = fitness[idx]
+    
+    def _initial_velocities(self, n, low, high):
+        """Velocidades uniformes em +-10% da faixa de cada dimensao."""
+        velocities = np.zeros((n, len(low)))
+        for i in range(len(low)):
+            range_size = high[i] - low[i]
+            velocities[:, i] = np.random.uniform(-range_size * 0.1, range_size * 0.1, n)
+        return velocities
+    
+    def _restart_swarm(self, p_best, p_best_fitness, n_kept, low, high):
+        """Novo enxame com os n_elites melhores pessoais nas primeiras posicoes
+        e o restante reamostrado (gerador). O enxame (sem os n_kept elites
+        anteriores) cresce restart_growth vezes, ate max_particles.
         
-        # Inicializa velocidades
-        velocities = np.zeros((self.n_particles, n_dims))
-        for i in range(n_dims):
-            low, high = self.bounds[i]
-            range_size = high - low
-            velocities[:, i] = np.random.uniform(-range_size * 0.1, range_size * 0.1, self.n_particles)
+        Os elites nao sao reavaliados. Retorna (positions, velocities,
+        fitness, p_best, p_best_fitness, n_elites, n_eval).
+        """
+        n_elites = min(self.n_elites, len(p_best))
+        n_swarm = min(self.max_particles, int(round((len(p_best) - n_kept) * self.restart_growth)))
+        n_particles = n_elites + max(1, n_swarm)
+        elites = np.argsort(-p_best_fitness, kind="stable")[:n_elites]
         
-        # Avalia particulas
-        fitness = np.array([self.objective_function(p) for p in positions])
+        fresh = sample(self.init, n_particles - n_elites, low, high)
+        positions = np.vstack([p_best[elites], fresh])
+        velocities = self._initial_velocities(n_particles, low, high)
         
-        p_best = positions.copy()
-        p_best_fitness = fitness.copy()
+        fitness = np.empty(n_particles)
+        fitness[:n_elites] = p_best_fitness[elites]
+        fitness[n_elites:], evaluated = yield from self._screened(fresh)
         
-        g_best_idx = np.argmax(fitness)
-        g_best = positions[g_best_idx].copy()
-        g_best_fitness = fitness[g_best_idx]
+        p_best = self._snap(positions)
+        return positions, velocities, fitness, p_best, fitness.copy(), n_elites, len(evaluated)
+    
+    def _steps(self):
+        start_time = time.time()
+        log(f"=== INICIANDO PSO ===")
         
-        elapsed = time.time() - start_time
-        log(f"Fitness inicial: {g_best_fitness:.6f} (tempo: {elapsed:.2f}s)")
+        n_dims = len(self.x0)
+        log(f"Particulas: {self.n_particles}, Dimensoes: {n_dims}, Workers: {self._n_workers}")
         
-        self.history.append({
-            'iteration': 0,
-            'g_best': g_best.copy(),
-            'g_best_fitness': g_best_fitness,
-            'elapsed_time': elapsed
-        })
+        # Limites e velocidade maxima por dimensao (calculados uma vez)
+        low = np.array([b[0] for b in self.bounds], dtype=float)
+        high = np.array([b[1] for b in self.bounds], dtype=float)
+        v_max = (high - low) * 0.2
         
-        n_eval = self.n_particles
+        state = self._take_resume_state()
+        if state is None:
+            # Inicializa posicoes e velocidades
+            positions = sample(self.init, self.n_particles, low, high)
+            velocities = self._initial_velocities(self.n_particles, low, high)
+            
+            # Avalia particulas (um lote concorrente)
+            fitness, evaluated = yield from self._screened(positions)
+            
+            # Com dimensoes inteiras, os melhores sao os pontos da rede avaliados
+            p_best = self._snap(positions).copy()
+            p_best_fitness = fitness.copy()
+            
+            g_best_idx = np.argmax(fitness)
+            g_best = p_best[g_best_idx].copy()
+            g_best_fitness = fitness[g_best_idx]
+            
+            elapsed = time.time() - start_time
+            log(f"Fitness inicial: {g_best_fitness:.6f} (tempo: {elapsed:.2f}s)")
+            
+            self.history.append(iteration=0, g_best=g_best, g_best_fitness=g_best_fitness,
+                                elapsed_time=elapsed)
+            
+            n_eval = len(evaluated)
+            self._report_progress(0, g_best, g_best_fitness, elapsed, n_eval=n_eval)
+            first_iteration = 1
+            # Melhor do enxame atual (atrai as particulas; difere do g_best
+            # apos um reinicio), iteracoes sem melhora dele, elites mantidos
+            # no inicio dos arrays (fora do enxame) e reinicios feitos
+            s_best, s_best_fitness = g_best.copy(), g_best_fitness
+            stall = 0
+            n_kept = 0
+            n_restarts = 0
+        else:
+            positions = state['positions']
+            velocities = state['velocities']
+            fitness = state['fitness']
+            p_best = state['p_best']
+            p_best_fitness = state['p_best_fitness']
+            g_best = state['g_best']
+            g_best_fitness = state['g_best_fitness']
+            n_eval = state['n_eval']
+            s_best = state.get('s_best', g_best)
+            s_best_fitness = state.get('s_best_fitness', g_best_fitness)
+            stall = state.get('stall', 0)
+            n_kept = state.get('n_kept', 0)
+            n_restarts = state.get('n_restarts', 0)
+            self.history = state['history']
+            start_time -= state['elapsed_time']
+            first_iteration = self.max_iter + 1 if state['done'] else state['iteration'] + 1
+            log(f"Retomando do checkpoint: iteracao {state['iteration']}, f = {g_best_fitness:.6f}")
         
-        for iteration in range(1, self.max_iter + 1):
-            iter_start = time.time()
+        for iteration in range(first_iteration, self.max_iter + 1):
+            if self._budget_exhausted():
+                log(f"Orcamento esgotado na iteracao {iteration}")
+                break
             
-            for i in range(self.n_particles):
-                r1 = np.random.random(n_dims)
-                r2 = np.random.random(n_dims)
-                
-                cognitive = self.c1 * r1 * (p_best[i] - positions[i])
-                social = self.c2 * r2 * (g_best - positions[i])
-                velocities[i] = self.w * velocities[i] + cognitive + social
-                
-                # Limita velocidade
-                for j in range(n_dims):
-                    low, high = self.bounds[j]
-                    v_max = (high - low) * 0.2
-                    velocities[i, j] = np.clip(velocities[i, j], -v_max, v_max)
-                
-                positions[i] = positions[i] + velocities[i]
-                
-                # Limites de posicao
-                for j in range(n_dims):
-                    low, high = self.bounds[j]
-                    positions[i, j] = np.clip(positions[i, j], low, high)
-                
-                fitness[i] = self.objective_function(positions[i])
-                n_eval += 1
-                
-                if fitness[i] > p_best_fitness[i]:
-                    p_best[i] = positions[i].copy()
-                    p_best_fitness[i] = fitness[i]
-                    
-                    if fitness[i] > g_best_fitness:
-                        g_best = positions[i].copy()
-                        g_best_fitness = fitness[i]
-                        elapsed = time.time() - start_time
-                        log(f"Iter {iteration}: Nova melhor -> f = {g_best_fitness:.6f} (tempo: {elapsed:.2f}s)")
+            iter_start = self._begin_iteration()
+            
+            if self.restart_patience is not None and stall >= self.restart_patience:
+                # Enxame estagnado: a iteracao avalia um novo enxame
+                positions, velocities, fitness, p_best, p_best_fitness, n_kept, n_new = \
+                    yield from self._restart_swarm(p_best, p_best_fitness, n_kept, low, high)
+                n_eval += n_new
+                n_restarts += 1
+                stall = 0
+                s_best_fitness = -np.inf
+                log(f"Iter {iteration}: reinicio {n_restarts} do enxame "
+                    f"({len(positions) - n_kept} particulas, {n_kept} elites)")
+            else:
+                # Os elites (primeiras n_kept posicoes) ficam parados: as
+                # fatias sao vistas, atualizadas no lugar
+                swarm = slice(n_kept, None)
+                n_eval += yield from self._move_and_evaluate(
+                    positions[swarm], velocities[swarm], fitness[swarm],
+                    p_best[swarm], p_best_fitness[swarm], s_best, low, high, v_max)
+            
+            if self.migration is not None:
+                self._receive_migrants(iteration, positions, fitness, p_best, p_best_fitness)
+            
+            swarm_idx = n_kept + np.argmax(p_best_fitness[n_kept:])
+            stall = 0 if p_best_fitness[swarm_idx] > s_best_fitness + self.tol else stall + 1
+            if p_best_fitness[swarm_idx] > s_best_fitness:
+                s_best = p_best[swarm_idx].copy()
+                s_best_fitness = p_best_fitness[swarm_idx]
+            
+            best_idx = np.argmax(p_best_fitness)
+            if p_best_fitness[best_idx] > g_best_fitness:
+                g_best = p_best[best_idx].copy()
+                g_best_fitness = p_best_fitness[best_idx]
+                elapsed = time.time() - start_time
+                log.best(f"Iter {iteration}: Nova melhor -> f = {g_best_fitness:.6f} (tempo: {elapsed:.2f}s)",
+                         iteration=iteration, f=float(g_best_fitness))
             
             elapsed = time.time() - start_time
             if iteration % 10 == 0:
                 log(f"Iter {iteration}: g_best = {g_best_fitness:.6f} (tempo: {elapsed:.2f}s)")
             
-            self.history.append({
-                'iteration': iteration,
-                'g_best': g_best.copy(),
+            self.history.append(iteration=iteration, g_best=g_best,
+                                g_best_fitness=g_best_fitness, elapsed_time=elapsed)
+            self._report_progress(iteration, g_best, g_best_fitness, elapsed, n_eval=n_eval)
+            self._end_iteration(iter_start)
+            
+            # Avaliacoes penalizadas (-inf) e elites nao entram no criterio de convergencia
+            finite = fitness[n_kept:][np.isfinite(fitness[n_kept:])]
+            converged = finite.size > 0 and np.std(finite) < self.tol
+            if converged and self.restart_patience is not None:
+                # Com reinicios, o enxame convergido e reamostrado em vez de parar
+                stall = self.restart_patience
+                converged = False
+            self._save_checkpoint(iteration, {
+                'positions': positions,
+                'velocities': velocities,
+                'fitness': fitness,
+                'p_best': p_best,
+                'p_best_fitness': p_best_fitness,
+                'g_best': g_best,
                 'g_best_fitness': g_best_fitness,
+                'n_eval': n_eval,
+                's_best': s_best,
+                's_best_fitness': s_best_fitness,
+                'stall': stall,
+                'n_kept': n_kept,
+                'n_restarts': n_restarts,
+                'history': self.history,
                 'elapsed_time': elapsed
-            })
+            }, done=converged or iteration == self.max_iter)
             
-            if np.std(fitness) < self.tol:
+            if converged:
                 log(f"Convergencia: std < tol")
                 break
         
@@ -134,6 +266,60 @@ class ParticleSwarm(BaseOptimizer):
         log(f"=== CONCLUIDO ===")
         log(f"Melhor fitness: {g_best_fitness:.6f}")
         log(f"Avaliacoes: {n_eval}")
+        if self.restart_patience is not None:
+            log(f"Reinicios do enxame: {n_restarts}")
+        if self.surrogate is not None:
+            log(f"Surrogate: {self.surrogate.n_screened} candidatos descartados sem avaliacao")
         log(f"TEMPO TOTAL: {total_time:.2f} segundos ({total_time/60:.2f} minutos)")
         
-        return g_best, g_best_fitness, self.history
\ No newline at end of file
+        # Melhores pessoais finais (pontos de partida da busca local no hibrido)
+        self.p_best = p_best
+        self.p_best_fitness = p_best_fitness
+        self.n_restarts = n_restarts
+        
+        self.history.flush()
+        return g_best, g_best_fitness, self.history
+    
+    def _move_and_evaluate(self, positions, velocities, fitness,
+                           p_best, p_best_fitness, s_best, low, high, v_max):
+        """Move o enxame e avalia a nova geracao (gerador), atualizando no
+        lugar as posicoes, velocidades, fitness e melhores pessoais.
+        
+        Retorna o numero de avaliacoes feitas.
+        """
+        n_particles, n_dims = positions.shape
+        
+        # Move todas as particulas usando o melhor do enxame da iteracao anterior
+        if self.vectorized:
+            r1 = np.random.random((n_particles, n_dims))
+            r2 = np.random.random((n_particles, n_dims))
+            
+            velocities[:] = (self.w * velocities
+                             + self.c1 * r1 * (p_best - positions)
+                             + self.c2 * r2 * (s_best - positions))
+            np.clip(velocities, -v_max, v_max, out=velocities)
+            
+            positions += velocities
+            np.clip(positions, low, high, out=positions)
+        else:
+            for i in range(n_particles):
+                r1 = np.random.random(n_dims)
+                r2 = np.random.random(n_dims)
+                
+                cognitive = self.c1 * r1 * (p_best[i] - positions[i])
+                social = self.c2 * r2 * (s_best - positions[i])
+                velocities[i] = self.w * velocities[i] + cognitive + social
+                velocities[i] = np.clip(velocities[i], -v_max, v_max)
+                
+                positions[i] = np.clip(positions[i] + velocities[i], low, high)
+        
+        # Avalia a geracao inteira como um lote concorrente (pontos da rede
+        # ja conhecidos nao sao reavaliados; com surrogate, so as particulas
+        # pre-selecionadas sao avaliadas e as demais ficam com -inf)
+        fitness[:], evaluated = yield from self._screened(positions)
+        
+        # Atualiza melhores pessoais
+        improved = fitness > p_best_fitness
+        p_best[improved] = self._snap(positions)[improved]
+        p_best_fitness[improved] = fitness[improved]
+        return len(evaluated)
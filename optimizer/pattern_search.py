@@ -1,88 +1,217 @@
 # optimizer/pattern_search.py
 import numpy as np
 from optimizer.base_optimizer import BaseOptimizer
-from datetime import datetime
+from optimizer.history import HistoryBuffer, pattern_search_fields
+from optimizer.lattice import integer_step
+from utils.logger import get_logger
 import time
 
-def log(msg):
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    print(f"[{timestamp}] [PS] {msg}")
+log = get_logger("PS")
+
+POLL_MODES = ("opportunistic", "complete", "opportunistic-parallel")
 
 class PatternSearch(BaseOptimizer):
-    """Pattern Search (Hooke-Jeeves)"""
+    """Pattern Search (Hooke-Jeeves)
+
+    Modos de poll:
+      - opportunistic: avalia +delta/-delta dimensao a dimensao e para na
+        primeira melhoria (sequencial, comportamento original)
+      - complete: envia os 2n pontos de uma vez ao avaliador e move para o
+        melhor deles
+      - opportunistic-parallel: envia os 2n pontos de uma vez e aceita a
+        primeira melhoria que terminar, cancelando as avaliacoes pendentes
+
+    Com surrogate, os pontos do poll sao ordenados pelo fitness previsto e,
+    no modo complete, avaliados em duas etapas (ver optimizer.surrogate).
+
+    Com dimensoes inteiras na assinatura, o passo nelas e no minimo 1 e, se
+    todas forem inteiras, a busca converge quando o poll com passo 1 falha.
+    """
+
+    profile_tag = "ps"
 
     def __init__(self, objective_function, x0, delta=1.0, 
-                 delta_min=1e-6, reduction_factor=0.5, **kwargs):
-        super().__init__(objective_function, x0, **kwargs)
+                 delta_min=1e-6, reduction_factor=0.5, poll="opportunistic",
+                 n_threads=None, backend="thread", evaluator=None, f0=None, **kwargs):
+        super().__init__(objective_function, x0, n_threads=n_threads,
+                         backend=backend, evaluator=evaluator, **kwargs)
+        if poll not in POLL_MODES:
+            raise ValueError(f"Modo de poll desconhecido: {poll}")
+        
         self.delta = delta
         self.delta_min = delta_min
         self.reduction_factor = reduction_factor
-        self.history = []
+        self.poll = poll
+        # Fitness ja conhecido de x0 (ex.: vindo da fase PSO): evita reavaliar
+        self.f0 = f0
+        self.history = HistoryBuffer(pattern_search_fields(len(x0)), path=self.history_path)
 
-    def optimize(self):
-        start_time = time.time()
-        log(f"=== INICIANDO PATTERN SEARCH ===")
-        
-        x = np.array(self.x0, dtype=float)
+    def _poll_points(self, x, delta):
+        """Lote (2n, n) com x +/- delta em cada dimensao, na ordem do poll sequencial."""
         n_dims = len(x)
+        steps = np.repeat(np.eye(n_dims), 2, axis=0)
+        steps[1::2] *= -1
+        if self.integer_mask is None:
+            return x + delta * steps
+        step = np.where(self.integer_mask, integer_step(delta), delta)
+        return x + steps * step
+
+    def _poll_order(self, points):
+        """Ordem de avaliacao do poll: a do surrogate, se houver."""
+        if self.surrogate is None:
+            return np.arange(len(points))
+        return self.surrogate.rank(points)
+
+    def _poll_complete(self, x, f_best, delta):
+        """Avalia todos os pontos do poll em um lote e retorna o melhor (gerador)."""
+        points = self._poll_points(x, delta)
+        values, evaluated = yield from self._screened(points)
+        n_eval = len(evaluated)
+        if self.surrogate is not None and values.max() <= f_best:
+            # Os pontos adiados pelo surrogate so sao avaliados se os
+            # escolhidos nao melhorarem
+            rest = np.setdiff1d(np.arange(len(points)), evaluated)
+            values[rest], rest_evaluated = yield from self._screened(points[rest], screen=False)
+            n_eval += len(rest_evaluated)
         
-        f_best = self.objective_function(x)
-        self.history.append({'iteration': 0, 'x': x.copy(), 'f': f_best, 'delta': self.delta})
-        
-        log(f"Fitness inicial: f(x0) = {f_best:.6f}")
+        best = int(np.argmax(values))
+        if values[best] > f_best:
+            return best, points[best], values[best], n_eval
+        return None, None, None, n_eval
 
-        delta = self.delta
-        n_eval = 1
+    def _poll_opportunistic_parallel(self, x, f_best, delta):
+        """Pede os pontos do poll em um lote e aceita a primeira melhoria (gerador).
 
-        for iteration in range(1, self.max_iter + 1):
-            iter_start = time.time()
+        Com optimize(), as avaliacoes rodam em paralelo e as que ainda nao
+        comecaram sao canceladas na primeira melhoria concluida; com
+        ask/tell, vale a primeira melhoria na ordem do poll.
+        """
+        points = self._poll_points(x, delta)
+        order = self._poll_order(points)
+        if self._memo is not None:
+            # Pontos ja avaliados nao sao reenviados
+            for k in order:
+                f_known = self._known_value(points[k])
+                if f_known is not None and f_known > f_best:
+                    return k, points[k], f_known, 0
+        
+        values, evaluated = yield from self._screened(points[order], screen=False,
+                                                      accept_above=f_best)
+        for j in evaluated:
+            if values[j] > f_best:
+                k = order[j]
+                return k, points[k], values[j], len(evaluated)
+        return None, None, None, len(evaluated)
+
+    def _steps(self):
+        start_time = time.time()
+        log(f"=== INICIANDO PATTERN SEARCH ===")
+        
+        state = self._take_resume_state()
+        if state is None:
+            x = self._snap(np.array(self.x0, dtype=float))
+            
+            n_eval = 0
+            if self.f0 is None:
+                values, evaluated = yield from self._screened(x[None], screen=False)
+                f_best = float(values[0])
+                n_eval = len(evaluated)
+            else:
+                f_best = float(self.f0)
+            self.history.append(iteration=0, x=x, f=f_best, delta=self.delta,
+                                elapsed_time=time.time() - start_time)
+            
+            log(f"Fitness inicial: f(x0) = {f_best:.6f}")
+            
+            delta = self.delta
+            first_iteration = 1
+        else:
+            x = state['x']
+            f_best = state['f_best']
+            delta = state['delta']
+            n_eval = state['n_eval']
+            self.history = state['history']
+            start_time -= state['elapsed_time']
+            first_iteration = self.max_iter + 1 if state['done'] else state['iteration'] + 1
+            log(f"Retomando do checkpoint: iteracao {state['iteration']}, f = {f_best:.6f}")
+        
+        for iteration in range(first_iteration, self.max_iter + 1):
+            if self._budget_exhausted():
+                log(f"Orcamento esgotado na iteracao {iteration}")
+                break
+            
+            iter_start = self._begin_iteration()
             improved = False
+            lattice_converged = False
             
-            for i in range(n_dims):
-                if improved:
-                    break
-                
-                for direction in [1, -1]:
-                    x_new = np.copy(x)
-                    x_new[i] += direction * delta
+            if self.poll == "opportunistic":
+                # +delta/-delta dimensao a dimensao (ou na ordem do surrogate)
+                points = self._poll_points(x, delta)
+                for k in self._poll_order(points):
+                    x_new = points[k]
+                    f_new = self._known_value(x_new)
+                    if f_new is None:
+                        # Sem orcamento o ponto nao e avaliado (e nao conta)
+                        values, evaluated = yield from self._screened(x_new[None], screen=False)
+                        f_new = float(values[0])
+                        n_eval += len(evaluated)
                     
-                    f_new = self.objective_function(x_new)
-                    n_eval += 1
-
                     if f_new > f_best:
-                        elapsed = time.time() - start_time
-                        log(f"Iter {iteration}: Melhoria dim {i} -> f = {f_new:.6f} (tempo: {elapsed:.2f}s)")
-                        
-                        x = x_new
-                        f_best = f_new
+                        i = k // 2
                         improved = True
-                        
-                        self.history.append({
-                            'iteration': iteration,
-                            'x': x.copy(),
-                            'f': f_best,
-                            'delta': delta,
-                            'improved': True,
-                            'elapsed_time': elapsed
-                        })
                         break
+            else:
+                if self.poll == "complete":
+                    k, x_new, f_new, n_polled = yield from self._poll_complete(x, f_best, delta)
+                else:
+                    k, x_new, f_new, n_polled = yield from self._poll_opportunistic_parallel(
+                        x, f_best, delta)
+                n_eval += n_polled
+                
+                if k is not None:
+                    i = k // 2
+                    improved = True
 
-            if not improved:
+            if improved:
+                elapsed = time.time() - start_time
+                log.best(f"Iter {iteration}: Melhoria dim {i} -> f = {f_new:.6f} (tempo: {elapsed:.2f}s)",
+                         iteration=iteration, f=float(f_new))
+                
+                x = x_new
+                f_best = f_new
+                
+                self.history.append(iteration=iteration, x=x, f=f_best, delta=delta,
+                                    improved=True, elapsed_time=elapsed)
+            else:
+                # Com todas as dimensoes inteiras, o poll com passo 1 e o menor possivel
+                lattice_converged = (self.integer_mask is not None and self.integer_mask.all()
+                                     and integer_step(delta) == 1)
                 delta *= self.reduction_factor
                 if iteration % 5 == 0:
                     elapsed = time.time() - start_time
                     log(f"Iter {iteration}: Sem melhoria, delta = {delta:.6f} (tempo: {elapsed:.2f}s)")
                 
-                self.history.append({
-                    'iteration': iteration,
-                    'x': x.copy(),
-                    'f': f_best,
-                    'delta': delta,
-                    'improved': False,
-                    'elapsed_time': time.time() - start_time
-                })
-
-            if delta < self.delta_min:
+                self.history.append(iteration=iteration, x=x, f=f_best, delta=delta,
+                                    improved=False, elapsed_time=time.time() - start_time)
+
+            elapsed = time.time() - start_time
+            self._report_progress(iteration, x, f_best, elapsed, n_eval=n_eval, delta=delta)
+            self._end_iteration(iter_start)
+
+            converged = delta < self.delta_min or lattice_converged
+            self._save_checkpoint(iteration, {
+                'x': x,
+                'f_best': f_best,
+                'delta': delta,
+                'n_eval': n_eval,
+                'history': self.history,
+                'elapsed_time': elapsed
+            }, done=converged or iteration == self.max_iter)
+
+            if lattice_converged:
+                log(f"Convergencia: sem melhoria com passo inteiro 1")
+                break
+            if converged:
                 log(f"Convergencia: delta ({delta:.2e}) < delta_min")
                 break
 
@@ -90,6 +219,9 @@ class PatternSearch(BaseOptimizer):
         log(f"=== CONCLUIDO ===")
         log(f"Melhor fitness: {f_best:.6f}")
         log(f"Avaliacoes: {n_eval}")
+        if self.surrogate is not None:
+            log(f"Surrogate: {self.surrogate.n_screened} candidatos adiados ou descartados")
         log(f"TEMPO TOTAL: {total_time:.2f} segundos ({total_time/60:.2f} minutos)")
         
+        self.history.flush()
         return x, f_best, self.history
\ No newline at end of file
@@ -0,0 +1,312 @@
+# optimizer/portfolio.py
+"""
+Portfolio de algoritmos com pool e orcamento compartilhados.
+
+Pattern Search, PSO e Hibrido (e CMA-ES, se pedido) rodam ao mesmo tempo (um thread cada) sobre
+um unico avaliador e um unico orcamento. A cada realloc_interval segundos,
+os workers sao redistribuidos: os algoritmos sao ordenados pela melhora do
+fitness por avaliacao desde a ultima verificacao e o k-esimo recebe peso
+2^-k (no minimo 1 worker cada).
+
+Successive halving: quando o total de avaliacoes passa de
+rung_evals * eta^r, so os ceil(n/eta) melhores algoritmos ativos continuam;
+os demais sao encerrados (param na proxima iteracao e devolvem o melhor
+ponto que tinham). Todos compartilham a memoria de pontos avaliados
+(limitada a memo_size pontos, como no hibrido, sem dimensoes inteiras).
+
+O Pattern Search usa poll complete, para que os 2n pontos de cada poll
+ocupem os workers recebidos.
+"""
+import math
+import threading
+import time
+
+import numpy as np
+
+from optimizer.base_optimizer import BaseOptimizer
+from optimizer.budget import Budget, BudgetShare
+from optimizer.cma_es import CMAES
+from optimizer.evaluator import BaseEvaluator
+from optimizer.hybrid_optimizer import HybridPSOPatternSearch
+from optimizer.memo import MEMO_SIZE, PointMemo
+from optimizer.particle_swarm import ParticleSwarm
+from optimizer.pattern_search import PatternSearch
+from utils.logger import get_logger
+
+log = get_logger("PORTFOLIO")
+
+ALGORITHMS = {
+    'ps': PatternSearch,
+    'pso': ParticleSwarm,
+    'hybrid': HybridPSOPatternSearch,
+    'cma': CMAES
+}
+
+
+class _WorkerAllocator:
+    """Cota de avaliacoes simultaneas de cada algoritmo no pool comum."""
+
+    def __init__(self, names):
+        self.quota = {name: 1 for name in names}
+        self.in_use = {name: 0 for name in names}
+        self._cond = threading.Condition()
+
+    def acquire(self, name):
+        with self._cond:
+            while self.in_use[name] >= self.quota[name]:
+                self._cond.wait()
+            self.in_use[name] += 1
+
+    def release(self, name):
+        with self._cond:
+            self.in_use[name] -= 1
+            self._cond.notify_all()
+
+    def set_quotas(self, quotas):
+        with self._cond:
+            self.quota.update(quotas)
+            self._cond.notify_all()
+
+
+class _AllocatedEvaluator(BaseEvaluator):
+    """Visao do avaliador comum limitada a cota de um algoritmo."""
+
+    def __init__(self, evaluator, allocator, name):
+        self.evaluator = evaluator
+        self.allocator = allocator
+        self.name = name
+
+    @property
+    def n_workers(self):
+        return self.allocator.quota[self.name]
+
+    def submit(self, fn, point):
+        self.allocator.acquire(self.name)
+        try:
+            future = self.evaluator.submit(fn, point)
+        except BaseException:
+            self.allocator.release(self.name)
+            raise
+        future.add_done_callback(lambda _: self.allocator.release(self.name))
+        return future
+
+
+class _Entry:
+    """Estado de um algoritmo do portfolio."""
+
+    def __init__(self, name, share):
+        self.name = name
+        self.optimizer = None
+        self.share = share
+        self.best_f = -np.inf
+        self.best_x = None
+        self.result = None
+        self.error = None
+        self.thread = None
+        # Referencia para a taxa de melhora (ultima verificacao)
+        self.last_f = -np.inf
+        self.last_evals = 0
+        self.rate = 0.0
+
+    @property
+    def active(self):
+        return self.thread.is_alive() and not self.share.stopped
+
+
+class Portfolio(BaseOptimizer):
+    """Executa varios otimizadores sobre o mesmo pool e orcamento (ver modulo)."""
+
+    profile_tag = "portfolio"
+
+    def __init__(self, objective_function, x0, algorithms=("ps", "pso", "hybrid"),
+                 algorithm_params=None, bounds=None, eta=2, rung_evals=None,
+                 realloc_interval=1.0, memo_size=MEMO_SIZE, n_threads=None, backend="thread",
+                 evaluator=None, **kwargs):
+        super().__init__(objective_function, x0, n_threads=n_threads,
+                         backend=backend, evaluator=evaluator, **kwargs)
+        for name in algorithms:
+            if name not in ALGORITHMS:
+                raise ValueError(f"Algoritmo desconhecido no portfolio: {name}")
+
+        self.algorithms = list(algorithms)
+        self.algorithm_params = algorithm_params or {}
+        self.bounds = bounds
+        self.eta = eta
+        self.rung_evals = rung_evals
+        self.realloc_interval = realloc_interval
+        self.memo_size = memo_size
+        self.history = {'algorithms': {}, 'events': []}
+
+    def _default_params(self, name):
+        if name == 'ps':
+            return {'poll': 'complete', 'max_iter': self.max_iter}
+        params = {'bounds': self.bounds}
+        if name in ('pso', 'cma'):
+            params['max_iter'] = self.max_iter
+        else:
+            params['poll'] = 'complete'
+        return params
+
+    def _rung_size(self, budget):
+        """Avaliacoes totais ate a primeira eliminacao."""
+        if self.rung_evals is not None:
+            return self.rung_evals
+        n_rounds = max(1, math.ceil(math.log(len(self.algorithms), self.eta)))
+        if budget.max_evals is not None:
+            return budget.max_evals / self.eta ** n_rounds
+        return 50 * (len(self.x0) + 1)
+
+    def _progress(self, entry):
+        def update(info):
+            if info['best_f'] > entry.best_f:
+                entry.best_f = info['best_f']
+                entry.best_x = np.array(info['best_x'], dtype=float)
+        return update
+
+    def _event(self, start_time, kind, **info):
+        self.history['events'].append({'time': time.time() - start_time, 'event': kind, **info})
+
+    def optimize(self):
+        with self._evaluation_pool() as evaluator:
+            return self._optimize(evaluator)
+
+    def _optimize(self, evaluator):
+        start_time = time.time()
+        log(f"=== INICIANDO PORTFOLIO ===")
+        log(f"Algoritmos: {', '.join(self.algorithms)}, Workers: {evaluator.n_workers}")
+
+        # Sem orcamento definido, um orcamento ilimitado permite encerrar algoritmos
+        budget = self.budget if self.budget is not None else Budget()
+        budget.start()
+        # Com dimensoes inteiras, a memoria da rede (sem limite); senao, os
+        # memo_size pontos mais recentes (0 ou None desativa)
+        memo = self._memo
+        if memo is None and self.memo_size:
+            memo = PointMemo(maxsize=self.memo_size)
+        allocator = _WorkerAllocator(self.algorithms)
+        self._wake = threading.Event()
+
+        entries = []
+        for name in self.algorithms:
+            share = BudgetShare(budget)
+            params = {**self._default_params(name), **self.algorithm_params.get(name, {})}
+            entry = _Entry(name, share)
+            entry.optimizer = ALGORITHMS[name](
+                self.objective_function, self.x0,
+                evaluator=_AllocatedEvaluator(evaluator, allocator, name),
+                budget=share,
+                callback=self._progress(entry),
+                signature=self.signature,
+                tol=self.tol,
+                **params
+            )
+            entry.optimizer._memo = memo
+            entries.append(entry)
+
+        self._allocate(entries, allocator, evaluator.n_workers)
+        for entry in entries:
+            entry.thread = threading.Thread(target=self._run, args=(entry,),
+                                            name=f"portfolio-{entry.name}", daemon=True)
+            entry.thread.start()
+
+        rung = self._rung_size(budget)
+        n_rounds = 0
+        iteration = 0
+        while any(entry.thread.is_alive() for entry in entries):
+            # Acorda a cada realloc_interval ou quando um algoritmo termina
+            self._wake.wait(self.realloc_interval)
+            self._wake.clear()
+            iteration += 1
+
+            self._update_rates(entries)
+            total = sum(entry.share.used_evals for entry in entries)
+            active = [entry for entry in entries if entry.active]
+            if len(active) > 1 and total >= rung * self.eta ** n_rounds:
+                self._halve(active, start_time, total)
+                n_rounds += 1
+            self._allocate(entries, allocator, evaluator.n_workers)
+
+            best = max(entries, key=lambda e: e.best_f)
+            if best.best_x is not None:
+                self._report_progress(iteration, best.best_x, best.best_f, time.time() - start_time,
+                                      n_eval=total, leader=best.name,
+                                      allocation=dict(allocator.quota))
+
+        errors = [entry for entry in entries if entry.error is not None]
+        finished = [entry for entry in entries if entry.result is not None]
+        if not finished:
+            raise RuntimeError(f"Todos os algoritmos do portfolio falharam: {errors[0].error}")
+
+        for entry in entries:
+            status = ('error' if entry.error is not None
+                      else 'stopped' if entry.share.stopped else 'done')
+            record = {'status': status, 'evals': entry.share.used_evals}
+            if entry.result is not None:
+                x, f, history = entry.result
+                record.update(x=x, f=f, history=history)
+            else:
+                record['error'] = entry.error
+            self.history['algorithms'][entry.name] = record
+
+        winner = max(finished, key=lambda e: e.result[1])
+        self.history['winner'] = winner.name
+        self.history['iterations'] = iteration
+        best_x, best_f, _ = winner.result
+        total_time = time.time() - start_time
+        log(f"=== CONCLUIDO ===")
+        log(f"Melhor: {winner.name}, fitness {best_f:.6f}")
+        log(f"Avaliacoes: {sum(entry.share.used_evals for entry in entries)} "
+            f"({', '.join(f'{e.name}: {e.share.used_evals}' for e in entries)})")
+        log(f"TEMPO TOTAL: {total_time:.2f} segundos ({total_time/60:.2f} minutos)")
+        return best_x, best_f, self.history
+
+    def _run(self, entry):
+        try:
+            entry.result = entry.optimizer.optimize()
+            x, f, _ = entry.result
+            if f > entry.best_f:
+                entry.best_f = f
+                entry.best_x = np.asarray(x, dtype=float)
+        except Exception as e:
+            entry.error = f"{type(e).__name__}: {e}"
+            log.error(f"{entry.name} falhou: {entry.error}")
+        finally:
+            self._wake.set()
+
+    def _update_rates(self, entries):
+        """Melhora do fitness por avaliacao desde a ultima verificacao."""
+        for entry in entries:
+            spent = entry.share.used_evals - entry.last_evals
+            if spent <= 0:
+                continue
+            if np.isfinite(entry.last_f):
+                entry.rate = (entry.best_f - entry.last_f) / spent
+            entry.last_f = entry.best_f
+            entry.last_evals = entry.share.used_evals
+
+    def _halve(self, active, start_time, total):
+        """Mantem os ceil(n/eta) melhores algoritmos ativos e encerra os demais."""
+        ranked = sorted(active, key=lambda e: e.best_f, reverse=True)
+        n_keep = max(1, math.ceil(len(ranked) / self.eta))
+        for entry in ranked[n_keep:]:
+            entry.share.stop()
+            log(f"{entry.name} encerrado apos {total} avaliacoes (f = {entry.best_f:.6f})")
+            self._event(start_time, 'stopped', algorithm=entry.name, f=float(entry.best_f),
+                        n_eval=total)
+
+    def _allocate(self, entries, allocator, n_workers):
+        """Divide os workers entre os algoritmos ativos, favorecendo os que mais melhoram."""
+        active = [entry for entry in entries if entry.thread is None or entry.active]
+        if not active:
+            return
+        ranked = sorted(active, key=lambda e: (e.rate, e.best_f), reverse=True)
+        if any(entry.rate > 0 for entry in ranked):
+            weights = [2.0 ** -k for k in range(len(ranked))]
+        else:
+            # Sem melhora recente (ou no inicio): divisao igual
+            weights = [1.0] * len(ranked)
+        total = sum(weights)
+        quotas = {entry.name: 1 for entry in entries}
+        for entry, weight in zip(ranked, weights):
+            quotas[entry.name] = max(1, int(round(n_workers * weight / total)))
+        allocator.set_quotas(quotas)
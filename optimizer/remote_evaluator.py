@@ -0,0 +1,340 @@
+# optimizer/remote_evaluator.py
+"""
+Avaliador remoto: distribui as avaliacoes entre nos que rodam o servidor
+de avaliacao (objective/eval_server.py, protocolo descrito la).
+
+- conexoes TCP persistentes (connections_per_node por no), com varios
+  pedidos em voo por conexao
+- balanceamento: cada pedido vai para o no com menor ocupacao relativa a
+  sua capacidade (workers informados no hello)
+- heartbeats: cada conexao recebe pings; um no com alguma conexao sem
+  resposta em heartbeat_timeout e considerado morto, seus pedidos em voo
+  voltam para a fila e o no e reconectado periodicamente
+- se todos os nos falharem em max_reconnects tentativas seguidas de
+  conexao, os pedidos pendentes (e os novos, ate algum no voltar) falham
+  com NodesUnavailable em vez de esperar indefinidamente
+
+- token: segredo enviado no hello, exigido pelos nos iniciados com token
+
+O objetivo e sempre o configurado nos nos; a funcao passada a submit/map
+e ignorada. Para que todas as avaliacoes (inclusive as sequenciais) sejam
+remotas, use evaluate como funcao objetivo:
+
+    remote = RemoteEvaluator(["no1:9000", "no2:9000"])
+    ps = PatternSearch(remote.evaluate, x0, evaluator=remote, poll="complete")
+"""
+import itertools
+import json
+import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from optimizer.evaluator import BaseEvaluator
+from utils.logger import get_logger
+
+log = get_logger("REMOTE")
+
+
+class NodesUnavailable(RuntimeError):
+    """Nenhum no de avaliacao alcancavel apos max_reconnects tentativas."""
+
+
+def _parse_address(node):
+    if isinstance(node, str):
+        host, port = node.rsplit(":", 1)
+        return host, int(port)
+    return tuple(node)
+
+
+class _Task:
+    __slots__ = ("id", "params", "future")
+
+    def __init__(self, task_id, params, future):
+        self.id = task_id
+        self.params = params
+        self.future = future
+
+
+class _Connection:
+    """Conexao persistente com um no; uma thread le as respostas."""
+
+    def __init__(self, node, sock):
+        self.node = node
+        self.sock = sock
+        self.rfile = sock.makefile("rb")
+        self.in_flight = {}
+        self.write_lock = threading.Lock()
+        self.alive = True
+        self.last_seen = time.monotonic()
+
+    def send(self, message):
+        data = (json.dumps(message) + "\n").encode("utf-8")
+        with self.write_lock:
+            self.sock.sendall(data)
+
+    def close(self):
+        self.alive = False
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+class _Node:
+    def __init__(self, address):
+        self.address = address
+        self.name = f"{address[0]}:{address[1]}"
+        self.capacity = 1
+        self.connections = []
+        self.alive = False
+        self.next_retry = 0.0
+        # Tentativas de conexao seguidas que falharam
+        self.failures = 0
+
+    @property
+    def load(self):
+        return sum(len(c.in_flight) for c in self.connections)
+
+
+class RemoteEvaluator(BaseEvaluator):
+    """Avaliador que envia os pontos para servidores de avaliacao remotos."""
+
+    def __init__(self, nodes, connections_per_node=1, heartbeat_interval=2.0,
+                 heartbeat_timeout=10.0, reconnect_interval=5.0, connect_timeout=5.0,
+                 max_reconnects=3, token=None):
+        self.nodes = [_Node(_parse_address(n)) for n in nodes]
+        if not self.nodes:
+            raise ValueError("Nenhum no de avaliacao informado")
+        self.connections_per_node = connections_per_node
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.reconnect_interval = reconnect_interval
+        self.connect_timeout = connect_timeout
+        self.max_reconnects = max_reconnects
+        self.token = token
+
+        self._pending = deque()
+        self._ids = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+        self.requeued = 0
+
+        for node in self.nodes:
+            self._connect(node)
+        if not any(node.alive for node in self.nodes):
+            log.warning("Nenhum no de avaliacao disponivel; tentando reconectar")
+
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="remote-dispatch",
+                                            daemon=True)
+        self._dispatcher.start()
+        self._heartbeat = threading.Thread(target=self._heartbeat_loop, name="remote-heartbeat",
+                                           daemon=True)
+        self._heartbeat.start()
+
+    @property
+    def n_workers(self):
+        """Capacidade total dos nos vivos (avaliacoes simultaneas)."""
+        return max(1, sum(node.capacity for node in self.nodes if node.alive))
+
+    # Conexoes
+
+    def _connect(self, node):
+        """Abre as conexoes com o no e le sua capacidade (hello)."""
+        connections = []
+        try:
+            for _ in range(self.connections_per_node):
+                sock = socket.create_connection(node.address, timeout=self.connect_timeout)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                connection = _Connection(node, sock)
+                hello = {'op': 'hello'}
+                if self.token is not None:
+                    hello['token'] = self.token
+                connection.send(hello)
+                reply = json.loads(connection.rfile.readline() or b"null")
+                if not reply or reply.get('op') != 'hello':
+                    raise OSError((reply or {}).get('error', "handshake invalido"))
+                sock.settimeout(None)
+                connections.append(connection)
+                node.capacity = int(reply.get('workers', 1))
+        except (OSError, ValueError) as e:
+            for connection in connections:
+                connection.close()
+            node.next_retry = time.monotonic() + self.reconnect_interval
+            node.failures += 1
+            log.debug(f"Falha ao conectar em {node.name}: {e}")
+            if self._unreachable():
+                self._fail_pending()
+            return False
+
+        with self._cond:
+            node.connections = connections
+            node.alive = True
+            node.failures = 0
+            self._cond.notify_all()
+        for connection in connections:
+            threading.Thread(target=self._read_loop, args=(connection,),
+                             name=f"remote-read-{node.name}", daemon=True).start()
+        log(f"No conectado: {node.name} ({node.capacity} workers)")
+        return True
+
+    def _mark_dead(self, node, reason):
+        """Fecha as conexoes do no e devolve seus pedidos para a fila."""
+        with self._cond:
+            if not node.alive:
+                return
+            node.alive = False
+            node.next_retry = time.monotonic() + self.reconnect_interval
+            orphans = []
+            for connection in node.connections:
+                orphans.extend(connection.in_flight.values())
+                connection.in_flight.clear()
+                connection.close()
+            node.connections = []
+            # Os pedidos devolvidos passam na frente dos novos
+            for task in reversed(orphans):
+                self._pending.appendleft(task)
+            self.requeued += len(orphans)
+            self._cond.notify_all()
+        log.warning(f"No {node.name} indisponivel ({reason}); {len(orphans)} avaliacoes reenfileiradas")
+
+    def _unreachable(self):
+        """True se nenhum no esta vivo e todos esgotaram as reconexoes."""
+        return all(not node.alive and node.failures >= self.max_reconnects
+                   for node in self.nodes)
+
+    def _fail_pending(self):
+        """Falha os pedidos na fila: nao ha no para executa-los."""
+        with self._cond:
+            pending = list(self._pending)
+            self._pending.clear()
+        for task in pending:
+            if not task.future.done():
+                task.future.set_exception(NodesUnavailable(
+                    f"Nenhum no de avaliacao disponivel apos {self.max_reconnects} tentativas"))
+        if pending:
+            log.error(f"Nenhum no de avaliacao disponivel; {len(pending)} avaliacoes falharam")
+
+    def _read_loop(self, connection):
+        node = connection.node
+        try:
+            for line in connection.rfile:
+                message = json.loads(line.decode("utf-8"))
+                connection.last_seen = time.monotonic()
+                if 'id' not in message:
+                    continue
+                with self._cond:
+                    task = connection.in_flight.pop(message['id'], None)
+                    self._cond.notify_all()
+                if task is None:
+                    continue
+                if 'error' in message:
+                    task.future.set_exception(RuntimeError(message['error']))
+                else:
+                    task.future.set_result(message['value'])
+        except (OSError, ValueError):
+            pass
+        if connection.alive:
+            self._mark_dead(node, "conexao encerrada")
+
+    # Despacho
+
+    def _pick_connection(self):
+        """Conexao do no vivo menos ocupado que ainda tem capacidade livre."""
+        best = None
+        best_load = None
+        for node in self.nodes:
+            if not node.alive or not node.connections:
+                continue
+            load = node.load / node.capacity
+            if node.load < node.capacity and (best_load is None or load < best_load):
+                best = node
+                best_load = load
+        if best is None:
+            return None
+        return min(best.connections, key=lambda c: len(c.in_flight))
+
+    def _dispatch_loop(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        return
+                    connection = self._pick_connection() if self._pending else None
+                    if connection is not None:
+                        break
+                    self._cond.wait(0.5)
+                task = self._pending.popleft()
+                # Pedidos reenfileirados ja estao em execucao
+                if not task.future.running() and not task.future.set_running_or_notify_cancel():
+                    continue
+                connection.in_flight[task.id] = task
+
+            try:
+                connection.send({'op': 'eval', 'id': task.id, 'params': task.params})
+            except OSError:
+                self._mark_dead(connection.node, "falha ao enviar")
+
+    def _heartbeat_loop(self):
+        while not self._closed:
+            time.sleep(self.heartbeat_interval)
+            now = time.monotonic()
+            for node in self.nodes:
+                if node.alive:
+                    # Todas as conexoes: uma secundaria meio aberta tambem e detectada
+                    connections = list(node.connections)
+                    if any(now - c.last_seen > self.heartbeat_timeout for c in connections):
+                        self._mark_dead(node, "sem resposta ao heartbeat")
+                        continue
+                    try:
+                        for connection in connections:
+                            connection.send({'op': 'ping'})
+                    except OSError:
+                        self._mark_dead(node, "falha no heartbeat")
+                elif now >= node.next_retry and not self._closed:
+                    self._connect(node)
+
+    # Interface BaseEvaluator
+
+    def submit(self, fn, point):
+        future = Future()
+        params = [float(v) for v in point]
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Avaliador encerrado")
+            if self._unreachable():
+                future.set_exception(NodesUnavailable("Nenhum no de avaliacao disponivel"))
+                return future
+            self._pending.append(_Task(next(self._ids), params, future))
+            self._cond.notify_all()
+        return future
+
+    def evaluate(self, point):
+        """Avalia um ponto remotamente (use como funcao objetivo)."""
+        return self.submit(None, point).result()
+
+    def stats(self):
+        return {
+            'nodes': {node.name: {'alive': node.alive, 'capacity': node.capacity,
+                                  'in_flight': node.load} for node in self.nodes},
+            'pending': len(self._pending),
+            'requeued': self.requeued
+        }
+
+    def shutdown(self, wait=True):
+        with self._cond:
+            self._closed = True
+            pending = list(self._pending)
+            self._pending.clear()
+            self._cond.notify_all()
+        for task in pending:
+            task.future.cancel()
+        for node in self.nodes:
+            for connection in node.connections:
+                connection.close()
+                for task in connection.in_flight.values():
+                    if not task.future.done():
+                        task.future.set_exception(RuntimeError("Avaliador encerrado"))
+            node.alive = False
@@ -0,0 +1,80 @@
+# optimizer/sampling.py
+"""
+Amostras iniciais que cobrem a caixa de limites.
+
+- uniform: pontos independentes (deixa regioes vazias e aglomerados)
+- lhs: hipercubo latino, exatamente um ponto em cada uma das n faixas de
+  cada dimensao
+- halton: sequencia de baixa discrepancia (estilo Sobol) com deslocamento
+  aleatorio, para que execucoes diferentes nao repitam os mesmos pontos
+
+Todos usam o gerador global do NumPy (o mesmo salvo nos checkpoints).
+"""
+import numpy as np
+
+# Primos das bases da sequencia de Halton (uma por dimensao)
+_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61,
+           67, 71, 73, 79, 83, 89, 97, 101, 103, 107, 109, 113)
+
+
+def _primes(n):
+    """Os n primeiros primos."""
+    if n <= len(_PRIMES):
+        return list(_PRIMES[:n])
+    primes = list(_PRIMES)
+    candidate = primes[-1] + 2
+    while len(primes) < n:
+        if all(candidate % p for p in primes if p * p <= candidate):
+            primes.append(candidate)
+        candidate += 2
+    return primes
+
+
+def uniform(n, n_dims):
+    """n pontos independentes em [0, 1)^n_dims (sorteados por dimensao)."""
+    u = np.empty((n, n_dims))
+    for j in range(n_dims):
+        u[:, j] = np.random.random(n)
+    return u
+
+
+def latin_hypercube(n, n_dims):
+    """n pontos em [0, 1)^n_dims, um em cada faixa de largura 1/n por dimensao."""
+    u = (np.random.random((n, n_dims)) + np.arange(n)[:, None]) / n
+    for j in range(n_dims):
+        u[:, j] = u[np.random.permutation(n), j]
+    return u
+
+
+def halton(n, n_dims):
+    """n pontos da sequencia de Halton em [0, 1)^n_dims, com deslocamento aleatorio."""
+    index = np.arange(1, n + 1)
+    u = np.empty((n, n_dims))
+    for j, base in enumerate(_primes(n_dims)):
+        # Radical inverso de index na base (digitos espelhados apos a virgula)
+        value = np.zeros(n)
+        factor = 1.0 / base
+        k = index.copy()
+        while k.any():
+            value += (k % base) * factor
+            k //= base
+            factor /= base
+        u[:, j] = value
+    # Deslocamento de Cranley-Patterson: mantem a baixa discrepancia
+    return (u + np.random.random(n_dims)) % 1.0
+
+
+SAMPLERS = {
+    'uniform': uniform,
+    'lhs': latin_hypercube,
+    'halton': halton
+}
+
+
+def sample(method, n, low, high):
+    """n pontos na caixa [low, high] pelo metodo escolhido."""
+    if method not in SAMPLERS:
+        raise ValueError(f"Metodo de amostragem desconhecido: {method}")
+    low = np.asarray(low, dtype=float)
+    high = np.asarray(high, dtype=float)
+    return low + SAMPLERS[method](n, len(low)) * (high - low)
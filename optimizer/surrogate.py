@@ -0,0 +1,209 @@
+# optimizer/surrogate.py
+"""
+Modelo substituto (surrogate) para pre-selecionar candidatos.
+
+O surrogate e treinado com os pontos ja avaliados pelo objetivo real e
+estima o fitness dos novos candidatos; so os mais promissores sao enviados
+ao programa externo.
+
+Modelos:
+  - rbf: funcao de base radial cubica com cauda linear (interpola os pontos)
+  - quadratic: regressao quadratica completa por minimos quadrados
+
+Uso nos otimizadores (parametro surrogate=):
+  - PSO: de cada geracao, avalia exatamente a fracao keep com melhor
+    previsao mais uma fracao explore sorteada entre as demais; as particulas
+    descartadas nao atualizam p_best nesta iteracao
+  - Pattern Search: o poll e ordenado pela previsao; no modo complete, os
+    pontos restantes so sao avaliados se os escolhidos nao melhorarem (a
+    reducao do passo continua exigindo o poll completo)
+
+Avaliacoes penalizadas (-inf, ex.: timeout) nao entram no treino.
+"""
+import numpy as np
+
+MODELS = ("rbf", "quadratic")
+
+
+def _normalize(X, low, scale):
+    return (X - low) / scale
+
+
+def _pairwise_distances(A, B):
+    diff = A[:, None, :] - B[None, :, :]
+    return np.sqrt(np.sum(diff * diff, axis=2))
+
+
+def _quadratic_features(Z):
+    n, d = Z.shape
+    iu, ju = np.triu_indices(d)
+    return np.hstack([np.ones((n, 1)), Z, Z[:, iu] * Z[:, ju]])
+
+
+class RBFModel:
+    """RBF cubica phi(r) = r^3 com polinomio linear, em coordenadas normalizadas."""
+
+    def __init__(self, regularization=1e-8):
+        self.regularization = regularization
+
+    @staticmethod
+    def min_points(n_dims):
+        return 2 * (n_dims + 1)
+
+    def fit(self, Z, y):
+        n, d = Z.shape
+        phi = _pairwise_distances(Z, Z) ** 3
+        P = np.hstack([np.ones((n, 1)), Z])
+        A = np.zeros((n + d + 1, n + d + 1))
+        A[:n, :n] = phi + self.regularization * np.eye(n)
+        A[:n, n:] = P
+        A[n:, :n] = P.T
+        rhs = np.concatenate([y, np.zeros(d + 1)])
+        try:
+            coef = np.linalg.solve(A, rhs)
+        except np.linalg.LinAlgError:
+            coef = np.linalg.lstsq(A, rhs, rcond=None)[0]
+        self.centers = Z
+        self.weights = coef[:n]
+        self.poly = coef[n:]
+
+    def predict(self, Z):
+        phi = _pairwise_distances(Z, self.centers) ** 3
+        return phi @ self.weights + self.poly[0] + Z @ self.poly[1:]
+
+
+class QuadraticModel:
+    """Regressao quadratica (termos cruzados incluidos) por minimos quadrados."""
+
+    def __init__(self, regularization=1e-8):
+        self.regularization = regularization
+
+    @staticmethod
+    def min_points(n_dims):
+        return (n_dims + 1) * (n_dims + 2) // 2 + 1
+
+    def fit(self, Z, y):
+        F = _quadratic_features(Z)
+        # Ridge pequeno para manter o sistema bem condicionado
+        A = F.T @ F + self.regularization * np.eye(F.shape[1])
+        self.coef = np.linalg.lstsq(A, F.T @ y, rcond=None)[0]
+
+    def predict(self, Z):
+        return _quadratic_features(Z) @ self.coef
+
+
+class Surrogate:
+    """Arquivo de pontos avaliados + modelo usado para ranquear candidatos.
+
+    keep: fracao de cada lote avaliada pelo ranking do modelo
+    explore: fracao adicional sorteada entre os pontos descartados
+    min_points: pontos avaliados antes de o modelo ser usado (padrao
+        depende do modelo e da dimensao)
+    max_points: treina com os max_points pontos mais recentes
+    """
+
+    def __init__(self, model="rbf", keep=0.5, explore=0.1, min_points=None, max_points=500):
+        if model not in MODELS:
+            raise ValueError(f"Modelo de surrogate desconhecido: {model}")
+        self.model_name = model
+        self.keep = keep
+        self.explore = explore
+        self.min_points = min_points
+        self.max_points = max_points
+
+        self.X = None
+        self.y = None
+        self.n_screened = 0
+        self.n_fits = 0
+        self._model = None
+
+    def observe(self, points, values):
+        """Adiciona pontos avaliados pelo objetivo real (valores finitos)."""
+        points = np.atleast_2d(np.asarray(points, dtype=float))
+        values = np.atleast_1d(np.asarray(values, dtype=float))
+        finite = np.isfinite(values)
+        if not finite.any():
+            return
+        if self.X is None:
+            self.X = points[finite].copy()
+            self.y = values[finite].copy()
+        else:
+            self.X = np.vstack([self.X, points[finite]])
+            self.y = np.concatenate([self.y, values[finite]])
+        self._model = None
+
+    @property
+    def ready(self):
+        """True se ja ha pontos suficientes para treinar o modelo."""
+        if self.X is None:
+            return False
+        n_dims = self.X.shape[1]
+        model_cls = RBFModel if self.model_name == "rbf" else QuadraticModel
+        return len(self.X) >= (self.min_points or model_cls.min_points(n_dims))
+
+    def _fit(self):
+        X = self.X[-self.max_points:]
+        y = self.y[-self.max_points:]
+        # Pontos repetidos tornam o sistema da RBF singular
+        X, unique = np.unique(X, axis=0, return_index=True)
+        y = y[unique]
+
+        self._low = X.min(axis=0)
+        scale = X.max(axis=0) - self._low
+        self._scale = np.where(scale > 0, scale, 1.0)
+        self._y_mean = y.mean()
+        y_std = y.std()
+        self._y_std = y_std if y_std > 0 else 1.0
+
+        self._model = RBFModel() if self.model_name == "rbf" else QuadraticModel()
+        self._model.fit(_normalize(X, self._low, self._scale), (y - self._y_mean) / self._y_std)
+        self.n_fits += 1
+
+    def predict(self, points):
+        """Fitness estimado de cada ponto (treina o modelo se preciso)."""
+        if self._model is None:
+            self._fit()
+        Z = _normalize(np.atleast_2d(np.asarray(points, dtype=float)), self._low, self._scale)
+        return self._model.predict(Z) * self._y_std + self._y_mean
+
+    def rank(self, points):
+        """Indices dos pontos do mais para o menos promissor."""
+        if not self.ready:
+            return np.arange(len(points))
+        return np.argsort(-self.predict(points), kind="stable")
+
+    def select(self, points):
+        """Indices (crescentes) dos pontos a avaliar pelo objetivo real."""
+        n = len(points)
+        if not self.ready or n == 0:
+            return np.arange(n)
+
+        order = self.rank(points)
+        n_keep = max(1, int(np.ceil(self.keep * n)))
+        chosen = order[:n_keep]
+        rest = order[n_keep:]
+        n_explore = min(len(rest), int(np.ceil(self.explore * n)))
+        if n_explore:
+            chosen = np.concatenate([chosen, np.random.choice(rest, n_explore, replace=False)])
+
+        self.n_screened += n - len(chosen)
+        return np.sort(chosen)
+
+    def stats(self):
+        return {
+            'model': self.model_name,
+            'n_points': 0 if self.X is None else len(self.X),
+            'n_screened': self.n_screened,
+            'n_fits': self.n_fits
+        }
+
+
+def create_surrogate(spec):
+    """Surrogate a partir da configuracao: None/False, True ou dict de parametros."""
+    if not spec:
+        return None
+    if spec is True:
+        return Surrogate()
+    if isinstance(spec, str):
+        return Surrogate(model=spec)
+    return Surrogate(**spec)
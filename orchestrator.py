@@ -0,0 +1,207 @@
+# orchestrator.py
+"""
+Orquestrador headless: executa os algoritmos em processos separados
+(multiprocessing) e recebe progresso e resultados por pipes.
+
+Nao depende de janelas nem de arquivos temporarios, e funciona em
+Windows e Linux.
+"""
+import os
+import signal
+import sys
+import time
+import traceback
+import importlib
+import multiprocessing
+from multiprocessing.connection import wait
+
+# Garante que o diretório atual está no path (tambem nos processos filhos)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+from utils.logger import flush as flush_logs
+
+# Espera (s) entre o SIGTERM e o SIGKILL ao cancelar um worker
+TERMINATE_GRACE = 2.0
+
+# Nome do algoritmo -> modulo worker com run(config, progress)
+ALGORITHMS = {
+    'ps': 'run_pattern_search',
+    'pso': 'run_particle_swarm',
+    'hybrid': 'run_hybrid',
+    'cma': 'run_cma_es',
+    'portfolio': 'run_portfolio'
+}
+
+
+def _worker(name, config, conn, quiet):
+    """Processo filho: executa o algoritmo e envia mensagens pelo pipe."""
+    if hasattr(os, 'setsid'):
+        # Grupo de processos proprio: ao cancelar, o orquestrador encerra
+        # tambem os filhos (programa externo, modo servidor, pools)
+        os.setsid()
+    if quiet:
+        sys.stdout = open(os.devnull, 'w')
+
+    def progress(info):
+        conn.send(('progress', name, info))
+
+    try:
+        module = importlib.import_module(ALGORITHMS[name])
+        result = module.run(config, progress=progress)
+        conn.send(('result', name, result))
+    except Exception:
+        conn.send(('error', name, traceback.format_exc()))
+    finally:
+        # Processos do multiprocessing nao executam atexit: esvazia a fila de logs
+        flush_logs()
+        conn.close()
+
+
+def _terminate(process):
+    """Encerra o worker e os processos que ele criou.
+
+    Em POSIX, o grupo do worker recebe SIGTERM e, se algum processo nao
+    terminar em TERMINATE_GRACE segundos, SIGKILL. Sem grupos de processos
+    (Windows), so o worker e encerrado.
+    """
+    if not hasattr(os, 'killpg'):
+        process.terminate()
+        process.join()
+        return
+
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+    except ProcessLookupError:
+        # O worker ainda nao criou o seu grupo
+        process.terminate()
+    process.join(TERMINATE_GRACE)
+    try:
+        # Filhos que ignoraram o SIGTERM (o grupo sobrevive ao worker)
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+    process.join()
+
+
+def _best_of(results, progress):
+    """Melhor (nome, f, x) entre resultados finais e progresso parcial."""
+    candidates = []
+    for name, res in results.items():
+        candidates.append((name, res['f'], res['x']))
+    for name, info in progress.items():
+        if name not in results:
+            candidates.append((name, info['best_f'], info['best_x']))
+
+    if not candidates:
+        return None
+    return max(candidates, key=lambda c: c[1])
+
+
+def run_algorithms(configs, deadline=None, target_fitness=None, quiet=False,
+                   on_progress=None):
+    """Executa os algoritmos em paralelo e retorna a comparacao.
+
+    configs: {'ps': {...}, 'pso': {...}, 'hybrid': {...}} (subconjunto de ALGORITHMS)
+    deadline: tempo maximo em segundos para toda a execucao
+    target_fitness: ao ser atingido por qualquer algoritmo, os demais sao cancelados
+    on_progress(name, info): chamado para cada mensagem de progresso
+    """
+    ctx = multiprocessing.get_context('spawn')
+    start_time = time.time()
+
+    processes = {}
+    connections = {}
+    for name, config in configs.items():
+        if name not in ALGORITHMS:
+            raise ValueError(f"Algoritmo desconhecido: {name}")
+        parent_conn, child_conn = ctx.Pipe(duplex=False)
+        process = ctx.Process(target=_worker, args=(name, config, child_conn, quiet),
+                              name=f"po-{name}")
+        process.start()
+        child_conn.close()
+        processes[name] = process
+        connections[parent_conn] = name
+
+    results = {}
+    progress = {}
+    status = {name: 'running' for name in configs}
+    errors = {}
+    target_reached_by = None
+
+    def reached(value):
+        return target_fitness is not None and value >= target_fitness
+
+    try:
+        while connections:
+            timeout = None
+            if deadline is not None:
+                timeout = deadline - (time.time() - start_time)
+                if timeout <= 0:
+                    break
+
+            for conn in wait(list(connections), timeout=timeout):
+                name = connections[conn]
+                try:
+                    kind, _, payload = conn.recv()
+                except EOFError:
+                    # Processo terminou sem enviar resultado
+                    del connections[conn]
+                    if status[name] == 'running':
+                        status[name] = 'error'
+                        errors.setdefault(name, f"Processo terminou (exitcode {processes[name].exitcode})")
+                    continue
+
+                if kind == 'progress':
+                    progress[name] = payload
+                    if on_progress is not None:
+                        on_progress(name, payload)
+                    if target_reached_by is None and reached(payload['best_f']):
+                        target_reached_by = name
+                elif kind == 'result':
+                    payload['execution_time'] = payload.get('execution_time', time.time() - start_time)
+                    results[name] = payload
+                    status[name] = 'done'
+                    if target_reached_by is None and reached(payload['f']):
+                        target_reached_by = name
+                elif kind == 'error':
+                    status[name] = 'error'
+                    errors[name] = payload
+
+            if target_reached_by is not None:
+                break
+    except BaseException:
+        # Interrupcao (ex.: Ctrl+C): os workers estao em outro grupo de
+        # processos e nao a recebem
+        for process in processes.values():
+            if process.is_alive():
+                _terminate(process)
+        raise
+
+    # Cancela o que ainda estiver rodando (deadline ou alvo atingido)
+    for name, process in processes.items():
+        if process.is_alive() and status[name] == 'running':
+            _terminate(process)
+            if target_reached_by is None:
+                status[name] = 'timeout'
+            elif name == target_reached_by:
+                status[name] = 'target_reached'
+            else:
+                status[name] = 'cancelled'
+        process.join()
+
+    for conn in connections:
+        conn.close()
+
+    best = _best_of(results, progress)
+
+    return {
+        'results': results,
+        'progress': progress,
+        'status': status,
+        'errors': errors,
+        'best': None if best is None else {'algorithm': best[0], 'f': best[1], 'x': best[2]},
+        'target_reached_by': target_reached_by,
+        'elapsed_time': time.time() - start_time
+    }
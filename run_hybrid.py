@@ -5,6 +5,7 @@ Script para executar Hybrid Optimizer em processo separado
 import sys
 import os
 import json
+import time
 
 # Adiciona o diretório ATUAL ao path (não o pai)
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -12,23 +13,31 @@ if current_dir not in sys.path:
     sys.path.insert(0, current_dir)
 
 from optimizer import HybridPSOPatternSearch
+from optimizer.evaluator import create_evaluator
+from optimizer.surrogate import create_surrogate
+from optimizer.budget import Budget
+from optimizer.memo import MEMO_SIZE
 from objective import run_external_program
 import objective.external_program as ext_prog
+from utils.profiler import profiler
+from utils.logger import configure as configure_logging, flush as flush_logs
 
-def main():
-    if len(sys.argv) < 2:
-        print("Erro: Configuracao nao fornecida")
-        sys.exit(1)
-    
-    # Carrega configuracao
-    config_file = sys.argv[1]
-    with open(config_file, 'r') as f:
-        config = json.load(f)
+def run(config, progress=None):
+    """Executa Hybrid PSO + Pattern Search com a configuracao e retorna o resultado.
+
+    progress(info) e chamado ao fim de cada iteracao.
+    """
+    start_time = time.time()
     
     # Configura programa externo
-    ext_prog.program_path = config['program_path']
-    ext_prog.program_signature = config['signature']
-    ext_prog.num_params = config['num_params']
+    ext_prog.configure_from_config(config)
+    
+    # Nivel e formato dos logs (log_level / log_format)
+    configure_logging(level=config.get('log_level'), format=config.get('log_format'))
+    
+    # Instrumentacao opcional (profile_json / profile_prometheus)
+    if config.get('profile_json') or config.get('profile_prometheus'):
+        profiler.enable()
     
     x0 = config['x0']
     bounds = config.get('bounds')
@@ -42,30 +51,74 @@ def main():
     print("="*70)
     print()
     
+    # Pool de avaliacao: n_threads workers (threads ou processos)
+    evaluator = create_evaluator(
+        config.get('n_threads'),
+        backend=config.get('backend', 'thread'),
+        initializer=ext_prog.configure_from_config,
+        initargs=(config,),
+        nodes=config.get('remote_nodes'),
+        token=config.get('remote_token')
+    )
+    
+    # backend 'remote': o programa roda nos servidores de avaliacao
+    # (eval_server.py), inclusive as avaliacoes sequenciais
+    objective = evaluator.evaluate if config.get('backend') == 'remote' else run_external_program
+    
+    # Orcamento opcional de avaliacoes (max_evals) e de tempo (max_time, s)
+    budget = None
+    if config.get('max_evals') or config.get('max_time'):
+        budget = Budget(max_evals=config.get('max_evals'), max_time=config.get('max_time'))
+    
     hyb = HybridPSOPatternSearch(
-        objective_function=run_external_program,
+        objective_function=objective,
         x0=x0,
         n_particles=config.get('n_particles', 20),
         pso_max_iter=config.get('pso_max_iter', 20),
         ps_max_iter=config.get('ps_max_iter', 20),
+        n_starts=config.get('n_starts', 1),
+        start_distance=config.get('start_distance'),
+        init=config.get('init', 'uniform'),
+        global_phase=config.get('global_phase', 'pso'),
+        popsize=config.get('popsize'),
+        memo_size=config.get('memo_size', MEMO_SIZE),
         bounds=bounds,
-        n_threads=config.get('n_threads')
+        n_threads=config.get('n_threads'),
+        evaluator=evaluator,
+        callback=progress,
+        checkpoint_path=config.get('checkpoint_path'),
+        checkpoint_every=config.get('checkpoint_every', 1),
+        history_path=config.get('history_path'),
+        budget=budget,
+        surrogate=create_surrogate(config.get('surrogate')),
+        signature=config.get('signature')
     )
     
-    hyb_x, hyb_f, hyb_hist = hyb.optimize()
+    # Retoma do checkpoint, se pedido e existente
+    resume = config.get('resume') and os.path.exists(config.get('checkpoint_path') or '')
+    
+    with evaluator:
+        if resume:
+            hyb_x, hyb_f, hyb_hist = hyb.resume()
+        else:
+            hyb_x, hyb_f, hyb_hist = hyb.optimize()
+    
+    # Logs pendentes saem antes do resumo final
+    flush_logs()
+    
+    if config.get('profile_json'):
+        profiler.export_json(config['profile_json'])
+    if config.get('profile_prometheus'):
+        profiler.export_prometheus(config['profile_prometheus'])
     
-    # Salva resultado
     result = {
         'algorithm': 'Hybrid',
         'x': hyb_x.tolist(),
         'f': float(hyb_f),
-        'iterations': hyb_hist['phases'][-1]['iterations']
+        'iterations': hyb_hist['phases'][-1]['iterations'],
+        'execution_time': time.time() - start_time
     }
     
-    result_file = config['result_file']
-    with open(result_file, 'w') as f:
-        json.dump(result, f, indent=2)
-    
     print()
     print("="*70)
     print("  HYBRID - CONCLUIDO")
@@ -73,9 +126,31 @@ def main():
     print(f"Fitness final: {hyb_f:.6f}")
     print(f"Solucao: {hyb_x}")
     print(f"Fases completadas: {len(hyb_hist['phases'])}")
+    cache_stats = ext_prog.get_cache_stats()
+    if cache_stats:
+        # Com processos (ou nos remotos), cada worker tem o seu cache
+        scope = " (so o processo principal)" if config.get('backend') in ('process', 'remote') else ""
+        print(f"Cache{scope}: {cache_stats['hits']} hits, {cache_stats['misses']} execucoes")
     print("="*70)
     
-    input("\nPressione Enter para fechar esta janela...")
+    return result
+
+def main():
+    if len(sys.argv) < 2:
+        print("Erro: Configuracao nao fornecida")
+        sys.exit(1)
+    
+    # Carrega configuracao
+    config_file = sys.argv[1]
+    with open(config_file, 'r') as f:
+        config = json.load(f)
+    
+    result = run(config)
+    
+    # Salva resultado
+    result_file = config['result_file']
+    with open(result_file, 'w') as f:
+        json.dump(result, f, indent=2)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -5,6 +5,7 @@ Script para executar Particle Swarm em processo separado
 import sys
 import os
 import json
+import time
 
 # Adiciona o diretório ATUAL ao path (não o pai)
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -12,23 +13,31 @@ if current_dir not in sys.path:
     sys.path.insert(0, current_dir)
 
 from optimizer import ParticleSwarm
+from optimizer.island_swarm import IslandParticleSwarm
+from optimizer.evaluator import create_evaluator
+from optimizer.surrogate import create_surrogate
+from optimizer.budget import Budget
 from objective import run_external_program
 import objective.external_program as ext_prog
+from utils.profiler import profiler
+from utils.logger import configure as configure_logging, flush as flush_logs
 
-def main():
-    if len(sys.argv) < 2:
-        print("Erro: Configuracao nao fornecida")
-        sys.exit(1)
-    
-    # Carrega configuracao
-    config_file = sys.argv[1]
-    with open(config_file, 'r') as f:
-        config = json.load(f)
+def run(config, progress=None):
+    """Executa Particle Swarm com a configuracao e retorna o resultado.
+
+    progress(info) e chamado ao fim de cada iteracao.
+    """
+    start_time = time.time()
     
     # Configura programa externo
-    ext_prog.program_path = config['program_path']
-    ext_prog.program_signature = config['signature']
-    ext_prog.num_params = config['num_params']
+    ext_prog.configure_from_config(config)
+    
+    # Nivel e formato dos logs (log_level / log_format)
+    configure_logging(level=config.get('log_level'), format=config.get('log_format'))
+    
+    # Instrumentacao opcional (profile_json / profile_prometheus)
+    if config.get('profile_json') or config.get('profile_prometheus'):
+        profiler.enable()
     
     x0 = config['x0']
     bounds = config.get('bounds')
@@ -42,30 +51,102 @@ def main():
     print("="*70)
     print()
     
-    # Executa PSO
-    pso = ParticleSwarm(
-        objective_function=run_external_program,
-        x0=x0,
-        n_particles=config.get('n_particles', 20),
-        bounds=bounds,
-        max_iter=config.get('max_iter', 30),
-        n_threads=config.get('n_threads')
+    # Pool de avaliacao: n_threads workers (threads ou processos)
+    evaluator = create_evaluator(
+        config.get('n_threads'),
+        backend=config.get('backend', 'thread'),
+        initializer=ext_prog.configure_from_config,
+        initargs=(config,),
+        nodes=config.get('remote_nodes'),
+        token=config.get('remote_token')
     )
     
-    pso_x, pso_f, pso_hist = pso.optimize()
+    # backend 'remote': o programa roda nos servidores de avaliacao
+    # (eval_server.py), inclusive as avaliacoes sequenciais
+    objective = evaluator.evaluate if config.get('backend') == 'remote' else run_external_program
+    
+    # Orcamento opcional de avaliacoes (max_evals) e de tempo (max_time, s)
+    budget = None
+    if config.get('max_evals') or config.get('max_time'):
+        budget = Budget(max_evals=config.get('max_evals'), max_time=config.get('max_time'))
+    
+    # Executa PSO
+    if config.get('n_islands', 1) > 1:
+        # Modo ilhas: cada ilha e um processo com o seu proprio enxame
+        pso = IslandParticleSwarm(
+            objective_function=run_external_program,
+            x0=x0,
+            n_islands=config['n_islands'],
+            n_particles=config.get('n_particles', 20),
+            init=config.get('init', 'uniform'),
+            restart_patience=config.get('restart_patience'),
+            n_elites=config.get('n_elites', 1),
+            restart_growth=config.get('restart_growth', 1.0),
+            max_particles=config.get('max_particles'),
+            bounds=bounds,
+            max_iter=config.get('max_iter', 30),
+            migration_interval=config.get('migration_interval', 10),
+            n_migrants=config.get('n_migrants', 2),
+            topology=config.get('topology', 'ring'),
+            initializer=ext_prog.configure_from_config,
+            initargs=(config,),
+            # Rejeitados pelo modo ilhas (erro claro em vez de ignorados)
+            backend=config.get('backend', 'thread'),
+            checkpoint_path=config.get('checkpoint_path'),
+            callback=progress,
+            history_path=config.get('history_path'),
+            budget=budget,
+            surrogate=create_surrogate(config.get('surrogate')),
+            signature=config.get('signature')
+        )
+    else:
+        pso = ParticleSwarm(
+            objective_function=objective,
+            x0=x0,
+            n_particles=config.get('n_particles', 20),
+            init=config.get('init', 'uniform'),
+            restart_patience=config.get('restart_patience'),
+            n_elites=config.get('n_elites', 1),
+            restart_growth=config.get('restart_growth', 1.0),
+            max_particles=config.get('max_particles'),
+            bounds=bounds,
+            max_iter=config.get('max_iter', 30),
+            n_threads=config.get('n_threads'),
+            evaluator=evaluator,
+            callback=progress,
+            checkpoint_path=config.get('checkpoint_path'),
+            checkpoint_every=config.get('checkpoint_every', 1),
+            history_path=config.get('history_path'),
+            budget=budget,
+            surrogate=create_surrogate(config.get('surrogate')),
+            signature=config.get('signature')
+        )
+    
+    # Retoma do checkpoint, se pedido e existente
+    resume = config.get('resume') and os.path.exists(config.get('checkpoint_path') or '')
+    
+    with evaluator:
+        if resume:
+            pso_x, pso_f, pso_hist = pso.resume()
+        else:
+            pso_x, pso_f, pso_hist = pso.optimize()
+    
+    # Logs pendentes saem antes do resumo final
+    flush_logs()
+    
+    if config.get('profile_json'):
+        profiler.export_json(config['profile_json'])
+    if config.get('profile_prometheus'):
+        profiler.export_prometheus(config['profile_prometheus'])
     
-    # Salva resultado
     result = {
         'algorithm': 'Particle Swarm',
         'x': pso_x.tolist(),
         'f': float(pso_f),
-        'iterations': len(pso_hist)
+        'iterations': len(pso_hist),
+        'execution_time': time.time() - start_time
     }
     
-    result_file = config['result_file']
-    with open(result_file, 'w') as f:
-        json.dump(result, f, indent=2)
-    
     print()
     print("="*70)
     print("  PARTICLE SWARM - CONCLUIDO")
@@ -73,9 +154,31 @@ def main():
     print(f"Fitness final: {pso_f:.6f}")
     print(f"Solucao: {pso_x}")
     print(f"Iteracoes: {len(pso_hist)}")
+    cache_stats = ext_prog.get_cache_stats()
+    if cache_stats:
+        # Com processos (ou nos remotos), cada worker tem o seu cache
+        scope = " (so o processo principal)" if config.get('backend') in ('process', 'remote') else ""
+        print(f"Cache{scope}: {cache_stats['hits']} hits, {cache_stats['misses']} execucoes")
     print("="*70)
     
-    input("\nPressione Enter para fechar esta janela...")
+    return result
+
+def main():
+    if len(sys.argv) < 2:
+        print("Erro: Configuracao nao fornecida")
+        sys.exit(1)
+    
+    # Carrega configuracao
+    config_file = sys.argv[1]
+    with open(config_file, 'r') as f:
+        config = json.load(f)
+    
+    result = run(config)
+    
+    # Salva resultado
+    result_file = config['result_file']
+    with open(result_file, 'w') as f:
+        json.dump(result, f, indent=2)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
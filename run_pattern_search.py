@@ -5,6 +5,7 @@ Script para executar Pattern Search em processo separado
 import sys
 import os
 import json
+import time
 
 # Adiciona o diretório ATUAL ao path (não o pai)
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -12,23 +13,30 @@ if current_dir not in sys.path:
     sys.path.insert(0, current_dir)
 
 from optimizer import PatternSearch
+from optimizer.evaluator import create_evaluator
+from optimizer.surrogate import create_surrogate
+from optimizer.budget import Budget
 from objective import run_external_program
 import objective.external_program as ext_prog
+from utils.profiler import profiler
+from utils.logger import configure as configure_logging, flush as flush_logs
 
-def main():
-    if len(sys.argv) < 2:
-        print("Erro: Configuracao nao fornecida")
-        sys.exit(1)
-    
-    # Carrega configuracao
-    config_file = sys.argv[1]
-    with open(config_file, 'r') as f:
-        config = json.load(f)
+def run(config, progress=None):
+    """Executa Pattern Search com a configuracao e retorna o resultado.
+
+    progress(info) e chamado ao fim de cada iteracao.
+    """
+    start_time = time.time()
     
     # Configura programa externo
-    ext_prog.program_path = config['program_path']
-    ext_prog.program_signature = config['signature']
-    ext_prog.num_params = config['num_params']
+    ext_prog.configure_from_config(config)
+    
+    # Nivel e formato dos logs (log_level / log_format)
+    configure_logging(level=config.get('log_level'), format=config.get('log_format'))
+    
+    # Instrumentacao opcional (profile_json / profile_prometheus)
+    if config.get('profile_json') or config.get('profile_prometheus'):
+        profiler.enable()
     
     x0 = config['x0']
     
@@ -40,29 +48,68 @@ def main():
     print("="*70)
     print()
     
+    # Pool de avaliacao: n_threads workers para o poll paralelo
+    evaluator = create_evaluator(
+        config.get('n_threads'),
+        backend=config.get('backend', 'thread'),
+        initializer=ext_prog.configure_from_config,
+        initargs=(config,),
+        nodes=config.get('remote_nodes'),
+        token=config.get('remote_token')
+    )
+    
+    # backend 'remote': o programa roda nos servidores de avaliacao
+    # (eval_server.py), inclusive as avaliacoes sequenciais
+    objective = evaluator.evaluate if config.get('backend') == 'remote' else run_external_program
+    
+    # Orcamento opcional de avaliacoes (max_evals) e de tempo (max_time, s)
+    budget = None
+    if config.get('max_evals') or config.get('max_time'):
+        budget = Budget(max_evals=config.get('max_evals'), max_time=config.get('max_time'))
+    
     # Executa Pattern Search
     ps = PatternSearch(
-    objective_function=run_external_program,
+    objective_function=objective,
     x0=x0,
     delta=1.0,
     delta_min=1e-6,
-    max_iter=config.get('max_iter', 50)
+    poll=config.get('poll', 'opportunistic'),
+    max_iter=config.get('max_iter', 50),
+    evaluator=evaluator,
+    callback=progress,
+    checkpoint_path=config.get('checkpoint_path'),
+    checkpoint_every=config.get('checkpoint_every', 1),
+    history_path=config.get('history_path'),
+    budget=budget,
+    surrogate=create_surrogate(config.get('surrogate')),
+    signature=config.get('signature')
 )
     
-    ps_x, ps_f, ps_hist = ps.optimize()
+    # Retoma do checkpoint, se pedido e existente
+    resume = config.get('resume') and os.path.exists(config.get('checkpoint_path') or '')
+    
+    with evaluator:
+        if resume:
+            ps_x, ps_f, ps_hist = ps.resume()
+        else:
+            ps_x, ps_f, ps_hist = ps.optimize()
+    
+    # Logs pendentes saem antes do resumo final
+    flush_logs()
+    
+    if config.get('profile_json'):
+        profiler.export_json(config['profile_json'])
+    if config.get('profile_prometheus'):
+        profiler.export_prometheus(config['profile_prometheus'])
     
-    # Salva resultado
     result = {
         'algorithm': 'Pattern Search',
         'x': ps_x.tolist(),
         'f': float(ps_f),
-        'iterations': len(ps_hist)
+        'iterations': len(ps_hist),
+        'execution_time': time.time() - start_time
     }
     
-    result_file = config['result_file']
-    with open(result_file, 'w') as f:
-        json.dump(result, f, indent=2)
-    
     print()
     print("="*70)
     print("  PATTERN SEARCH - CONCLUIDO")
@@ -70,9 +117,31 @@ def main():
     print(f"Fitness final: {ps_f:.6f}")
     print(f"Solucao: {ps_x}")
     print(f"Iteracoes: {len(ps_hist)}")
+    cache_stats = ext_prog.get_cache_stats()
+    if cache_stats:
+        # Com processos (ou nos remotos), cada worker tem o seu cache
+        scope = " (so o processo principal)" if config.get('backend') in ('process', 'remote') else ""
+        print(f"Cache{scope}: {cache_stats['hits']} hits, {cache_stats['misses']} execucoes")
     print("="*70)
     
-    input("\nPressione Enter para fechar esta janela...")
+    return result
+
+def main():
+    if len(sys.argv) < 2:
+        print("Erro: Configuracao nao fornecida")
+        sys.exit(1)
+    
+    # Carrega configuracao
+    config_file = sys.argv[1]
+    with open(config_file, 'r') as f:
+        config = json.load(f)
+    
+    result = run(config)
+    
+    # Salva resultado
+    result_file = config['result_file']
+    with open(result_file, 'w') as f:
+        json.dump(result, f, indent=2)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,148 @@
+# run_portfolio.py
+"""
+Script para executar o portfolio (PS + PSO + Hibrido com pool e orcamento
+compartilhados) em processo separado
+"""
+import sys
+import os
+import json
+import time
+
+# Adiciona o diretório ATUAL ao path (não o pai)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+from optimizer.portfolio import Portfolio
+from optimizer.evaluator import create_evaluator
+from optimizer.budget import Budget
+from optimizer.memo import MEMO_SIZE
+from objective import run_external_program
+import objective.external_program as ext_prog
+from utils.profiler import profiler
+from utils.logger import configure as configure_logging, flush as flush_logs
+
+def run(config, progress=None):
+    """Executa o portfolio com a configuracao e retorna o resultado.
+
+    progress(info) e chamado a cada redistribuicao dos workers.
+    config['algorithm_params'] traz os parametros de cada algoritmo
+    ({'ps': {...}, 'pso': {...}, 'hybrid': {...}}).
+    """
+    start_time = time.time()
+
+    # Configura programa externo
+    ext_prog.configure_from_config(config)
+
+    # Nivel e formato dos logs (log_level / log_format)
+    configure_logging(level=config.get('log_level'), format=config.get('log_format'))
+
+    # Instrumentacao opcional (profile_json / profile_prometheus)
+    if config.get('profile_json') or config.get('profile_prometheus'):
+        profiler.enable()
+
+    x0 = config['x0']
+    algorithms = config.get('algorithms', ['ps', 'pso', 'hybrid'])
+
+    print("="*70)
+    print("  PORTFOLIO (PS + PSO + HYBRID)")
+    print("="*70)
+    print(f"Parametros: {config['num_params']}")
+    print(f"Ponto inicial: {x0}")
+    print(f"Algoritmos: {', '.join(algorithms)}")
+    print("="*70)
+    print()
+
+    # Pool de avaliacao unico, dividido dinamicamente entre os algoritmos
+    evaluator = create_evaluator(
+        config.get('n_threads'),
+        backend=config.get('backend', 'thread'),
+        initializer=ext_prog.configure_from_config,
+        initargs=(config,),
+        nodes=config.get('remote_nodes'),
+        token=config.get('remote_token')
+    )
+
+    # backend 'remote': o programa roda nos servidores de avaliacao
+    # (eval_server.py), inclusive as avaliacoes sequenciais
+    objective = evaluator.evaluate if config.get('backend') == 'remote' else run_external_program
+
+    # Orcamento comum de avaliacoes (max_evals) e de tempo (max_time, s)
+    budget = None
+    if config.get('max_evals') or config.get('max_time'):
+        budget = Budget(max_evals=config.get('max_evals'), max_time=config.get('max_time'))
+
+    portfolio = Portfolio(
+        objective_function=objective,
+        x0=x0,
+        algorithms=algorithms,
+        algorithm_params=config.get('algorithm_params'),
+        bounds=config.get('bounds'),
+        eta=config.get('eta', 2),
+        rung_evals=config.get('rung_evals'),
+        realloc_interval=config.get('realloc_interval', 1.0),
+        memo_size=config.get('memo_size', MEMO_SIZE),
+        max_iter=config.get('max_iter', 100),
+        evaluator=evaluator,
+        callback=progress,
+        budget=budget,
+        signature=config.get('signature')
+    )
+
+    with evaluator:
+        best_x, best_f, history = portfolio.optimize()
+
+    # Logs pendentes saem antes do resumo final
+    flush_logs()
+
+    if config.get('profile_json'):
+        profiler.export_json(config['profile_json'])
+    if config.get('profile_prometheus'):
+        profiler.export_prometheus(config['profile_prometheus'])
+
+    result = {
+        'algorithm': 'Portfolio',
+        'x': best_x.tolist(),
+        'f': float(best_f),
+        'iterations': history['iterations'],
+        'execution_time': time.time() - start_time,
+        'winner': history['winner'],
+        'evals': {name: record['evals'] for name, record in history['algorithms'].items()}
+    }
+
+    print()
+    print("="*70)
+    print("  PORTFOLIO - CONCLUIDO")
+    print("="*70)
+    print(f"Fitness final: {best_f:.6f} ({history['winner']})")
+    print(f"Solucao: {best_x}")
+    for name, record in history['algorithms'].items():
+        print(f"  {name}: {record['status']}, {record['evals']} avaliacoes")
+    cache_stats = ext_prog.get_cache_stats()
+    if cache_stats:
+        # Com processos (ou nos remotos), cada worker tem o seu cache
+        scope = " (so o processo principal)" if config.get('backend') in ('process', 'remote') else ""
+        print(f"Cache{scope}: {cache_stats['hits']} hits, {cache_stats['misses']} execucoes")
+    print("="*70)
+
+    return result
+
+def main():
+    if len(sys.argv) < 2:
+        print("Erro: Configuracao nao fornecida")
+        sys.exit(1)
+
+    # Carrega configuracao
+    config_file = sys.argv[1]
+    with open(config_file, 'r') as f:
+        config = json.load(f)
+
+    result = run(config)
+
+    # Salva resultado
+    result_file = config['result_file']
+    with open(result_file, 'w') as f:
+        json.dump(result, f, indent=2)
+
+if __name__ == "__main__":
+    main()
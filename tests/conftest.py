@@ -0,0 +1,85 @@
+# tests/conftest.py
+"""Configuracao comum dos testes (python -m pytest -q na raiz do projeto)."""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from optimizer import HybridPSOPatternSearch, ParticleSwarm, PatternSearch, batch_objective
+from optimizer.cma_es import CMAES
+from utils.logger import configure as configure_logging
+
+configure_logging(level="WARNING", background=False)
+
+
+@batch_objective
+def rastrigin(X):
+    return -(10 * X.shape[1] + np.sum(X**2 - 10 * np.cos(2 * np.pi * X), axis=1))
+
+
+@batch_objective
+def rosenbrock(X):
+    return -np.sum(100 * (X[:, 1:] - X[:, :-1]**2)**2 + (1 - X[:, :-1])**2, axis=1)
+
+
+BOUNDS = [(-5.12, 5.12)] * 4
+
+# Configuracoes pequenas de cada otimizador: nome -> (objetivo, construtor)
+OPTIMIZERS = {
+    'pso': (rastrigin, lambda f, **k: ParticleSwarm(f, [1.0] * 4, n_particles=8, max_iter=40,
+                                                    bounds=BOUNDS, init='halton',
+                                                    restart_patience=5, n_elites=2,
+                                                    restart_growth=1.5, **k)),
+    'ps': (rastrigin, lambda f, **k: PatternSearch(f, [1.3] * 4, max_iter=40, **k)),
+    'ps_complete': (rastrigin, lambda f, **k: PatternSearch(f, [1.3] * 4, max_iter=40,
+                                                            poll='complete', **k)),
+    'ps_parallel': (rastrigin, lambda f, **k: PatternSearch(f, [1.3] * 4, max_iter=40,
+                                                            poll='opportunistic-parallel', **k)),
+    'cma': (rosenbrock, lambda f, **k: CMAES(f, [3.0] * 4, bounds=BOUNDS, max_iter=40, **k)),
+    'hybrid': (rosenbrock, lambda f, **k: HybridPSOPatternSearch(f, [3.0] * 4, bounds=BOUNDS,
+                                                                 n_particles=10, pso_max_iter=15,
+                                                                 ps_max_iter=30, n_starts=3, **k)),
+}
+
+
+def make_optimizer(name, objective=None, **kwargs):
+    """Cria o otimizador `name` de OPTIMIZERS (objetivo padrao do caso se omitido)."""
+    default, build = OPTIMIZERS[name]
+    return build(objective or default, **kwargs)
+
+
+@pytest.fixture(params=sorted(OPTIMIZERS))
+def optimizer_factory(request):
+    """Fabrica parametrizada por otimizador: factory(**opcoes) -> otimizador.
+
+    factory.name e factory.objective identificam o caso em teste.
+    """
+    def factory(**kwargs):
+        return make_optimizer(request.param, **kwargs)
+    factory.name = request.param
+    factory.objective = OPTIMIZERS[request.param][0]
+    return factory
+
+
+class Stop(Exception):
+    """Interrompe uma execucao a partir do callback de progresso."""
+
+
+def stop_at(iteration, phase=None):
+    """Callback que interrompe a execucao na iteracao (e fase) indicada."""
+    def callback(info):
+        if phase is not None and not info.get('phase', '').startswith(phase):
+            return
+        if info['iteration'] == iteration:
+            raise Stop()
+    return callback
+
+
+@pytest.fixture(autouse=True)
+def seeded():
+    np.random.seed(0)
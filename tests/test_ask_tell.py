@@ -0,0 +1,75 @@
+# tests/test_ask_tell.py
+"""Interface ask/tell: mesmo resultado que optimize() com a mesma semente."""
+import asyncio
+
+import numpy as np
+import pytest
+
+from conftest import make_optimizer, rastrigin
+from optimizer import IslandParticleSwarm, PatternSearch
+from optimizer.budget import Budget
+
+
+def test_ask_tell_matches_optimize(optimizer_factory):
+    factory = optimizer_factory
+    np.random.seed(0)
+    ref_x, ref_f, _ = factory().optimize()
+
+    np.random.seed(0)
+    optimizer = factory()
+    order = np.random.RandomState(9)
+    while True:
+        X = optimizer.ask()
+        if X is None:
+            break
+        # Quem avalia pode calcular os pontos em qualquer ordem
+        perm = order.permutation(len(X))
+        values = np.empty(len(X))
+        values[perm] = factory.objective(X[perm])
+        optimizer.tell(values)
+
+    assert optimizer.done
+    x, f, _ = optimizer.result
+    assert f == ref_f
+    assert np.array_equal(x, ref_x)
+
+
+def test_ask_tell_respects_budget():
+    budget = Budget(max_evals=25)
+    optimizer = PatternSearch(rastrigin, [1.3] * 4, max_iter=40, poll='complete', budget=budget)
+    told = 0
+    while True:
+        X = optimizer.ask()
+        if X is None:
+            break
+        optimizer.tell(rastrigin(X))
+        told += len(X)
+    assert told == budget.used_evals == 25
+
+
+def test_tell_errors():
+    optimizer = PatternSearch(rastrigin, [1.3] * 4)
+    with pytest.raises(RuntimeError):
+        optimizer.tell([1.0])
+    optimizer.ask()
+    with pytest.raises(ValueError):
+        optimizer.tell([1.0, 2.0])
+
+
+def test_islands_do_not_support_ask():
+    with pytest.raises(NotImplementedError):
+        IslandParticleSwarm(rastrigin, [1.0] * 2, n_islands=2).ask()
+
+
+def test_optimize_async_matches_optimize():
+    np.random.seed(0)
+    ref_x, ref_f, _ = make_optimizer('ps_complete').optimize()
+
+    async def objective(x):
+        await asyncio.sleep(0)
+        return float(rastrigin(np.atleast_2d(x))[0])
+
+    np.random.seed(0)
+    x, f, _ = asyncio.run(make_optimizer('ps_complete').optimize_async(objective, 8))
+    assert f == ref_f
+    assert np.array_equal(x, ref_x)
@@ -0,0 +1,89 @@
+# tests/test_checkpoint.py
+"""Retomada de checkpoint: o resultado deve ser identico ao da execucao sem interrupcao."""
+import numpy as np
+import pytest
+
+from conftest import Stop, make_optimizer, stop_at
+from optimizer import batch_objective
+
+
+class Failure(Exception):
+    """Falha do objetivo no meio de uma iteracao."""
+
+
+def _failing(objective, after):
+    """Objetivo que falha ao passar de `after` pontos avaliados."""
+    seen = [0]
+
+    @batch_objective
+    def failing(X):
+        seen[0] += len(X)
+        if seen[0] > after:
+            raise Failure()
+        return objective(X)
+    return failing
+
+
+def _reference(factory):
+    """Execucao sem interrupcao: (x, f, proximo numero aleatorio global)."""
+    np.random.seed(1)
+    x, f, _ = factory().optimize()
+    return x, f, np.random.rand()
+
+
+def test_resume_restores_rng_state(tmp_path, optimizer_factory):
+    ref_x, ref_f, ref_next = _reference(optimizer_factory)
+
+    checkpoint = str(tmp_path / "run.ckpt")
+    np.random.seed(1)
+    with pytest.raises(Stop):
+        optimizer_factory(checkpoint_path=checkpoint, callback=stop_at(3)).optimize()
+
+    # Outra semente: a retomada precisa restaurar o estado aleatorio do checkpoint
+    np.random.seed(123)
+    x, f, _ = optimizer_factory(checkpoint_path=checkpoint).resume()
+    assert f == ref_f
+    assert np.array_equal(x, ref_x)
+    assert np.random.rand() == ref_next
+
+
+def test_resume_discards_partial_iteration(tmp_path, optimizer_factory):
+    ref_x, ref_f, _ = _reference(optimizer_factory)
+
+    # Falha no meio de uma iteracao, iteracoes depois do ultimo checkpoint
+    checkpoint = str(tmp_path / "run.ckpt")
+    np.random.seed(1)
+    with pytest.raises(Failure):
+        optimizer_factory(objective=_failing(optimizer_factory.objective, 70),
+                          checkpoint_path=checkpoint, checkpoint_every=4).optimize()
+
+    np.random.seed(123)
+    x, f, _ = optimizer_factory(checkpoint_path=checkpoint).resume()
+    assert f == ref_f
+    assert np.array_equal(x, ref_x)
+
+
+@pytest.mark.parametrize("name, stop", [
+    ('pso', stop_at(17)),  # depois de reinicios e com elites guardadas
+    ('hybrid', stop_at(5, phase='Pattern Search')),  # fase e partida em andamento
+])
+def test_resume_restores_phase_state(tmp_path, name, stop):
+    ref_x, ref_f, _ = _reference(lambda **k: make_optimizer(name, **k))
+
+    checkpoint = str(tmp_path / "run.ckpt")
+    np.random.seed(1)
+    with pytest.raises(Stop):
+        make_optimizer(name, checkpoint_path=checkpoint, callback=stop).optimize()
+
+    x, f, _ = make_optimizer(name, checkpoint_path=checkpoint).resume()
+    assert f == ref_f
+    assert np.array_equal(x, ref_x)
+
+
+def test_resume_of_finished_run_returns_result(tmp_path):
+    checkpoint = str(tmp_path / "run.ckpt")
+    np.random.seed(1)
+    ref_x, ref_f, _ = make_optimizer('ps', checkpoint_path=checkpoint).optimize()
+    x, f, _ = make_optimizer('ps', checkpoint_path=checkpoint).resume()
+    assert f == ref_f
+    assert np.array_equal(x, ref_x)
@@ -0,0 +1,32 @@
+# tests/test_cma_es.py
+"""CMA-ES: contagem de avaliacoes com orcamento."""
+import pytest
+
+from conftest import rosenbrock
+from optimizer.budget import Budget
+from optimizer.cma_es import CMAES
+
+BOUNDS = [(-5.0, 5.0)] * 4
+
+
+def _run(budget):
+    reported = []
+    CMAES(rosenbrock, [3.0] * 4, bounds=BOUNDS, max_iter=50, popsize=6, budget=budget,
+          callback=lambda info: reported.append(info['n_eval'])).optimize()
+    return reported
+
+
+@pytest.mark.parametrize("max_evals", [1, 4, 13, 40])
+def test_reported_evaluations_match_budget(max_evals):
+    budget = Budget(max_evals=max_evals)
+    reported = _run(budget)
+    assert budget.used_evals == max_evals
+    assert reported[-1] == max_evals
+
+
+def test_initial_point_refused_by_budget_is_not_counted():
+    # Orcamento compartilhado ja esgotado por outro otimizador
+    budget = Budget(max_evals=5)
+    budget.reserve(5)
+    assert _run(budget) == [0]
+    assert budget.used_evals == 5
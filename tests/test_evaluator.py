@@ -0,0 +1,38 @@
+# tests/test_evaluator.py
+"""Pool de avaliacao criado pelo proprio otimizador."""
+import numpy as np
+
+from optimizer import ParticleSwarm, PatternSearch
+
+# Configurado so pelo initializer, em cada processo do pool
+_offset = None
+
+
+def _configure(offset):
+    global _offset
+    _offset = offset
+
+
+def shifted_sphere(x):
+    return _offset - float(np.sum(np.asarray(x) ** 2))
+
+
+def test_process_backend_runs_initializer():
+    # Sem configuracao no processo principal: cada worker depende do initializer
+    _configure(None)
+    ps = PatternSearch(shifted_sphere, [1.0] * 3, max_iter=5, poll='complete', n_threads=2,
+                       backend='process', initializer=_configure, initargs=(100.0,))
+    _, f, _ = ps.optimize()
+    assert f > 97.0
+
+
+def test_thread_and_process_backends_agree():
+    results = []
+    for backend in ("thread", "process"):
+        np.random.seed(0)
+        _configure(10.0 if backend == "thread" else None)
+        pso = ParticleSwarm(shifted_sphere, [1.0] * 3, n_particles=6, max_iter=5,
+                            bounds=[(-2, 2)] * 3, n_threads=2, backend=backend,
+                            initializer=_configure, initargs=(10.0,))
+        results.append(pso.optimize()[1])
+    assert results[0] == results[1]
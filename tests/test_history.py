@@ -0,0 +1,58 @@
+# tests/test_history.py
+"""HistoryBuffer: crescimento em memoria, gravacao em disco e checkpoint."""
+import pickle
+
+import numpy as np
+
+from optimizer.history import HistoryBuffer, pso_fields
+
+
+def _fill(history, start, stop):
+    for i in range(start, stop):
+        history.append(iteration=i, g_best=[i, -i], g_best_fitness=float(i))
+
+
+def test_in_memory_buffer_doubles():
+    history = HistoryBuffer(pso_fields(2), chunk_size=4)
+    _fill(history, 0, 9)
+    assert len(history) == 9
+    assert len(history._buffer) == 16
+    assert history[-1]['iteration'] == 8
+    assert np.array_equal(history.records['g_best_fitness'], np.arange(9.0))
+
+
+def test_on_disk_records_match(tmp_path):
+    path = str(tmp_path / "h.npy")
+    history = HistoryBuffer(pso_fields(2), chunk_size=4, path=path)
+    _fill(history, 0, 10)
+    history.flush()
+    records = np.load(path, mmap_mode="r")
+    assert len(records) == 10
+    assert np.array_equal(records['iteration'], np.arange(10))
+    assert history[3]['g_best'].tolist() == [3.0, -3.0]
+
+
+def test_setstate_in_memory_keeps_appending():
+    history = HistoryBuffer(pso_fields(2), chunk_size=4)
+    _fill(history, 0, 6)
+    restored = pickle.loads(pickle.dumps(history))
+    _fill(restored, 6, 11)
+    assert [r['iteration'] for r in restored] == list(range(11))
+
+
+def test_setstate_truncates_records_written_after_checkpoint(tmp_path):
+    path = str(tmp_path / "h.npy")
+    history = HistoryBuffer(pso_fields(2), chunk_size=4, path=path)
+    _fill(history, 0, 6)
+    state = pickle.dumps(history)
+
+    # A execucao continua (e grava) depois do checkpoint e e interrompida
+    _fill(history, 6, 20)
+    history.flush()
+    assert len(np.load(path, mmap_mode="r")) == 20
+
+    restored = pickle.loads(state)
+    assert len(restored) == 6
+    assert len(np.load(path, mmap_mode="r")) == 6
+    _fill(restored, 6, 9)
+    assert [r['iteration'] for r in restored] == list(range(9))
@@ -0,0 +1,35 @@
+# tests/test_island_swarm.py
+"""PSO em ilhas: divisao dos workers e orcamento."""
+import pytest
+
+from conftest import rastrigin
+from optimizer import IslandParticleSwarm
+from optimizer.budget import Budget
+
+BOUNDS = [(-5.12, 5.12)] * 3
+
+
+@pytest.mark.parametrize("n_threads, expected", [(8, 4), (3, 1), (1, 1), (None, None)])
+def test_threads_are_split_between_islands(n_threads, expected):
+    islands = IslandParticleSwarm(rastrigin, [1.0] * 3, n_islands=2, n_threads=n_threads,
+                                  bounds=BOUNDS)
+    assert islands._island_params()['n_threads'] == expected
+
+
+def test_island_evaluations_count_in_budget():
+    budget = Budget(max_evals=240)
+    islands = IslandParticleSwarm(rastrigin, [1.0] * 3, n_islands=2, n_particles=10,
+                                  max_iter=1000, bounds=BOUNDS, seed=3, budget=budget)
+    islands.optimize()
+    per_island = [r['n_eval'] for r in islands.island_results.values()]
+    # Cada ilha recebe metade do orcamento e o gasta inteiro
+    assert per_island == [120, 120]
+    assert budget.used_evals == 240
+
+
+def test_rejects_checkpoint_and_remote(tmp_path):
+    with pytest.raises(ValueError):
+        IslandParticleSwarm(rastrigin, [1.0] * 3, n_islands=2,
+                            checkpoint_path=str(tmp_path / "run.ckpt"))
+    with pytest.raises(ValueError):
+        IslandParticleSwarm(rastrigin, [1.0] * 3, n_islands=2, backend="remote")
@@ -0,0 +1,19 @@
+# tests/test_pattern_search.py
+"""Pattern Search: contagem de avaliacoes com orcamento."""
+import pytest
+
+from conftest import rastrigin
+from optimizer import PatternSearch
+from optimizer.budget import Budget
+
+
+@pytest.mark.parametrize("poll", ["opportunistic", "complete", "opportunistic-parallel"])
+@pytest.mark.parametrize("max_evals", [2, 7, 13])
+def test_reported_evaluations_match_budget(poll, max_evals):
+    budget = Budget(max_evals=max_evals)
+    reported = []
+    optimizer = PatternSearch(rastrigin, [1.3] * 3, max_iter=50, poll=poll, budget=budget,
+                              callback=lambda info: reported.append(info['n_eval']))
+    optimizer.optimize()
+    assert budget.used_evals == max_evals
+    assert reported[-1] == budget.used_evals
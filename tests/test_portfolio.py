@@ -0,0 +1,78 @@
+# tests/test_portfolio.py
+"""Portfolio: orcamento compartilhado e successive halving."""
+import time
+
+import numpy as np
+import pytest
+
+from optimizer.budget import Budget, BudgetShare
+from optimizer.portfolio import Portfolio
+
+BOUNDS = [(-5.12, 5.12)] * 4
+
+
+def rastrigin(x):
+    # Avaliacao lenta o bastante para o laco de realocacao acompanhar
+    time.sleep(0.001)
+    x = np.asarray(x)
+    return -float(10 * len(x) + np.sum(x * x - 10 * np.cos(2 * np.pi * x)))
+
+
+def test_budget_share_counts_in_parent_and_stops_alone():
+    budget = Budget(max_evals=10)
+    a, b = BudgetShare(budget), BudgetShare(budget)
+    assert a.reserve(4) == 4
+    assert b.reserve(4) == 4
+    assert a.reserve(4) == 2
+    a.release(1)
+    assert (a.used_evals, b.used_evals, budget.used_evals) == (5, 4, 9)
+
+    b.stop()
+    assert b.exhausted() and not a.exhausted()
+    assert b.reserve(1) == 0
+    assert a.reserve(5) == 1
+
+
+def test_portfolio_shares_budget_and_halves():
+    budget = Budget(max_evals=900)
+    portfolio = Portfolio(rastrigin, [2.0] * 4, bounds=BOUNDS, max_iter=10000, n_threads=4,
+                          budget=budget, rung_evals=60, eta=2, realloc_interval=0.02)
+    x, f, history = portfolio.optimize()
+
+    records = history['algorithms']
+    assert set(records) == {'ps', 'pso', 'hybrid'}
+    # Todas as avaliacoes saem do orcamento comum, sem ultrapassa-lo
+    assert sum(r['evals'] for r in records.values()) == budget.used_evals
+    assert budget.used_evals <= 900
+
+    # 3 algoritmos, eta=2: dois sao encerrados (60 e 120 avaliacoes)
+    stopped = [e for e in history['events'] if e['event'] == 'stopped']
+    assert len(stopped) == 2
+    assert all(e['n_eval'] >= 60 for e in stopped)
+    assert stopped[1]['n_eval'] >= 120
+    assert [r['status'] for r in records.values()].count('stopped') == 2
+
+    winner = records[history['winner']]
+    assert f == max(r['f'] for r in records.values())
+    assert f == winner['f'] and np.array_equal(x, winner['x'])
+
+
+def test_portfolio_rejects_unknown_algorithm():
+    with pytest.raises(ValueError):
+        Portfolio(rastrigin, [0.0] * 2, algorithms=('ps', 'nelder-mead'))
+
+
+def test_portfolio_shared_memo_is_bounded(monkeypatch):
+    memos = []
+    original = Portfolio._run
+
+    def run(self, entry):
+        memos.append(entry.optimizer._memo)
+        original(self, entry)
+
+    monkeypatch.setattr(Portfolio, "_run", run)
+    Portfolio(rastrigin, [2.0] * 4, bounds=BOUNDS, max_iter=10000, n_threads=4,
+              budget=Budget(max_evals=300), memo_size=50).optimize()
+    memo = memos[0]
+    assert all(m is memo for m in memos)
+    assert memo.maxsize == 50 and len(memo) <= 50
@@ -0,0 +1,91 @@
+# tests/test_python_objective.py
+"""Objetivo Python em processo: valores corretos mesmo com saida concorrente."""
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import objective.external_program as ext_prog
+from objective import run_external_program
+
+MAIN_SCRIPT = '''#!/usr/bin/env python3
+import sys
+x = [float(a) for a in sys.argv[1:]]
+print("mensagem de depuracao do objetivo", file=sys.stderr)
+print(-sum(v * v for v in x))
+'''
+
+CALLABLE_SCRIPT = '''#!/usr/bin/env python3
+import sys
+
+def objective(x1, x2, x3):
+    return -(x1 * x1 + x2 * x2 + x3 * x3)
+
+if __name__ == "__main__":
+    print(objective(*[float(a) for a in sys.argv[1:]]))
+'''
+
+SLOW_SCRIPT = '''#!/usr/bin/env python3
+import sys
+import time
+x = [float(a) for a in sys.argv[1:]]
+if x[0] > 5:
+    time.sleep(60)
+print(-sum(v * v for v in x))
+'''
+
+
+@pytest.fixture
+def program(tmp_path):
+    """Configura um script Python como objetivo e desfaz ao final."""
+    def configure(source, verify_samples=2):
+        path = tmp_path / "objective.py"
+        path.write_text(source)
+        # As primeiras avaliacoes sao conferidas executando o script
+        path.chmod(0o755)
+        ext_prog.configure_program(str(path), ['float'] * 3, 3)
+        return ext_prog.enable_python_inprocess(verify_samples=verify_samples)
+    yield configure
+    ext_prog.disable_python_inprocess()
+    ext_prog.configure_timeouts()
+
+
+def _evaluate_with_noise(n_points):
+    """Avalia n_points em 4 threads enquanto outro thread escreve em stdout."""
+    stop = threading.Event()
+
+    def noisy():
+        while not stop.is_set():
+            print("12345.0 saida do otimizador")
+
+    noise = threading.Thread(target=noisy)
+    noise.start()
+    try:
+        with ThreadPoolExecutor(4) as pool:
+            return list(pool.map(lambda i: run_external_program([i * 0.1] * 3), range(n_points)))
+    finally:
+        stop.set()
+        noise.join()
+
+
+@pytest.mark.parametrize("source, mode", [(MAIN_SCRIPT, "main"), (CALLABLE_SCRIPT, "callable")])
+def test_values_under_concurrent_output(program, capsys, source, mode):
+    objective = program(source)
+    assert objective.mode == mode
+
+    values = _evaluate_with_noise(40)
+    capsys.readouterr()
+
+    assert values == pytest.approx([-3 * (i * 0.1)**2 for i in range(40)])
+    # A conferencia com o subprocesso nao desativou o modo em processo
+    assert ext_prog.python_objective is objective
+
+
+def test_main_mode_timeout_is_penalized(program):
+    program(SLOW_SCRIPT, verify_samples=0)
+    ext_prog.configure_timeouts(initial=0.5, adaptive=False)
+
+    assert run_external_program([9.0, 0.0, 0.0]) == -math.inf
+    # O processo travado e substituido; as avaliacoes seguintes funcionam
+    assert run_external_program([1.0, 1.0, 0.0]) == pytest.approx(-2.0)
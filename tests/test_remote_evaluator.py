@@ -0,0 +1,148 @@
+# tests/test_remote_evaluator.py
+"""RemoteEvaluator contra servidores de avaliacao locais (eval_server.py)."""
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pytest
+
+from conftest import ROOT
+from optimizer import PatternSearch, RemoteEvaluator
+from optimizer.remote_evaluator import NodesUnavailable
+
+SPHERE = os.path.join(ROOT, "benchmarks", "programs", "sphere.py")
+TOKEN = "segredo-de-teste"
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_listening(port, process, timeout=15.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"eval_server terminou (exitcode {process.returncode})")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"eval_server nao respondeu na porta {port}")
+
+
+@pytest.fixture
+def servers(tmp_path):
+    """Inicia dois nos locais (host padrao, com token); retorna [(endereco, processo), ...]."""
+    config = tmp_path / "config.json"
+    config.write_text(json.dumps({'program_path': SPHERE, 'signature': ['float'] * 5,
+                                  'num_params': 5}))
+    nodes = []
+    for _ in range(2):
+        port = _free_port()
+        process = subprocess.Popen(
+            [sys.executable, os.path.join(ROOT, "eval_server.py"), str(config),
+             "--port", str(port), "--workers", "2"],
+            env={**os.environ, 'PO_EVAL_TOKEN': TOKEN},
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        nodes.append((f"127.0.0.1:{port}", process))
+    try:
+        for address, process in nodes:
+            _wait_listening(int(address.rsplit(":", 1)[1]), process)
+        yield nodes
+    finally:
+        for _, process in nodes:
+            process.kill()
+            process.wait()
+
+
+def _remote(servers, **kwargs):
+    options = dict(connections_per_node=2, heartbeat_interval=0.2, heartbeat_timeout=1.0,
+                   reconnect_interval=0.3, max_reconnects=2, token=TOKEN)
+    options.update(kwargs)
+    return RemoteEvaluator([address for address, _ in servers], **options)
+
+
+def test_evaluates_on_nodes(servers):
+    remote = _remote(servers)
+    try:
+        assert remote.evaluate([1.0] * 5) == pytest.approx(-5.0)
+        points = np.random.uniform(-2, 2, (16, 5))
+        values = list(remote.map(None, points))
+        assert values == pytest.approx(list(-np.sum(points**2, axis=1)))
+        assert remote.n_workers == 4
+        assert all(node['alive'] for node in remote.stats()['nodes'].values())
+    finally:
+        remote.shutdown()
+
+
+def test_optimizer_with_remote_backend(servers):
+    remote = _remote(servers)
+    try:
+        optimizer = PatternSearch(remote.evaluate, [1.0] * 5, max_iter=10,
+                                  poll='complete', evaluator=remote)
+        _, f, _ = optimizer.optimize()
+        assert f > -5.0
+    finally:
+        remote.shutdown()
+
+
+def test_killed_node_fails_over(servers):
+    remote = _remote(servers)
+    try:
+        assert remote.evaluate([1.0] * 5) == pytest.approx(-5.0)
+        servers[1][1].kill()
+        servers[1][1].wait()
+        # Os pedidos continuam (no outro no) mesmo com pedidos em voo no morto
+        points = np.random.uniform(-2, 2, (12, 5))
+        values = list(remote.map(None, points))
+        assert values == pytest.approx(list(-np.sum(points**2, axis=1)))
+        deadline = time.monotonic() + 5.0
+        while remote.stats()['nodes'][servers[1][0]]['alive'] and time.monotonic() < deadline:
+            time.sleep(0.1)
+        assert not remote.stats()['nodes'][servers[1][0]]['alive']
+        assert remote.stats()['nodes'][servers[0][0]]['alive']
+    finally:
+        remote.shutdown()
+
+
+def test_all_nodes_down_raises(servers):
+    remote = _remote(servers)
+    try:
+        for _, process in servers:
+            process.kill()
+            process.wait()
+        with pytest.raises(NodesUnavailable):
+            remote.submit(None, [0.5] * 5).result(timeout=30)
+        # Novos pedidos falham sem esperar enquanto nenhum no volta
+        start = time.monotonic()
+        with pytest.raises(NodesUnavailable):
+            remote.evaluate([0.5] * 5)
+        assert time.monotonic() - start < 1.0
+    finally:
+        remote.shutdown()
+
+
+@pytest.mark.parametrize("token", [None, "outro"])
+def test_wrong_token_is_rejected(servers, token):
+    remote = _remote(servers, token=token)
+    try:
+        assert not any(node['alive'] for node in remote.stats()['nodes'].values())
+        with pytest.raises(NodesUnavailable):
+            remote.submit(None, [0.5] * 5).result(timeout=30)
+    finally:
+        remote.shutdown()
+
+
+def test_server_refuses_requests_before_hello(servers):
+    host, port = servers[0][0].rsplit(":", 1)
+    with socket.create_connection((host, int(port)), timeout=5) as sock:
+        sock.sendall(b'{"op": "eval", "id": 1, "params": [0, 0, 0, 0, 0]}\n')
+        reply = json.loads(sock.makefile("rb").readline())
+    assert reply == {'op': 'error', 'error': "token invalido"}
@@ -0,0 +1,79 @@
+# tests/test_timeouts.py
+"""Timeout adaptativo: piso, e latencias que aumentam durante a execucao."""
+import math
+
+import pytest
+
+import objective.external_program as ext_prog
+from objective import run_external_program
+from objective.timeouts import AdaptiveTimeout
+
+# Latencia lida de um arquivo, para mudar no meio da execucao
+SLEEPY_SCRIPT = '''#!/usr/bin/env python3
+import sys
+import time
+with open(sys.argv[0] + ".latency") as f:
+    time.sleep(float(f.read()))
+print(-sum(float(a) ** 2 for a in sys.argv[1:]))
+'''
+
+
+def _simulate(timeout, latencies):
+    """Aplica o timeout a uma sequencia de latencias; retorna quais estouraram."""
+    timed_out = []
+    for latency in latencies:
+        limit = timeout.current()
+        if latency > limit:
+            timeout.observe_timeout(limit)
+            timed_out.append(True)
+        else:
+            timeout.observe(latency)
+            timed_out.append(False)
+    return timed_out
+
+
+def test_floor_follows_initial_timeout():
+    timeout = AdaptiveTimeout(initial=10.0)
+    _simulate(timeout, [0.01] * 50)
+    assert timeout.current() == pytest.approx(1.0)
+    assert AdaptiveTimeout(initial=10.0, min_timeout=0.2).min_timeout == 0.2
+
+
+def test_limit_recovers_when_latency_steps_up():
+    timeout = AdaptiveTimeout(initial=1.0)
+    timed_out = _simulate(timeout, [0.01] * 50 + [0.5] * 200)
+    # O limite tinha caido ao piso (0.1 s): alguns estouros logo apos a
+    # mudanca, nenhum depois
+    assert timed_out[50]
+    assert 1 <= sum(timed_out) <= 4
+    assert not any(timed_out[60:])
+    assert timeout.stats()['timeouts'] == sum(timed_out)
+
+
+def test_fixed_timeout_only_counts():
+    timeout = AdaptiveTimeout(initial=0.3, adaptive=False)
+    assert _simulate(timeout, [0.01] * 20 + [0.5] * 5)[-5:] == [True] * 5
+    assert timeout.current() == 0.3
+    assert timeout.n_timeouts == 5
+
+
+def test_program_slowing_down_is_not_penalized_forever(tmp_path):
+    path = tmp_path / "sleepy.py"
+    path.write_text(SLEEPY_SCRIPT)
+    path.chmod(0o755)
+    latency = tmp_path / "sleepy.py.latency"
+    ext_prog.configure_program(str(path), ['float'] * 2, 2)
+    ext_prog.configure_timeouts(initial=1.0)
+    try:
+        latency.write_text("0")
+        fast = [run_external_program([1.0, 1.0]) for _ in range(10)]
+        assert fast == [-2.0] * 10
+        assert ext_prog.eval_timeout.current() < 0.5
+
+        latency.write_text("0.5")
+        slow = [run_external_program([1.0, 1.0]) for _ in range(8)]
+        assert slow[0] == -math.inf
+        assert slow[-3:] == [-2.0] * 3
+        assert 1 <= ext_prog.eval_timeout.n_timeouts <= 4
+    finally:
+        ext_prog.configure_timeouts()
@@ -1,4 +1,5 @@
 # utils/__init__.py
-from utils.logger import log
+from utils.logger import log, get_logger, configure as configure_logging, flush as flush_logs
+from utils.profiler import profiler, Profiler
 
-__all__ = ["log"]
\ No newline at end of file
+__all__ = ["log", "get_logger", "configure_logging", "flush_logs", "profiler", "Profiler"]
\ No newline at end of file
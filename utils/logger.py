@@ -1,5 +1,204 @@
+# utils/logger.py
+"""
+Logging compartilhado pelos otimizadores e scripts.
+
+As mensagens sao enfileiradas e escritas por uma thread em segundo plano,
+de modo que os lacos dos otimizadores nunca esperam pelo terminal ou pelo
+pipe. O destino (sys.stdout) e capturado no momento da chamada, entao
+redirect_stdout continua funcionando.
+
+    from utils.logger import get_logger
+    log = get_logger("PSO")
+    log("mensagem")                       # nivel INFO
+    log.debug("detalhe", iteration=3)     # campos extras vao para o JSON
+    log.best("Nova melhor ...")           # limitada por best_interval
+
+Configuracao por configure() ou pelas variaveis de ambiente PO_LOG_LEVEL
+(DEBUG, INFO, WARNING, ERROR), PO_LOG_FORMAT (text ou json) e
+PO_LOG_BEST_INTERVAL (segundos entre mensagens de nova melhor).
+"""
+import atexit
+import json
+import os
+import queue
+import sys
+import threading
+import time
 from datetime import datetime
 
-def log(message):
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    print(f"[{timestamp}] {message}")
\ No newline at end of file
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+LEVELS = {name: level for level, name in LEVEL_NAMES.items()}
+
+
+def _parse_level(level):
+    if isinstance(level, str):
+        return LEVELS[level.upper()]
+    return int(level)
+
+
+class _Settings:
+    level = _parse_level(os.environ.get("PO_LOG_LEVEL", "INFO"))
+    format = os.environ.get("PO_LOG_FORMAT", "text")
+    best_interval = float(os.environ.get("PO_LOG_BEST_INTERVAL", "1.0"))
+    background = True
+
+
+def _format(record):
+    timestamp, level, name, message, fields = record
+    if _Settings.format == "json":
+        return json.dumps({
+            'time': datetime.fromtimestamp(timestamp).isoformat(timespec='milliseconds'),
+            'level': LEVEL_NAMES.get(level, str(level)),
+            'logger': name,
+            'message': message,
+            **fields
+        }, default=str)
+
+    text = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+    if name:
+        return f"[{text}] [{name}] {message}"
+    return f"[{text}] {message}"
+
+
+def _write(stream, record):
+    try:
+        stream.write(_format(record) + "\n")
+        stream.flush()
+    except (OSError, ValueError):
+        # Destino fechado (ex.: devnull ja encerrado); a mensagem e descartada
+        pass
+
+
+class _Writer:
+    """Thread que esvazia a fila de mensagens."""
+
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        # Apos um fork a thread do processo pai nao existe no filho
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._queue = queue.SimpleQueue()
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name="po-log", daemon=True)
+                self._thread.start()
+
+    def put(self, stream, record):
+        self._ensure_started()
+        self._queue.put((stream, record))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if isinstance(item, threading.Event):
+                item.set()
+                continue
+            _write(*item)
+
+    def flush(self, timeout=5.0):
+        """Espera a escrita de tudo o que foi enfileirado ate agora."""
+        if self._thread is None or self._pid != os.getpid():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+
+_writer = _Writer()
+atexit.register(_writer.flush)
+
+
+def configure(level=None, format=None, best_interval=None, background=None):
+    """Altera a configuracao global do logging."""
+    if level is not None:
+        _Settings.level = _parse_level(level)
+    if format is not None:
+        if format not in ("text", "json"):
+            raise ValueError(f"Formato de log desconhecido: {format}")
+        _Settings.format = format
+    if best_interval is not None:
+        _Settings.best_interval = float(best_interval)
+    if background is not None:
+        flush()
+        _Settings.background = background
+
+
+def flush():
+    """Garante que as mensagens pendentes foram escritas."""
+    _writer.flush()
+
+
+class Logger:
+    """Logger de um componente (o nome aparece como [NOME] no texto)."""
+
+    def __init__(self, name=None):
+        self.name = name
+        self._last_best = 0.0
+        self._suppressed = 0
+
+    def log(self, level, message, **fields):
+        if level < _Settings.level:
+            return
+        record = (time.time(), level, self.name, message, fields)
+        if _Settings.background:
+            _writer.put(sys.stdout, record)
+        else:
+            _write(sys.stdout, record)
+
+    def debug(self, message, **fields):
+        self.log(DEBUG, message, **fields)
+
+    def info(self, message, **fields):
+        self.log(INFO, message, **fields)
+
+    def warning(self, message, **fields):
+        self.log(WARNING, message, **fields)
+
+    def error(self, message, **fields):
+        self.log(ERROR, message, **fields)
+
+    __call__ = info
+
+    def best(self, message, **fields):
+        """Mensagem de nova melhor solucao, no maximo uma por best_interval.
+
+        As suprimidas sao contadas e informadas na proxima mensagem emitida.
+        """
+        if INFO < _Settings.level:
+            return
+        now = time.monotonic()
+        if now - self._last_best < _Settings.best_interval:
+            self._suppressed += 1
+            return
+        self._last_best = now
+        if self._suppressed:
+            message = f"{message} (+{self._suppressed} melhorias omitidas)"
+            fields = {**fields, 'suppressed': self._suppressed}
+            self._suppressed = 0
+        self.log(INFO, message, **fields)
+
+
+_loggers = {}
+
+
+def get_logger(name=None):
+    """Retorna o logger do componente (um por nome)."""
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers.setdefault(name, Logger(name))
+    return logger
+
+
+# Logger sem componente usado pelos scripts principais
+log = get_logger()
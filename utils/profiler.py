@@ -0,0 +1,160 @@
+# utils/profiler.py
+"""
+Instrumentacao de baixo custo para o caminho de avaliacao e os lacos dos
+otimizadores.
+
+Cada fase registra duracoes em um histograma (buckets fixos, no estilo
+Prometheus) e os eventos (timeouts, falhas, ...) em contadores. O perfil
+pode ser exportado em JSON ou no formato texto do Prometheus.
+
+    from utils.profiler import profiler
+    profiler.enable()
+    ...
+    profiler.export_json("profile.json")
+    profiler.export_prometheus("profile.prom")
+"""
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Limites superiores dos buckets em segundos (+Inf implicito)
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    """Histograma de latencias com buckets fixos."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """Estimativa do quantil pelo limite superior do bucket."""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, c in enumerate(self.counts):
+            cumulative += c
+            if cumulative >= rank:
+                return self.buckets[i] if i < len(self.buckets) else self.max
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.sum / self.count if self.count else None,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+            'buckets': {str(le): c for le, c in zip(self.buckets + ('+Inf',), self.counts)}
+        }
+
+
+class Profiler:
+    """Coleta duracoes por fase e contadores de eventos (thread-safe)."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._phases = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._phases.clear()
+            self._counters.clear()
+
+    def record(self, phase, seconds):
+        """Registra a duracao de uma fase."""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._phases.get(phase)
+            if histogram is None:
+                histogram = self._phases[phase] = Histogram()
+            histogram.observe(seconds)
+
+    def incr(self, counter, n=1):
+        """Incrementa um contador de eventos."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + n
+
+    @contextmanager
+    def phase(self, name):
+        """Mede o bloco como uma fase (para trechos fora de lacos quentes)."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'phases': {name: h.to_dict() for name, h in sorted(self._phases.items())},
+                'counters': dict(sorted(self._counters.items()))
+            }
+
+    def export_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+    def to_prometheus(self, prefix="po"):
+        """Texto no formato de exposicao do Prometheus."""
+        lines = [
+            f"# HELP {prefix}_phase_seconds Duracao das fases de avaliacao e dos otimizadores.",
+            f"# TYPE {prefix}_phase_seconds histogram"
+        ]
+        with self._lock:
+            for name, h in sorted(self._phases.items()):
+                cumulative = 0
+                for le, c in zip(h.buckets + ('+Inf',), h.counts):
+                    cumulative += c
+                    lines.append(f'{prefix}_phase_seconds_bucket{{phase="{name}",le="{le}"}} {cumulative}')
+                lines.append(f'{prefix}_phase_seconds_sum{{phase="{name}"}} {h.sum}')
+                lines.append(f'{prefix}_phase_seconds_count{{phase="{name}"}} {h.count}')
+
+            lines.append(f"# HELP {prefix}_events_total Eventos contados (timeouts, falhas, ...).")
+            lines.append(f"# TYPE {prefix}_events_total counter")
+            for name, value in sorted(self._counters.items()):
+                lines.append(f'{prefix}_events_total{{event="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def export_prometheus(self, path, prefix="po"):
+        with open(path, 'w') as f:
+            f.write(self.to_prometheus(prefix))
+
+
+# Instancia global usada pelo caminho de avaliacao e pelos otimizadores
+profiler = Profiler()